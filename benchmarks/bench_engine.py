@@ -0,0 +1,60 @@
+"""Compare the reference CPUScheduler loops with the fast_engine kernel.
+
+Usage: python benchmarks/bench_engine.py [--reference-size N] [--fast-size N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cpu_scheduler import ALGORITHMS
+from fast_engine import get_backend, run_fast
+from workload import Workload
+
+
+def random_workload(size, seed):
+    rng = random.Random(seed)
+    records = []
+    arrival = 0
+    for pid in range(1, size + 1):
+        records.append((pid, arrival, rng.randint(1, 10), rng.randint(0, 9)))
+        arrival += rng.randint(0, 6)
+    return Workload.from_records(records)
+
+
+def timed(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reference-size", type=int, default=1000)
+    parser.add_argument("--fast-size", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    small = random_workload(args.reference_size, args.seed)
+    large = random_workload(args.fast_size, args.seed)
+    print(f"fast_engine backend: {get_backend()}")
+    print(f"{'algorithm':<12}{'reference':>12}{'fast':>12}{'speedup':>10}"
+          f"{'fast @ ' + str(args.fast_size):>18}{'jobs/s':>14}")
+    for algo in ALGORITHMS:
+        ref = timed(lambda: small.to_scheduler().run(algo), 1)
+        fast = timed(lambda: run_fast(small, algo), args.repeat)
+        big = timed(lambda: run_fast(large, algo), 1)
+        print(f"{algo:<12}{ref:>11.4f}s{fast:>11.4f}s{ref / fast:>9.1f}x"
+              f"{big:>17.3f}s{args.fast_size / big:>14.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
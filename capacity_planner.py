@@ -0,0 +1,299 @@
+import argparse
+import heapq
+import math
+import sys
+
+from cpu_scheduler import ALGORITHMS, Process
+from online_scheduler import make_policy
+from workload import load_workload
+
+PLANNER_METRICS = ("waiting", "response", "turnaround")
+# Quanta tried for algorithms that have one when none are given
+DEFAULT_QUANTA = (1, 2, 3, 4, 6, 8, 12, 16)
+# Core counts evaluated per search interval in each parallel round
+PROBES_PER_ROUND = 3
+QUANTUM_ALGORITHMS = ("rr",)
+
+
+def simulate_cores(workload, algorithm, cores, time_quantum=3):
+    """Run a workload on `cores` identical CPUs sharing one ready queue.
+
+    Uses the same ready-queue policies as OnlineScheduler; at each instant
+    finished slices are requeued first, then arrivals are admitted, then
+    idle cores take the head of the queue. While every core is busy under a
+    non-preemptive policy, arrivals are only admitted at the next slice
+    end; under a preemptive one a newcomer preempts the running process
+    with the worst key. With one core the schedule is the CPUScheduler one.
+    Returns the Process objects in workload order and the number of
+    dispatches that ran for some time.
+    """
+    if cores <= 0:
+        raise ValueError("Need at least one core")
+    pids, arrivals, bursts, priorities = (workload.pids, workload.arrivals, workload.bursts,
+                                          workload.priorities)
+    processes = [Process(pids[i], arrivals[i], bursts[i], priorities[i]) for i in range(len(pids))]
+    order = workload.arrival_order
+    policy = make_policy(algorithm, time_quantum)
+    quantum = policy.quantum
+    # Heap of [slice_end, seq, process, charged_until, dispatched_at, active]
+    running = []
+    free = cores
+    seq = 0
+    dispatches = 0
+    n = len(processes)
+    nxt = 0
+    done = 0
+
+    def dispatch(t):
+        nonlocal seq, free
+        process = policy.pop()
+        run = process.remaining_time if quantum is None else min(quantum, process.remaining_time)
+        if process.start_time == -1:
+            process.start_time = t
+        seq += 1
+        entry = [t + run, seq, process, t, t, True]
+        heapq.heappush(running, entry)
+        free -= 1
+        return entry
+
+    while done < n:
+        while running and not running[0][5]:
+            heapq.heappop(running)  # Preempted entries are dropped lazily
+        t = running[0][0] if running else math.inf
+        if nxt < n and (free or policy.preemptive):
+            # Otherwise arrivals wait for the next slice end and queue behind requeued processes
+            t = min(t, arrivals[order[nxt]])
+
+        while running and running[0][0] == t:
+            _, _, process, charged, _, active = heapq.heappop(running)
+            if not active:
+                continue
+            free += 1
+            dispatches += 1
+            process.remaining_time -= t - charged
+            if process.remaining_time == 0:
+                process.completion_time = t
+                done += 1
+            else:
+                policy.push(process)
+        first = nxt
+        while nxt < n and arrivals[order[nxt]] <= t:
+            nxt += 1
+        # Jobs admitted together queue in workload order, as in OnlineScheduler
+        for i in sorted(order[first:nxt]):
+            policy.push(processes[i])
+
+        if policy.preemptive and not free and len(policy):
+            active = [entry for entry in running if entry[5]]
+            for entry in active:
+                # Bring remaining times up to date so keys like SRTF's compare correctly
+                entry[2].remaining_time -= t - entry[3]
+                entry[3] = t
+            while len(policy):
+                victim = max(active, key=lambda entry: policy.key(entry[2]))
+                if not policy.preempts(victim[2]):
+                    break
+                victim[5] = False
+                active.remove(victim)
+                dispatches += t > victim[4]
+                free += 1
+                policy.push(victim[2])
+                active.append(dispatch(t))
+
+        while free and len(policy):
+            dispatch(t)
+    return processes, dispatches
+
+
+def metric_values(processes, metric):
+    if metric == "waiting":
+        return [p.completion_time - p.arrival_time - p.burst_time for p in processes]
+    if metric == "response":
+        return [p.start_time - p.arrival_time for p in processes]
+    if metric == "turnaround":
+        return [p.completion_time - p.arrival_time for p in processes]
+    raise ValueError(f"Unknown metric: {metric}")
+
+
+def quantile_of(values, q):
+    """Nearest-rank quantile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def evaluate(workload, algorithm, cores, time_quantum, metric="waiting", quantile=0.99):
+    """(metric quantile, dispatches) of one configuration"""
+    processes, dispatches = simulate_cores(workload, algorithm, cores, time_quantum)
+    return quantile_of(metric_values(processes, metric), quantile), dispatches
+
+
+def _evaluate_task(task):
+    workload, algorithm, cores, time_quantum, metric, quantile = task
+    try:
+        return evaluate(workload, algorithm, cores, time_quantum, metric, quantile)
+    finally:
+        if hasattr(workload, "close"):
+            workload.close()  # A SharedWorkload attached in this worker
+
+
+class CapacityPlanner:
+    """Finds the fewest cores (and a quantum) keeping a latency quantile under an SLO.
+
+    For each candidate quantum the core count is searched in rounds: the
+    count doubles until one meets the SLO, then the gap to the last miss
+    is split. Each round evaluates a few core counts for every quantum
+    together, in a process pool over one shared-memory copy of the
+    workload. This assumes the latency quantile does not get worse with
+    more cores. Every evaluation is cached, so repeated plans (e.g. for other
+    SLOs) reuse earlier simulations. The cheapest plan is the fewest cores,
+    then the fewest dispatches (so the least switching overhead).
+    """
+
+    def __init__(self, workload, algorithm="rr", metric="waiting", quantile=0.99, quanta=None,
+                 max_cores=None, max_workers=None):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if metric not in PLANNER_METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        if not 0 < quantile <= 1:
+            raise ValueError("Quantile must be in (0, 1]")
+        if len(workload) == 0:
+            raise ValueError("Workload is empty")
+        self.workload = workload
+        self.algorithm = algorithm
+        self.metric = metric
+        self.quantile = quantile
+        if algorithm in QUANTUM_ALGORITHMS:
+            self.quanta = sorted(set(quanta or DEFAULT_QUANTA))
+            if self.quanta[0] <= 0:
+                raise ValueError("Time quanta must be positive")
+        else:
+            self.quanta = [None]  # The quantum does not affect this algorithm
+        # With one core per process nothing ever waits
+        self.max_cores = max_cores or len(workload)
+        self.max_workers = max_workers
+        self.results = {}  # (cores, quantum) -> (value, dispatches)
+        self.pool = None
+        self.shared = None
+
+    def plan(self, slo):
+        """Cheapest {"cores", "quantum", "value", "dispatches"} meeting `slo`, or None"""
+        # Per quantum: [most cores known to miss, fewest known to meet or None]
+        intervals = {quantum: [0, None] for quantum in self.quanta}
+        try:
+            while True:
+                probes = []
+                for quantum, (lo, hi) in intervals.items():
+                    probes.extend((cores, quantum) for cores in self._probes(lo, hi))
+                if not probes:
+                    break
+                self._run(probes)
+                for quantum in list(intervals):
+                    interval = intervals[quantum]
+                    for cores in sorted(c for c, q in probes if q == quantum):
+                        if self.results[(cores, quantum)][0] <= slo:
+                            interval[1] = cores
+                            break
+                        interval[0] = cores
+                    if interval[1] is None and interval[0] == self.max_cores:
+                        del intervals[quantum]  # Even max_cores misses the SLO
+        finally:
+            self.close()
+        best = None
+        for quantum, (_, cores) in intervals.items():
+            value, dispatches = self.results[(cores, quantum)]
+            candidate = {"cores": cores, "quantum": quantum, "value": value, "dispatches": dispatches}
+            if best is None or (cores, dispatches) < (best["cores"], best["dispatches"]):
+                best = candidate
+        return best
+
+    def _probes(self, lo, hi):
+        """Core counts to try next: doubling until one meets the SLO, then splitting the gap"""
+        if hi is None:
+            first = lo * 2 if lo else 1
+            return sorted({min(first << k, self.max_cores) for k in range(PROBES_PER_ROUND)})
+        if hi - lo <= 1:
+            return []
+        step = (hi - lo) / (PROBES_PER_ROUND + 1)
+        return sorted({lo + max(1, round(step * k)) for k in range(1, PROBES_PER_ROUND + 1)} - {hi})
+
+    def _run(self, configs):
+        """Evaluate the uncached (cores, quantum) configurations, in parallel when allowed"""
+        todo = sorted({config for config in configs if config not in self.results})
+        if not todo:
+            return
+        if self.max_workers == 1 or len(todo) == 1:
+            values = [evaluate(self.workload, self.algorithm, cores, quantum or 1, self.metric,
+                               self.quantile) for cores, quantum in todo]
+        else:
+            if self.pool is None:
+                from concurrent.futures import ProcessPoolExecutor
+                from shared_workload import SharedWorkload
+
+                self.shared = SharedWorkload.create(self.workload)
+                self.pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            tasks = [(self.shared, self.algorithm, cores, quantum or 1, self.metric, self.quantile)
+                     for cores, quantum in todo]
+            values = list(self.pool.map(_evaluate_task, tasks))
+        self.results.update(zip(todo, values))
+
+    def close(self):
+        """Stop the worker pool and free the shared workload (done after each plan)"""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        if self.shared is not None:
+            self.shared.close()
+            self.shared.unlink()
+            self.shared = None
+
+
+def format_plan(planner, slo, plan):
+    label = f"p{planner.quantile * 100:g} {planner.metric} time"
+    lines = [f"=== {ALGORITHMS[planner.algorithm][0]}: {label} <= {slo} ==="]
+    if plan is None:
+        lines.append(f"No configuration with up to {planner.max_cores} cores meets the SLO")
+    else:
+        lines.append(f"Cores = {plan['cores']}")
+        if plan["quantum"] is not None:
+            lines.append(f"Time quantum = {plan['quantum']}")
+        lines.append(f"{label} = {plan['value']}")
+        lines.append(f"Dispatches = {plan['dispatches']}")
+    lines.append(f"Configurations simulated = {len(planner.results)}")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Find the fewest cores (and a quantum) that keep a latency percentile under an SLO.")
+    parser.add_argument("trace", help="workload trace (.json as saved by the GUI, or .csv)")
+    parser.add_argument("--slo", type=float, required=True,
+                        help="latency target in time units")
+    parser.add_argument("-a", "--algorithm", choices=tuple(ALGORITHMS), default="rr")
+    parser.add_argument("--metric", choices=PLANNER_METRICS, default="waiting")
+    parser.add_argument("--quantile", type=float, default=0.99,
+                        help="latency quantile the SLO applies to (default: 0.99)")
+    parser.add_argument("--quanta", default=None,
+                        help="comma separated time quanta to try for Round Robin "
+                             f"(default: {','.join(map(str, DEFAULT_QUANTA))})")
+    parser.add_argument("--max-cores", type=int, default=None,
+                        help="largest core count considered (default: one per process)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU, 1 runs in-process)")
+    args = parser.parse_args(argv)
+    try:
+        quanta = [int(q) for q in args.quanta.split(",")] if args.quanta else None
+        if args.max_cores is not None and args.max_cores <= 0:
+            raise ValueError("--max-cores must be positive")
+        planner = CapacityPlanner(load_workload(args.trace), args.algorithm, args.metric,
+                                  args.quantile, quanta, args.max_cores, args.workers)
+        plan = planner.plan(args.slo)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 1
+    sys.stdout.write(format_plan(planner, args.slo, plan))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from cpu_scheduler import Process
+from online_scheduler import FifoPolicy, KeyedPolicy, OnlineScheduler, make_policy
+
+# Layout (little endian): magic, version, algorithm code, the JSON list of
+# group paths used by the processes, then a zlib compressed block of int64
+# values: scheduler fields, the process table, state histories, the
+# pending heap, the ready queue and recorded segments.
+CHECKPOINT_MAGIC = b"CPUK"
+CHECKPOINT_VERSION = 3
+STATES = ("ready", "running", "completed")
+SCHEDULER_FIELDS = ("time", "seq", "slice_end", "segment_start", "submitted", "completed",
+                    "work_left", "last_arrival", "segments")
+PROCESS_COLUMNS = ("pid", "arrival_time", "burst_time", "priority", "remaining_time",
+                   "waiting_time", "turnaround_time", "completion_time", "response_time",
+                   "start_time", "tickets")
+# Optional real-time columns, stored as -1 when unset
+OPTIONAL_COLUMNS = ("deadline", "period")
+
+
+def dump_scheduler(scheduler):
+    """Serialize an OnlineScheduler's complete state to checkpoint bytes.
+
+    Restoring with load_scheduler() continues the run exactly as if it had
+    never stopped, and the same checkpoint can be loaded several times to
+    fork what-if runs. Listeners are not saved and must be re-attached.
+    """
+    policy = scheduler.policy
+    if not isinstance(policy, (FifoPolicy, KeyedPolicy)):
+        raise ValueError(f"Checkpoints are not supported for {scheduler.algorithm} scheduling")
+    if isinstance(policy, FifoPolicy):
+        ready = list(policy.queue)
+        ready_seqs = [0] * len(ready)
+    else:
+        ready = [entry[2] for entry in policy.heap]
+        ready_seqs = [entry[1] for entry in policy.heap]
+
+    # With history on, the recorded list already holds every process;
+    # otherwise only the live ones are reachable
+    if scheduler.record_history:
+        table = list(scheduler.processes)
+    else:
+        table = [entry[2] for entry in scheduler.pending] + ready
+        if scheduler.running is not None:
+            table.append(scheduler.running)
+    index = {id(p): i for i, p in enumerate(table)}
+    groups = sorted({p.group for p in table if p.group is not None})
+    group_index = {group: i for i, group in enumerate(groups)}
+
+    values = array("q")
+    values.extend(getattr(scheduler, field) for field in SCHEDULER_FIELDS)
+    values.extend((policy.quantum or 0, getattr(policy, "seq", 0), int(scheduler.record_history),
+                   index[id(scheduler.running)] if scheduler.running is not None else -1,
+                   len(table), len(scheduler.pending), len(ready), len(scheduler.gantt_chart)))
+    for p in table:
+        values.extend(getattr(p, column) for column in PROCESS_COLUMNS)
+        values.extend(-1 if getattr(p, column) is None else getattr(p, column)
+                      for column in OPTIONAL_COLUMNS)
+        values.extend((-1 if p.group is None else group_index[p.group],
+                       STATES.index(p.state), len(p.state_history)))
+    for p in table:
+        for time, state in p.state_history:
+            values.extend((time, STATES.index(state)))
+    for _, seq, p in scheduler.pending:  # Heap order is kept as is
+        values.extend((seq, index[id(p)]))
+    for seq, p in zip(ready_seqs, ready):
+        values.extend((seq, index[id(p)]))
+    for pid, (start, end) in zip(scheduler.gantt_chart, scheduler.time_chart):
+        values.extend((pid, start, end))
+
+    if sys.byteorder != "little":
+        values.byteswap()
+    code = scheduler.algorithm.encode("utf-8")
+    group_table = json.dumps(groups, separators=(",", ":")).encode("utf-8")
+    return (struct.pack("<4sHHI", CHECKPOINT_MAGIC, CHECKPOINT_VERSION, len(code), len(group_table))
+            + code + group_table + zlib.compress(values.tobytes(), 6))
+
+
+def load_scheduler(data):
+    """Rebuild an OnlineScheduler from dump_scheduler() bytes"""
+    try:
+        magic, version = struct.unpack_from("<4sH", data)
+        if magic != CHECKPOINT_MAGIC:
+            raise ValueError("Not a scheduler checkpoint")
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {version}")
+        code_length, group_length = struct.unpack_from("<HI", data, 6)
+        offset = 12 + code_length
+        algorithm = data[12:offset].decode("utf-8")
+        groups = json.loads(data[offset:offset + group_length].decode("utf-8"))
+        values = array("q")
+        values.frombytes(zlib.decompress(data[offset + group_length:]))
+    except (struct.error, zlib.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Corrupt checkpoint: {e}")
+    if sys.byteorder != "little":
+        values.byteswap()
+    it = iter(values)
+
+    def take(count):
+        return [next(it) for _ in range(count)]
+
+    try:
+        fields = take(len(SCHEDULER_FIELDS))
+        quantum, policy_seq, record_history, running, n_table, n_pending, n_ready, n_segments = take(8)
+        scheduler = OnlineScheduler(algorithm, quantum or 3, bool(record_history))
+        for field, value in zip(SCHEDULER_FIELDS, fields):
+            setattr(scheduler, field, value)
+
+        table = []
+        history_lengths = []
+        for _ in range(n_table):
+            row = take(len(PROCESS_COLUMNS) + len(OPTIONAL_COLUMNS) + 3)
+            p = Process(*row[:4])
+            for column, value in zip(PROCESS_COLUMNS[4:], row[4:]):
+                setattr(p, column, value)
+            for column, value in zip(OPTIONAL_COLUMNS, row[len(PROCESS_COLUMNS):]):
+                setattr(p, column, None if value == -1 else value)
+            p.group = None if row[-3] == -1 else groups[row[-3]]
+            p.state = STATES[row[-2]]
+            history_lengths.append(row[-1])
+            table.append(p)
+        for p, length in zip(table, history_lengths):
+            p.state_history = [(next(it), STATES[next(it)]) for _ in range(length)]
+
+        for _ in range(n_pending):
+            seq, i = take(2)
+            scheduler.pending.append((table[i].arrival_time, seq, table[i]))
+        policy = make_policy(algorithm, quantum or 3)
+        for _ in range(n_ready):
+            seq, i = take(2)
+            if isinstance(policy, FifoPolicy):
+                policy.queue.append(table[i])
+            else:
+                policy.heap.append((policy.key(table[i]), seq, table[i]))
+        if not isinstance(policy, FifoPolicy):
+            policy.seq = policy_seq
+        scheduler.policy = policy
+        scheduler.running = table[running] if running >= 0 else None
+        if record_history:
+            scheduler.processes = table
+        for _ in range(n_segments):
+            pid, start, end = take(3)
+            scheduler.gantt_chart.append(pid)
+            scheduler.time_chart.append((start, end))
+    except (StopIteration, IndexError) as e:
+        raise ValueError(f"Corrupt checkpoint: {e!r}")
+    return scheduler
+
+
+def save_checkpoint(scheduler, path):
+    """Write a checkpoint file atomically, so a crash never leaves a torn file"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(dump_scheduler(scheduler))
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    with open(path, "rb") as f:
+        return load_scheduler(f.read())
@@ -0,0 +1,88 @@
+from cpu_scheduler import ALGORITHMS
+from fast_engine import run_fast
+from result_cache import PROCESS_FIELDS, ResultCache
+
+# Below this many processes a worker pool costs more than it saves
+PARALLEL_THRESHOLD = 2000
+
+
+def run_entry(workload, algorithm, time_quantum=3):
+    """Run one algorithm over `workload` and return a cache entry.
+
+    Uses the fast_engine kernel, whose output is identical to running the
+    CPUScheduler method on private copies of the processes.
+    """
+    gantt_data, metrics = run_fast(workload, algorithm, time_quantum)
+    return entry_from_run(workload.pids, gantt_data, metrics)
+
+
+def entry_from_run(pids, gantt_data, metrics):
+    """Cache entry from run_fast()-style Gantt data and per-process metrics"""
+    gantt_chart, time_chart = gantt_data
+    finished = {"state": "completed", "remaining_time": 0}
+    rows = []
+    for i, pid in enumerate(pids):
+        rows.append([pid] + [finished[f] if f in finished else metrics[f][i] for f in PROCESS_FIELDS])
+    return {
+        "gantt_chart": gantt_chart,
+        "time_chart": [list(t) for t in time_chart],
+        "processes": rows,
+    }
+
+
+def compare_all(workload, algorithms=None, time_quantum=3, cache=None, max_workers=None):
+    """Run every algorithm over the same workload, each on isolated process copies.
+
+    `workload` is a Workload that is shared read-only between runs. Results
+    already in `cache` are reused; the rest run in a process pool when the
+    workload is large enough to benefit. Returns {algorithm: result} in the
+    order requested, where each result holds the run's "gantt" data, its
+    "scheduler" and "processes", and the CPUScheduler.summary() metrics
+    under "summary".
+    """
+    algorithms = list(algorithms or ALGORITHMS)
+    cache = cache if cache is not None else ResultCache()
+    schedulers = {algo: workload.to_scheduler(time_quantum) for algo in algorithms}
+    keys = {algo: cache.key_for(schedulers[algo], algo) for algo in algorithms}
+
+    entries = {}
+    missing = []
+    for algo in algorithms:
+        entry = cache.get(keys[algo])
+        if entry is None:
+            cache.misses += 1
+            missing.append(algo)
+        else:
+            cache.hits += 1
+            entries[algo] = entry
+
+    if len(missing) > 1 and len(workload) >= PARALLEL_THRESHOLD and max_workers != 1:
+        # Imported here so small and CLI runs don't pay for multiprocessing.
+        # Workers share one copy of the workload and write into a shared
+        # result block, so nothing is pickled per worker.
+        from shared_workload import run_shared
+
+        with run_shared(workload, missing, time_quantum, keep_gantt=True,
+                        max_workers=max_workers) as shared:
+            for algo in missing:
+                entries[algo] = entry_from_run(workload.pids, shared.gantt_data(algo),
+                                               shared.metrics(algo, workload))
+    else:
+        for algo in missing:
+            entries[algo] = run_entry(workload, algo, time_quantum)
+
+    results = {}
+    for algo in algorithms:
+        entry = entries[algo]
+        if algo in missing:
+            cache.put(keys[algo], entry)
+        scheduler = schedulers[algo]
+        cache.apply_entry(scheduler.processes, entry)
+        gantt_data = (list(entry["gantt_chart"]), [tuple(t) for t in entry["time_chart"]])
+        results[algo] = {
+            "gantt": gantt_data,
+            "scheduler": scheduler,
+            "processes": scheduler.processes,
+            "summary": scheduler.summary(gantt_data),
+        }
+    return results
@@ -1,11 +1,22 @@
-import com.cpuscheduler.model.CPUScheduler;
+import sys
+
+# Proportional-share weight of a process that does not ask for one
+DEFAULT_TICKETS = 100
+
 class Process:
-    def __init__(self, pid, arrival_time, burst_time, priority=0):
+    def __init__(self, pid, arrival_time, burst_time, priority=0, deadline=None, period=None,
+                 tickets=DEFAULT_TICKETS, group=None):
+        if tickets <= 0:
+            raise ValueError(f"Process {pid} needs a positive ticket count")
         self.pid = pid
         self.arrival_time = arrival_time
         self.burst_time = burst_time
         self.remaining_time = burst_time
         self.priority = priority
+        self.deadline = deadline  # Absolute deadline of a real-time job
+        self.period = period  # Period of the task that released the job
+        self.tickets = tickets  # Proportional-share weight (stride/lottery/fair_share)
+        self.group = group  # "tenant/service" path for hierarchical fair share
         self.waiting_time = 0
         self.turnaround_time = 0
         self.completion_time = 0
@@ -14,16 +25,11 @@ class Process:
         self.state_history = []  # Track state changes
         self.start_time = -1  # Track when process first starts
         
-    def update_state(self, new_state, time):
-        """Record state transition with timestamp"""
-        if self.state != new_state:
-            self.state = new_state
-            self.state_history.append((time, new_state))
-            
     def update_state(self, new_state, current_time):
-        """Update process state and track metrics"""
+        """Record a state transition with its timestamp and track metrics"""
         if self.state != new_state:
             self.state = new_state
+            self.state_history.append((current_time, new_state))
             if new_state == "running":
                 if self.start_time == -1:
                     self.start_time = current_time
@@ -33,12 +39,54 @@ class Process:
                 self.turnaround_time = self.completion_time - self.arrival_time
                 self.waiting_time = self.turnaround_time - self.burst_time
 
+    def reset(self):
+        """Restore the process to its freshly added state"""
+        self.remaining_time = self.burst_time
+        self.waiting_time = 0
+        self.turnaround_time = 0
+        self.completion_time = 0
+        self.response_time = -1
+        self.state = "ready"
+        self.state_history = []
+        self.start_time = -1
+
+# Algorithm code -> (display name, method name, keyword arguments)
+ALGORITHMS = {
+    "fcfs": ("FCFS", "fcfs", {}),
+    "rr": ("Round Robin", "round_robin", {}),
+    "sjf": ("SJF (Non-preemptive)", "sjf_nonpreemptive", {}),
+    "sjf_p": ("SJF (Preemptive)", "sjf_preemptive", {}),
+    "priority": ("Priority (Non-preemptive)", "priority_scheduling", {"preemptive": False}),
+    "priority_p": ("Priority (Preemptive)", "priority_scheduling", {"preemptive": True}),
+}
+
+# Keys of CPUScheduler.summary(), in report order
+SUMMARY_FIELDS = ("avg_waiting", "avg_turnaround", "avg_response", "makespan",
+                  "cpu_utilization", "throughput", "context_switches")
+
+def run_summary(gantt_data, waiting, turnaround, response):
+    """Summary metrics of a run from its Gantt data and per-process metric lists"""
+    gantt_chart, time_chart = gantt_data
+    count = len(waiting)
+    makespan = time_chart[-1][1] if time_chart else 0
+    busy_time = sum(end - start for start, end in time_chart)
+    switches = sum(1 for prev, pid in zip(gantt_chart, gantt_chart[1:]) if prev != pid)
+    return {
+        "avg_waiting": sum(waiting) / count,
+        "avg_turnaround": sum(turnaround) / count,
+        "avg_response": sum(response) / count,
+        "makespan": makespan,
+        "cpu_utilization": busy_time / makespan * 100 if makespan else 0,
+        "throughput": count / makespan if makespan else 0,
+        "context_switches": switches,
+    }
+
 class CPUScheduler:
     """CPU Scheduler implementation with various scheduling algorithms.
     Supports 3-10 processes with a fixed time quantum of 3."""
     
     def __init__(self):
-        self.processes = []
+        self.processes = []  # Also builds the pid index
         self.time_quantum = 3  # Fixed time quantum
         self.min_processes = 3
         self.max_processes = 10
@@ -57,9 +105,62 @@ class CPUScheduler:
         if len(self.processes) < self.min_processes:
             raise ValueError(f"Need minimum {self.min_processes} processes to run scheduler")
 
+    @property
+    def processes(self):
+        return self._processes
+
+    @processes.setter
+    def processes(self, processes):
+        self._processes = processes
+        self.by_pid = {p.pid: p for p in processes}
+
     def add_process(self, pid, arrival_time, burst_time, priority=0):
         self.validate_input(arrival_time, burst_time, priority)
-        self.processes.append(Process(pid, arrival_time, burst_time, priority))
+        process = Process(pid, arrival_time, burst_time, priority)
+        self.processes.append(process)
+        self.by_pid[pid] = process
+
+    def remove_process(self, pid):
+        self.processes.remove(self.by_pid.pop(pid))
+
+    def clear_processes(self):
+        self.processes = []
+
+    def get_process(self, pid):
+        """Process with `pid` in O(1)"""
+        return self.by_pid[pid]
+
+    def reset_processes(self):
+        """Reset every process so an algorithm can run from a clean state"""
+        for process in self.processes:
+            process.reset()
+
+    def run(self, algorithm):
+        """Run the algorithm registered under `algorithm` in ALGORITHMS"""
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        _, method, kwargs = ALGORITHMS[algorithm]
+        self.reset_processes()
+        return getattr(self, method)(**kwargs)
+
+    def fcfs(self):
+        """First Come First Served: run to completion by arrival, ties in list order"""
+        self.check_minimum_processes()
+        time = 0
+        gantt_chart = []
+        time_chart = []
+
+        for process in sorted(self.processes, key=lambda p: p.arrival_time):
+            start_time = max(time, process.arrival_time)
+            time = start_time + process.burst_time
+            gantt_chart.append(process.pid)
+            time_chart.append((start_time, time))
+
+            process.update_state("running", start_time)
+            process.remaining_time = 0
+            process.update_state("completed", time)
+
+        return gantt_chart, time_chart
 
     def round_robin(self):
         """Round Robin scheduling with fixed quantum=3"""
@@ -126,6 +227,7 @@ class CPUScheduler:
             gantt_chart.append(current_process.pid)
             start_time = time
             time += current_process.burst_time
+            current_process.remaining_time = 0
             time_chart.append((start_time, time))
             
             current_process.update_state("running", start_time)
@@ -168,6 +270,7 @@ class CPUScheduler:
 
             current.state = "running"
             if current.response_time == -1:
+                current.start_time = time
                 current.response_time = time - current.arrival_time
 
             time += 1
@@ -203,10 +306,15 @@ class CPUScheduler:
                                 key=lambda p: (p.priority, p.pid))
             
             if not gantt_chart or gantt_chart[-1] != current_process.pid:
-                if gantt_chart:  # Record previous execution period
+                if len(time_chart) < len(gantt_chart):  # Close the preempted period
                     time_chart.append((last_switch, time))
                 gantt_chart.append(current_process.pid)
                 last_switch = time
+
+            current_process.state = "running"
+            if current_process.response_time == -1:
+                current_process.start_time = time
+                current_process.response_time = time - current_process.arrival_time
                 
             if preemptive:
                 time += 1
@@ -221,51 +329,65 @@ class CPUScheduler:
                 current_process.completion_time = time
                 current_process.turnaround_time = time - current_process.arrival_time
                 current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
+                current_process.state = "completed"
                 completed_processes += 1
 
         return gantt_chart, time_chart
 
+    def summary(self, gantt_data):
+        """Aggregate metrics of a finished run, keyed by SUMMARY_FIELDS"""
+        processes = self.processes
+        return run_summary(gantt_data, [p.waiting_time for p in processes],
+                           [p.turnaround_time for p in processes],
+                           [p.response_time for p in processes])
+
+    def format_gantt_chart(self, gantt_data):
+        """Render the Gantt chart as box-drawing text in a single string"""
+        gantt_chart, time_chart = gantt_data
+        if not gantt_chart:
+            return "\nGantt Chart:\n(empty)\n"
+        cells = len(gantt_chart)
+        lines = [
+            "\nGantt Chart:",
+            "╔" + "══════╦" * (cells - 1) + "══════╗",
+            "║" + "".join(f" P{pid:2} ║" for pid in gantt_chart),
+            "╚" + "══════╩" * (cells - 1) + "══════╝",
+            # Timeline with actual times, ending with the final time
+            " " + "".join(f"{start:<6}" for start, end in time_chart) + f"{time_chart[-1][1]}",
+        ]
+        return "\n".join(lines) + "\n"
+
     def display_gantt_chart(self, gantt_data):
         """Display enhanced Gantt chart with accurate timings"""
-        gantt_chart, time_chart = gantt_data
-        print("\nGantt Chart:")
-        
-        # Print top border
-        print("╔" + "══════╦" * (len(gantt_chart)-1) + "══════╗")
-        
-        # Print process IDs
-        print("║", end="")
-        for pid in gantt_chart:
-            print(f" P{pid:2} ║", end="")
-        print()
-        
-        # Print bottom border
-        print("╚" + "══════╩" * (len(gantt_chart)-1) + "══════╝")
-        
-        # Print timeline with actual times
-        print(" ", end="")
-        for start, end in time_chart:
-            print(f"{start:<6}", end="")
-        print(f"{time_chart[-1][1]}")  # Print final time
+        sys.stdout.write(self.format_gantt_chart(gantt_data))
 
-    def display_statistics(self):
+    def format_statistics(self):
+        """Render per-process and average statistics as a single string"""
         total_waiting_time = 0
         total_turnaround_time = 0
+        lines = []
 
         for process in self.processes:
             total_waiting_time += process.waiting_time
             total_turnaround_time += process.turnaround_time
-            print(f"Process {process.pid}: Waiting Time = {process.waiting_time}, Turnaround Time = {process.turnaround_time}")
+            lines.append(f"Process {process.pid}: Waiting Time = {process.waiting_time}, Turnaround Time = {process.turnaround_time}")
 
         average_waiting_time = total_waiting_time / len(self.processes)
         average_turnaround_time = total_turnaround_time / len(self.processes)
 
-        print(f"Total Waiting Time = {total_waiting_time}, Average Waiting Time = {average_waiting_time}")
-        print(f"Total Turnaround Time = {total_turnaround_time}, Average Turnaround Time = {average_turnaround_time}")
-        print("\nProcess States:")
+        lines.append(f"Total Waiting Time = {total_waiting_time}, Average Waiting Time = {average_waiting_time}")
+        lines.append(f"Total Turnaround Time = {total_turnaround_time}, Average Turnaround Time = {average_turnaround_time}")
+        lines.append("\nProcess States:")
         for process in self.processes:
-            print(f"Process {process.pid}: {process.state}")
-        print(f"Average Response Time = {sum(p.response_time for p in self.processes) / len(self.processes)}")
+            lines.append(f"Process {process.pid}: {process.state}")
+        lines.append(f"Average Response Time = {sum(p.response_time for p in self.processes) / len(self.processes)}")
+
+        from quantile_sketch import LatencySketches
+        lines.extend(LatencySketches.from_processes(self.processes).format_lines())
+        return "\n".join(lines) + "\n"
+
+    def display_statistics(self):
+        sys.stdout.write(self.format_statistics())
 
     def calculate_waiting_time(self, process, current_time):
         """Calculate accurate waiting time"""
@@ -284,8 +406,9 @@ class CPUScheduler:
             print("4. Run SJF (Preemptive)")
             print("5. Run Priority (Non-preemptive)")
             print("6. Run Priority (Preemptive)")
-            print("7. Display Statistics")
-            print("8. Exit")
+            print("7. Run FCFS")
+            print("8. Display Statistics")
+            print("9. Exit")
             
             try:
                 choice = int(input("Enter your choice: "))
@@ -308,8 +431,10 @@ class CPUScheduler:
                 elif choice == 6:
                     self.display_gantt_chart(self.priority_scheduling(preemptive=True))
                 elif choice == 7:
-                    self.display_statistics()
+                    self.display_gantt_chart(self.fcfs())
                 elif choice == 8:
+                    self.display_statistics()
+                elif choice == 9:
                     break
                 else:
                     print("Invalid choice. Please try again.")
@@ -319,5 +444,9 @@ class CPUScheduler:
                 print(f"An unexpected error occurred: {str(e)}")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Arguments select the non-interactive batch CLI
+        from scheduler_cli import main
+        sys.exit(main())
     scheduler = CPUScheduler()
     scheduler.menu()
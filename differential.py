@@ -0,0 +1,144 @@
+"""Differential fuzzing of the scheduling engines against the reference loops.
+
+Every random case runs through the CPUScheduler methods (the reference),
+OnlineScheduler fed in random clock steps, and the fast_engine kernel on
+every backend available here (the numba JIT only when numba loads, the
+vectorized FCFS path only when NumPy imports), and the Gantt segments
+and per-process metrics must match exactly.
+
+Usage: python differential.py [--cases N] [--seed S] [-a ALGORITHMS]
+"""
+import argparse
+import random
+import sys
+import time
+
+from comparison import entry_from_run
+from cpu_scheduler import ALGORITHMS
+from fast_engine import available_kernels, run_fast, vectorized_available
+from online_scheduler import OnlineScheduler
+from result_cache import PROCESS_FIELDS, ResultCache
+from workload import Workload
+
+
+def random_case(rng):
+    """A small random workload and quantum, biased towards ties and idle gaps"""
+    size = rng.randint(3, 12)
+    pids = rng.sample(range(1, 100), size)  # Shuffled so pid tie breaks matter
+    records = []
+    arrival = 0
+    for pid in pids:
+        records.append((pid, arrival, rng.randint(1, 8), rng.randint(0, 3)))
+        arrival += rng.choice((0, 0, 1, 2, 3, 9))
+    return Workload.from_records(records), rng.randint(1, 5)
+
+
+def reference_entry(workload, algorithm, time_quantum):
+    scheduler = workload.to_scheduler(time_quantum)
+    gantt_chart, time_chart = scheduler.run(algorithm)
+    return ResultCache.make_entry(scheduler.processes, gantt_chart, time_chart)
+
+
+def online_entry(workload, algorithm, time_quantum, rng):
+    """Run OnlineScheduler with jobs submitted just in time and random advances"""
+    online = OnlineScheduler(algorithm, time_quantum)
+    pending = sorted(workload.to_processes(), key=lambda p: p.arrival_time)
+    for process in pending:
+        while online.time < process.arrival_time:
+            online.advance_to(min(process.arrival_time, online.time + rng.randint(1, 4)))
+        online.submit(process)
+    online.drain()
+    by_pid = {p.pid: p for p in online.processes}
+    processes = [by_pid[pid] for pid in workload.pids]
+    return ResultCache.make_entry(processes, online.gantt_chart, online.time_chart)
+
+
+def fast_entries(workload, algorithm, time_quantum):
+    """Cache entries of the fast_engine backends available here, by engine name"""
+    entries = {}
+    if algorithm == "fcfs":
+        # FCFS skips the kernel: a plain loop, or one NumPy pass when it imports
+        for vectorized in (False, True) if vectorized_available() else (False,):
+            gantt_data, metrics = run_fast(workload, algorithm, time_quantum, vectorized=vectorized)
+            name = "fast_engine[numpy]" if vectorized else "fast_engine[python]"
+            entries[name] = entry_from_run(workload.pids, gantt_data, metrics)
+        return entries
+    for kernel in available_kernels():
+        gantt_data, metrics = run_fast(workload, algorithm, time_quantum, kernel=kernel)
+        entries[f"fast_engine[{kernel}]"] = entry_from_run(workload.pids, gantt_data, metrics)
+    return entries
+
+
+def entry_mismatch(expected, actual):
+    """First difference between two cache entries, or None"""
+    for field in ("gantt_chart", "time_chart"):
+        for i, (want, got) in enumerate(zip(expected[field], actual[field])):
+            if want != got:
+                return f"{field}[{i}]: expected {want}, got {got}"
+        if len(expected[field]) != len(actual[field]):
+            return f"{field}: expected {len(expected[field])} segments, got {len(actual[field])}"
+    for want, got in zip(expected["processes"], actual["processes"]):
+        for name, a, b in zip(("pid",) + PROCESS_FIELDS, want, got):
+            if a != b:
+                return f"P{want[0]} {name}: expected {a}, got {b}"
+    return None
+
+
+def check_case(workload, algorithm, time_quantum, rng):
+    """Mismatch descriptions of every engine against the reference for one run"""
+    expected = reference_entry(workload, algorithm, time_quantum)
+    engines = {"online": online_entry(workload, algorithm, time_quantum, rng)}
+    engines.update(fast_entries(workload, algorithm, time_quantum))
+    failures = []
+    for name, entry in engines.items():
+        mismatch = entry_mismatch(expected, entry)
+        if mismatch:
+            failures.append(f"{name}: {mismatch}")
+    return failures
+
+
+def fuzz(cases, seed=0, algorithms=None):
+    """Run `cases` random cases; returns a list of (case seed, algorithm, quantum, records, failures).
+
+    Case i uses seed + i, so a failure reproduces with --seed <case seed> --cases 1.
+    """
+    algorithms = list(algorithms or ALGORITHMS)
+    failures = []
+    for case_seed in range(seed, seed + cases):
+        rng = random.Random(case_seed)
+        workload, time_quantum = random_case(rng)
+        for algo in algorithms:
+            problems = check_case(workload, algo, time_quantum, rng)
+            if problems:
+                failures.append((case_seed, algo, time_quantum, list(workload.records()), problems))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-a", "--algorithms", default="all",
+                        help=f"comma separated algorithm codes or 'all' (choices: {', '.join(ALGORITHMS)})")
+    args = parser.parse_args(argv)
+    from scheduler_cli import parse_algorithms
+
+    print(f"fast_engine kernels: {', '.join(available_kernels())}")
+    if "numba" not in available_kernels():
+        print("skipping the numba kernel: numba is not installed or CPU_SCHEDULER_ACCEL=0")
+    if not vectorized_available():
+        print("skipping the NumPy FCFS path: numpy is not installed or CPU_SCHEDULER_ACCEL=0")
+    start = time.perf_counter()
+    failures = fuzz(args.cases, args.seed, parse_algorithms(args.algorithms))
+    elapsed = time.perf_counter() - start
+    for case_seed, algo, time_quantum, records, problems in failures[:20]:
+        print(f"seed {case_seed} {algo} quantum={time_quantum} records={records}")
+        for problem in problems:
+            print(f"    {problem}")
+    print(f"{args.cases} cases in {elapsed:.1f}s ({args.cases / elapsed * 60:.0f}/min), "
+          f"{len(failures)} mismatching runs")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
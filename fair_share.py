@@ -0,0 +1,210 @@
+import heapq
+
+from cpu_scheduler import DEFAULT_TICKETS
+from online_scheduler import OnlineScheduler, SchedulerListener
+from proportional_share import check_tickets
+from quantile_sketch import LatencySketches
+
+# Virtual runtime numerator; a child's vruntime grows by SCALE // weight per
+# time unit it runs, so keep weights well below it
+SCALE = 1 << 20
+ROOT = ""
+
+
+def group_path(process):
+    """Group of a process as a "tenant/service" path; ungrouped ones belong to the root"""
+    return process.group or ROOT
+
+
+def ancestors(path):
+    """`path` and every enclosing group up to the root, innermost first"""
+    paths = [path]
+    while path:
+        path = path.rpartition("/")[0]
+        paths.append(path)
+    return paths
+
+
+class Group:
+    """One node of the group tree with its own ready heap of children"""
+
+    def __init__(self, path, weight, parent):
+        if not 0 < weight < SCALE:
+            raise ValueError(f"Group {path or '/'} needs 0 < weight < {SCALE}, got {weight}")
+        self.path = path
+        self.weight = weight
+        self.parent = parent
+        self.heap = []  # (vruntime, seq, child group or process)
+        self.vruntime = 0  # Position in the parent's heap
+        self.clock = 0  # Smallest vruntime dispatched from this group so far
+        self.queued = 0  # Ready processes anywhere below this group
+
+
+class HierarchicalFairPolicy:
+    """Cgroup-like fair share: pick a group at each level, then a process.
+
+    Groups form a tree of "/" separated paths, each weighted against its
+    siblings; processes are weighted by tickets against the other processes
+    and subgroups of their group. Group weights and tickets are on one
+    scale: a subgroup with weight w competes like a process holding w
+    tickets, and groups missing from `weights` get DEFAULT_TICKETS, so an
+    ungrouped process and a default group split their parent evenly. Every
+    group keeps a heap of its runnable children ordered by virtual runtime
+    (CPU time over weight), so a pop walks down the smallest child at each
+    level and a push or a charge walks back up, O(depth * log n). Slices
+    are charged when dispatched, since they are never cut short.
+    """
+
+    preemptive = False
+
+    def __init__(self, quantum, weights=None):
+        self.quantum = quantum
+        self.seq = 0
+        self.root = Group(ROOT, 1, None)
+        self.groups = {ROOT: self.root}
+        self.vruntimes = {}  # id(process) -> vruntime of processes that ran before
+        for path, weight in sorted((weights or {}).items()):
+            self.group(path.strip("/"), weight)
+
+    def __len__(self):
+        return self.root.queued
+
+    def group(self, path, weight=DEFAULT_TICKETS):
+        """The group at `path`, created with its missing ancestors on first use"""
+        group = self.groups.get(path)
+        if group is None:
+            parent = self.group(path.rpartition("/")[0]) if path else None
+            group = self.groups[path] = Group(path, weight, parent)
+        return group
+
+    def check(self, process):
+        check_tickets(process, SCALE)
+
+    def push(self, process):
+        group = self.group(group_path(process))
+        # Newcomers start at the group's clock so they cannot monopolize it
+        self._enqueue(group, self.vruntimes.pop(id(process), group.clock), process)
+        while group is not None:
+            group.queued += 1
+            if group.queued == 1 and group.parent is not None:
+                # The group just became runnable and joins its parent's heap
+                group.vruntime = max(group.vruntime, group.parent.clock)
+                self._enqueue(group.parent, group.vruntime, group)
+            group = group.parent
+
+    def pop(self):
+        path = []
+        node = self.root
+        while True:
+            vruntime, _, child = heapq.heappop(node.heap)
+            node.clock = max(node.clock, vruntime)
+            if not isinstance(child, Group):
+                break
+            path.append(child)
+            node = child
+        process = child
+        run_time = min(self.quantum, process.remaining_time)
+        if run_time < process.remaining_time:
+            self.vruntimes[id(process)] = vruntime + run_time * SCALE // process.tickets
+        # Charge the slice to every group on the way down and requeue the busy ones
+        for group in reversed(path):
+            group.queued -= 1
+            group.vruntime += run_time * SCALE // group.weight
+            if group.queued:
+                self._enqueue(group.parent, group.vruntime, group)
+        self.root.queued -= 1
+        return process
+
+    def preempts(self, running):
+        return False
+
+    def pids(self):
+        """Ready pids in the order they would be picked if nothing changed"""
+        order = []
+
+        def walk(group):
+            for _, _, child in sorted(group.heap, key=lambda e: e[:2]):
+                if isinstance(child, Group):
+                    walk(child)
+                else:
+                    order.append(child.pid)
+
+        walk(self.root)
+        return order
+
+    def _enqueue(self, group, vruntime, child):
+        self.seq += 1
+        heapq.heappush(group.heap, (vruntime, self.seq, child))
+
+
+class GroupMonitor(SchedulerListener):
+    """CPU time and latency percentiles per group, rolled up into every ancestor.
+
+    Processes must be registered with track() (or passed in) so segments
+    can be attributed to their group; only their pid and group are kept.
+    """
+
+    def __init__(self, processes=()):
+        self.groups = {}  # pid -> group path
+        self.cpu_time = {}
+        self.latency = {}
+        self.completed = {}
+        self.busy_time = 0
+        for process in processes:
+            self.track(process)
+
+    def track(self, process):
+        self.groups[process.pid] = group_path(process)
+
+    def on_segment(self, pid, start, end):
+        self.busy_time += end - start
+        for path in ancestors(self.groups[pid]):
+            self.cpu_time[path] = self.cpu_time.get(path, 0) + end - start
+
+    def on_complete(self, process, time):
+        for path in ancestors(self.groups[process.pid]):
+            if path not in self.latency:
+                self.latency[path] = LatencySketches()
+            self.latency[path].add_process(process)
+            self.completed[path] = self.completed.get(path, 0) + 1
+
+    def report(self, elapsed=None):
+        """{group path: {cpu_time, utilization, share, completed, latency}}.
+
+        Utilization is CPU time over `elapsed` (default: all busy time) and
+        share is CPU time over the parent group's CPU time. The root group
+        is reported as "/".
+        """
+        elapsed = elapsed or self.busy_time
+        report = {}
+        for path in sorted(set(self.cpu_time) | set(self.completed)):
+            cpu = self.cpu_time.get(path, 0)
+            parent_cpu = self.cpu_time.get(path.rpartition("/")[0], 0) if path else cpu
+            latency = self.latency.get(path)
+            report[path or "/"] = {
+                "cpu_time": cpu,
+                "utilization": cpu / elapsed if elapsed else 0,
+                "share": cpu / parent_cpu if parent_cpu else 0,
+                "completed": self.completed.get(path, 0),
+                "latency": latency.percentiles() if latency else {},
+            }
+        return report
+
+
+def simulate_fair_share(processes, weights=None, time_quantum=1, until=None):
+    """Run processes under hierarchical fair share and return GroupMonitor.report().
+
+    With `until` the run stops at that time, which measures the split
+    between groups while they all compete; otherwise it runs to completion.
+    """
+    policy = HierarchicalFairPolicy(time_quantum, weights)
+    scheduler = OnlineScheduler("fair_share", time_quantum, record_history=False, policy=policy)
+    monitor = GroupMonitor(processes)
+    scheduler.add_listener(monitor)
+    for process in processes:
+        scheduler.submit(process)
+    if until is None:
+        scheduler.drain()
+    else:
+        scheduler.advance_to(until)
+    return monitor.report(scheduler.time)
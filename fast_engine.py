@@ -0,0 +1,312 @@
+import heapq
+import os
+
+from cpu_scheduler import ALGORITHMS, run_summary
+
+# Kernel policy codes
+RR, SJF, SJF_P, PRIORITY, PRIORITY_P = range(5)
+POLICY_CODES = {"rr": RR, "sjf": SJF, "sjf_p": SJF_P, "priority": PRIORITY, "priority_p": PRIORITY_P}
+
+# Set CPU_SCHEDULER_ACCEL=0 to force the pure Python kernel
+ACCEL_ENV = "CPU_SCHEDULER_ACCEL"
+
+_backend = None
+_numpy = None
+
+
+def _key(policy, i, arrivals, bursts, priorities, pids, remaining):
+    # Ready-queue ordering of each policy; the index breaks ties the way
+    # min() over the process list does in CPUScheduler
+    if policy == SJF:
+        return (bursts[i], arrivals[i], pids[i], i)
+    if policy == SJF_P:
+        return (remaining[i], pids[i], 0, i)
+    return (priorities[i], pids[i], 0, i)
+
+
+def _schedule(policy, quantum, arrivals, bursts, priorities, pids, order, ring,
+              seg_pid, seg_start, seg_end, completion, first_start):
+    """Event loop shared by every policy, written in the subset numba compiles.
+
+    Columns are indexed by process; `order` lists indices by (arrival, index)
+    and `ring` is scratch space of at least n entries. Segments go to the
+    preallocated seg_* outputs; returns the number of segments written.
+    """
+    n = len(arrivals)
+    remaining = bursts.copy()
+    for i in range(n):
+        first_start[i] = -1
+    nseg = 0
+    t = 0
+    nxt = 0
+    done = 0
+
+    if policy == RR:
+        head = 0
+        size = 0
+        batch = [0]
+        batch.pop()
+        while done < n:
+            # Admit arrivals in list order, behind any requeued process
+            while nxt < n and arrivals[order[nxt]] <= t:
+                heapq.heappush(batch, order[nxt])
+                nxt += 1
+            while batch:
+                ring[(head + size) % n] = heapq.heappop(batch)
+                size += 1
+            if size == 0:
+                t = arrivals[order[nxt]]
+                continue
+            i = ring[head]
+            head = (head + 1) % n
+            size -= 1
+            run = min(quantum, remaining[i])
+            if first_start[i] < 0:
+                first_start[i] = t
+            seg_pid[nseg] = pids[i]
+            seg_start[nseg] = t
+            seg_end[nseg] = t + run
+            nseg += 1
+            t += run
+            remaining[i] -= run
+            if remaining[i] == 0:
+                completion[i] = t
+                done += 1
+            else:
+                ring[(head + size) % n] = i
+                size += 1
+        return nseg
+
+    preemptive = policy == SJF_P or policy == PRIORITY_P
+    heap = [(0, 0, 0, 0)]
+    heap.pop()
+    running = -1
+    start = 0
+    while done < n:
+        while nxt < n and arrivals[order[nxt]] <= t:
+            heapq.heappush(heap, _key(policy, order[nxt], arrivals, bursts, priorities, pids, remaining))
+            nxt += 1
+        if running < 0:
+            if not heap:
+                t = arrivals[order[nxt]]
+                continue
+            running = heapq.heappop(heap)[3]
+            start = t
+            if first_start[running] < 0:
+                first_start[running] = t
+        stop = t + remaining[running]
+        if preemptive and nxt < n and arrivals[order[nxt]] < stop:
+            stop = arrivals[order[nxt]]
+        remaining[running] -= stop - t
+        t = stop
+        if remaining[running] == 0:
+            seg_pid[nseg] = pids[running]
+            seg_start[nseg] = start
+            seg_end[nseg] = t
+            nseg += 1
+            completion[running] = t
+            done += 1
+            running = -1
+            continue
+        # Stopped at an arrival: the newcomer may preempt
+        while nxt < n and arrivals[order[nxt]] <= t:
+            heapq.heappush(heap, _key(policy, order[nxt], arrivals, bursts, priorities, pids, remaining))
+            nxt += 1
+        current = _key(policy, running, arrivals, bursts, priorities, pids, remaining)
+        if heap[0] < current:
+            seg_pid[nseg] = pids[running]
+            seg_start[nseg] = start
+            seg_end[nseg] = t
+            nseg += 1
+            heapq.heappush(heap, current)
+            running = -1
+    return nseg
+
+
+def _load_numba():
+    if os.environ.get(ACCEL_ENV, "1") == "0":
+        return None
+    try:
+        import numba
+        import numpy
+    except ImportError:
+        return None
+    key = numba.njit(cache=True)(_key)
+    # Rebind the helper the kernel calls to its compiled version
+    kernel_globals = dict(_schedule.__globals__, _key=key)
+    kernel = type(_schedule)(_schedule.__code__, kernel_globals, _schedule.__name__)
+    return numba.njit(cache=True)(kernel), numpy
+
+
+def get_backend():
+    """Name of the kernel backend in use: "numba" or "python" """
+    global _backend
+    if _backend is None:
+        loaded = _load_numba()
+        _backend = ("numba",) + loaded if loaded else ("python",)
+    return _backend[0]
+
+
+def available_kernels():
+    """Kernels run_fast() can be asked for here: "python", plus "numba" when it loads"""
+    return ["python", "numba"] if get_backend() == "numba" else ["python"]
+
+
+def _get_numpy():
+    """NumPy for the vectorized paths, or False when missing or disabled"""
+    global _numpy
+    if _numpy is None:
+        _numpy = False
+        if os.environ.get(ACCEL_ENV, "1") != "0":
+            try:
+                import numpy
+                _numpy = numpy
+            except ImportError:
+                pass
+    return _numpy
+
+
+def vectorized_available():
+    """True when NumPy imports, so schedule_in_order() can run vectorized"""
+    return bool(_get_numpy())
+
+
+def schedule_in_order(order, arrivals, bursts, vectorized=None):
+    """Start and completion times of jobs run back to back in a fixed order.
+
+    Job k starts at max(its arrival, completion of job k - 1). That is a
+    running max of arrival minus the bursts before it, plus those bursts,
+    so with NumPy millions of jobs take one vectorized pass. Any
+    non-preemptive schedule reduces to this once its order is known.
+    Returns (starts, completions) by position in `order`, as NumPy arrays
+    when vectorized and lists otherwise. `vectorized` forces NumPy on or
+    off; by default it is used when available.
+    """
+    numpy = _vector_numpy(vectorized)
+    if numpy:
+        order = numpy.asarray(order, dtype=numpy.int64)
+        a = numpy.asarray(arrivals, dtype=numpy.int64)[order]
+        b = numpy.asarray(bursts, dtype=numpy.int64)[order]
+        before = numpy.cumsum(b) - b
+        starts = numpy.maximum.accumulate(a - before) + before
+        return starts, starts + b
+    starts = []
+    completions = []
+    t = 0
+    for i in order:
+        t = max(t, arrivals[i])
+        starts.append(t)
+        t += bursts[i]
+        completions.append(t)
+    return starts, completions
+
+
+def _vector_numpy(vectorized):
+    """NumPy if the vectorized path should run, else False"""
+    if vectorized is False:
+        return False
+    numpy = _get_numpy()
+    if vectorized and not numpy:
+        raise ValueError("NumPy is not available")
+    return numpy
+
+
+def _run_fcfs(workload, vectorized=None):
+    """FCFS needs no event loop: arrival order plus schedule_in_order()"""
+    order = workload.arrival_order
+    starts, completions = schedule_in_order(order, workload.arrivals, workload.bursts, vectorized)
+    n = len(order)
+    numpy = _vector_numpy(vectorized)
+    if numpy:
+        index = numpy.asarray(order, dtype=numpy.int64)
+        completion = numpy.empty(n, dtype=numpy.int64)
+        first_start = numpy.empty(n, dtype=numpy.int64)
+        completion[index] = completions
+        first_start[index] = starts
+        seg_pid = numpy.asarray(workload.pids, dtype=numpy.int64)[index].tolist()
+        return seg_pid, starts.tolist(), completions.tolist(), completion.tolist(), first_start.tolist()
+    completion = [0] * n
+    first_start = [0] * n
+    for i, start, end in zip(order, starts, completions):
+        completion[i] = end
+        first_start[i] = start
+    seg_pid = [workload.pids[i] for i in order]
+    return seg_pid, starts, completions, completion, first_start
+
+
+def segment_capacity(algorithm, bursts, time_quantum):
+    """Upper bound on the number of Gantt segments a run can produce"""
+    if algorithm == "rr":
+        return sum(-(-b // time_quantum) for b in bursts)
+    if algorithm == "fcfs":
+        return len(bursts)
+    if algorithm in ("sjf_p", "priority_p"):
+        # Every preemption is caused by a distinct arrival
+        return 2 * len(bursts)
+    return len(bursts)
+
+
+def run_fast(workload, algorithm, time_quantum=3, kernel=None, vectorized=None):
+    """Schedule a Workload with the accelerated kernel.
+
+    Returns ((gantt_chart, time_chart), metrics) where metrics maps
+    completion_time, waiting_time, turnaround_time, response_time and
+    start_time to per-process lists in workload order. The output matches
+    the CPUScheduler algorithm of the same name exactly. `kernel` forces
+    "python" or "numba" (see available_kernels()); by default the one
+    get_backend() picked runs. `vectorized` forces the NumPy FCFS path on
+    or off, as in schedule_in_order().
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if kernel is None:
+        kernel = get_backend()
+    elif kernel not in available_kernels():
+        raise ValueError(f"Kernel {kernel} is not available")
+    n = len(workload)
+    if n == 0:
+        empty = {name: [] for name in ("completion_time", "waiting_time", "turnaround_time",
+                                       "response_time", "start_time")}
+        return ([], []), empty
+    capacity = segment_capacity(algorithm, workload.bursts, time_quantum)
+    columns = (workload.arrivals, workload.bursts, workload.priorities, workload.pids,
+               workload.arrival_order)
+
+    if algorithm == "fcfs":
+        seg_pid, seg_start, seg_end, completion, first_start = _run_fcfs(workload, vectorized)
+    elif kernel == "numba":
+        kernel, numpy = _backend[1], _backend[2]
+        arrivals, bursts, priorities, pids, order = (numpy.asarray(c, dtype=numpy.int64) for c in columns)
+        ring = numpy.zeros(n, dtype=numpy.int64)
+        seg_pid, seg_start, seg_end = (numpy.zeros(capacity, dtype=numpy.int64) for _ in range(3))
+        completion = numpy.zeros(n, dtype=numpy.int64)
+        first_start = numpy.zeros(n, dtype=numpy.int64)
+        nseg = kernel(POLICY_CODES[algorithm], time_quantum, arrivals, bursts, priorities, pids,
+                      order, ring, seg_pid, seg_start, seg_end, completion, first_start)
+        seg_pid, seg_start, seg_end = (a[:nseg].tolist() for a in (seg_pid, seg_start, seg_end))
+        completion, first_start = completion.tolist(), first_start.tolist()
+    else:
+        arrivals, bursts, priorities, pids, order = (list(c) for c in columns)
+        ring = [0] * n
+        seg_pid, seg_start, seg_end = [0] * capacity, [0] * capacity, [0] * capacity
+        completion = [0] * n
+        first_start = [0] * n
+        nseg = _schedule(POLICY_CODES[algorithm], time_quantum, arrivals, bursts, priorities, pids,
+                         order, ring, seg_pid, seg_start, seg_end, completion, first_start)
+        del seg_pid[nseg:], seg_start[nseg:], seg_end[nseg:]
+
+    turnaround = [c - a for c, a in zip(completion, workload.arrivals)]
+    metrics = {
+        "completion_time": completion,
+        "turnaround_time": turnaround,
+        "waiting_time": [t - b for t, b in zip(turnaround, workload.bursts)],
+        "response_time": [s - a for s, a in zip(first_start, workload.arrivals)],
+        "start_time": first_start,
+    }
+    return (seg_pid, list(zip(seg_start, seg_end))), metrics
+
+
+def summarize(workload, gantt_data, metrics):
+    """CPUScheduler.summary() computed from run_fast() output without Process objects"""
+    return run_summary(gantt_data, metrics["waiting_time"], metrics["turnaround_time"],
+                       metrics["response_time"])
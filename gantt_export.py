@@ -0,0 +1,201 @@
+import os
+
+# Same palette as the Tk Gantt chart, indexed by pid
+PALETTE = ("#FFB6C1", "#98FB98", "#87CEFA", "#DDA0DD", "#F0E68C")
+BACKGROUND = "#FFFFFF"
+MARGIN = 20
+TITLE_HEIGHT = 24
+AXIS_HEIGHT = 30
+# Bars narrower than this (in pixels) are drawn without a pid label
+MIN_LABEL_WIDTH = 28
+
+
+def level_of_detail(gantt_chart, time_chart, columns):
+    """Reduce a Gantt chart to at most `columns` bars for rendering.
+
+    Returns (makespan, bars) with bars as (start, end, pid) in time units;
+    pid is None for idle time. Adjacent segments of the same process are
+    merged. When there are more segments than columns, the timeline is cut
+    into `columns` equal slots; a slot busy for at least half its width
+    shows the process that ran longest in it (otherwise it is idle), and
+    equal neighbouring slots are merged.
+    Runs in O(segments + columns).
+    """
+    if not time_chart:
+        return 0, []
+    makespan = max(end for _, end in time_chart)
+    if len(gantt_chart) <= columns:
+        bars = []
+        prev_end = 0
+        for pid, (start, end) in zip(gantt_chart, time_chart):
+            if start > prev_end:
+                bars.append((prev_end, start, None))
+            if bars and bars[-1][2] == pid and bars[-1][1] == start:
+                bars[-1] = (bars[-1][0], end, pid)
+            else:
+                bars.append((start, end, pid))
+            prev_end = end
+        return makespan, bars
+
+    # Positions are scaled by `columns` so slot c spans [c*makespan, (c+1)*makespan)
+    # and all the bookkeeping stays in exact integers
+    full = [None] * columns  # pid covering a whole slot
+    partial = {}  # slot -> {pid: occupied time}
+    for pid, (start, end) in zip(gantt_chart, time_chart):
+        xs, xe = start * columns, end * columns
+        c0, c1 = xs // makespan, xe // makespan
+        if c0 == c1:
+            shares = partial.setdefault(c0, {})
+            shares[pid] = shares.get(pid, 0) + xe - xs
+            continue
+        shares = partial.setdefault(c0, {})
+        shares[pid] = shares.get(pid, 0) + (c0 + 1) * makespan - xs
+        for c in range(c0 + 1, c1):
+            full[c] = pid
+        tail = xe - c1 * makespan
+        if tail:
+            shares = partial.setdefault(c1, {})
+            shares[pid] = shares.get(pid, 0) + tail
+
+    for c, shares in partial.items():
+        # Busy or idle is decided on the total, so a slot shared by several
+        # processes is not drawn as idle; a busy slot shows its largest one
+        busy = sum(shares.values())
+        full[c] = max(shares, key=shares.get) if busy >= makespan - busy else None
+
+    bars = []
+    step = makespan / columns
+    run_start = 0
+    for c in range(1, columns + 1):
+        if c == columns or full[c] != full[run_start]:
+            bars.append((run_start * step, c * step, full[run_start]))
+            run_start = c
+    return makespan, bars
+
+
+def tick_step(makespan, max_ticks=10):
+    """Round axis tick spacing (1, 2 or 5 times a power of ten)"""
+    step = 1
+    while True:
+        for factor in (1, 2, 5):
+            if makespan / (step * factor) <= max_ticks:
+                return step * factor
+        step *= 10
+
+
+def pid_color(pid):
+    return BACKGROUND if pid is None else PALETTE[pid % len(PALETTE)]
+
+
+def render_svg(gantt_chart, time_chart, width=1200, bar_height=40, title=None):
+    """Render the schedule as an SVG document string"""
+    plot_width = width - 2 * MARGIN
+    makespan, bars = level_of_detail(gantt_chart, time_chart, plot_width)
+    exact = len(gantt_chart) <= plot_width
+    top = MARGIN + (TITLE_HEIGHT if title else 0)
+    height = top + bar_height + AXIS_HEIGHT + MARGIN
+    scale = plot_width / makespan if makespan else 0
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="11">\n',
+        f'<rect width="{width}" height="{height}" fill="{BACKGROUND}"/>\n',
+    ]
+    if title:
+        parts.append(f'<text x="{MARGIN}" y="{MARGIN + 12}" font-size="14">{_escape(title)}</text>\n')
+    stroke = ' stroke="black" stroke-width="0.5"' if exact else ""
+    for start, end, pid in bars:
+        if pid is None:
+            continue
+        x = MARGIN + start * scale
+        w = (end - start) * scale
+        label = f"P{pid}: {start:g}-{end:g}" if exact else f"P{pid} (mostly): {start:.1f}-{end:.1f}"
+        parts.append(f'<rect x="{x:.2f}" y="{top}" width="{w:.2f}" height="{bar_height}" '
+                     f'fill="{pid_color(pid)}"{stroke}><title>{label}</title></rect>\n')
+        if w >= MIN_LABEL_WIDTH:
+            parts.append(f'<text x="{x + w / 2:.2f}" y="{top + bar_height / 2 + 4}" '
+                         f'text-anchor="middle">P{pid}</text>\n')
+
+    axis_y = top + bar_height
+    parts.append(f'<rect x="{MARGIN}" y="{top}" width="{plot_width}" height="{bar_height}" '
+                 f'fill="none" stroke="black"/>\n')
+    if makespan:
+        step = tick_step(makespan)
+        for t in range(0, makespan + 1, step):
+            x = MARGIN + t * scale
+            parts.append(f'<line x1="{x:.2f}" y1="{axis_y}" x2="{x:.2f}" y2="{axis_y + 5}" stroke="black"/>'
+                         f'<text x="{x:.2f}" y="{axis_y + 18}" text-anchor="middle">{t}</text>\n')
+    parts.append("</svg>\n")
+    return "".join(parts)
+
+
+def render_png(gantt_chart, time_chart, width=1200, bar_height=40):
+    """Rasterize the schedule to PNG bytes without third-party imaging libraries.
+
+    Bars, borders and axis ticks are drawn one pixel column at a time; text
+    is not rendered, so use SVG when labels are needed.
+    """
+    import struct
+    import zlib
+
+    plot_width = width - 2 * MARGIN
+    makespan, bars = level_of_detail(gantt_chart, time_chart, plot_width)
+    height = MARGIN + bar_height + AXIS_HEIGHT + MARGIN
+    white = bytes.fromhex(BACKGROUND[1:])
+    black = b"\x00\x00\x00"
+
+    # Colour of every pixel column inside the plot
+    columns = [white] * plot_width
+    scale = plot_width / makespan if makespan else 0
+    for start, end, pid in bars:
+        if pid is None:
+            continue
+        color = bytes.fromhex(pid_color(pid)[1:])
+        x0 = int(start * scale)
+        x1 = max(int(end * scale), x0 + 1)
+        columns[x0:x1] = [color] * (min(x1, plot_width) - x0)
+
+    margin = white * MARGIN
+    blank_row = b"\x00" + white * width
+    border_row = b"\x00" + margin + black * plot_width + margin
+    bar_row = b"\x00" + margin[:-3] + black + b"".join(columns) + black + margin[3:]
+    ticks = bytearray(white * width)
+    if makespan:
+        step = tick_step(makespan)
+        for t in range(0, makespan + 1, step):
+            x = min(MARGIN + int(t * scale), width - 1)
+            ticks[3 * x:3 * x + 3] = black
+    tick_row = b"\x00" + bytes(ticks)
+
+    rows = ([blank_row] * (MARGIN - 1) + [border_row] + [bar_row] * bar_height
+            + [border_row] + [tick_row] * 5)
+    rows += [blank_row] * (height - len(rows))
+    raw = b"".join(rows)
+
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)  # 8-bit RGB
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b""))
+
+
+def export_gantt(path, gantt_data, width=1200, title=None):
+    """Write a Gantt chart to `path` as SVG or PNG, chosen by the file extension"""
+    gantt_chart, time_chart = gantt_data
+    if width <= 2 * MARGIN:
+        raise ValueError(f"Width must be greater than {2 * MARGIN}")
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".svg":
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(render_svg(gantt_chart, time_chart, width, title=title))
+    elif extension == ".png":
+        with open(path, "wb") as f:
+            f.write(render_png(gantt_chart, time_chart, width))
+    else:
+        raise ValueError(f"Unsupported Gantt export format: {extension or path}")
+
+
+def _escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
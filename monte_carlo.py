@@ -0,0 +1,264 @@
+import argparse
+import json
+import math
+import random
+import sys
+from statistics import NormalDist
+
+from cpu_scheduler import ALGORITHMS, SUMMARY_FIELDS
+from fast_engine import run_fast, summarize
+from workload import Workload
+
+DEFAULT_SPEC = {
+    "processes": 10,
+    "interarrival": {"dist": "exponential", "mean": 3},
+    "burst": {"dist": "uniform", "low": 1, "high": 10},
+    "priority": {"dist": "uniform", "low": 0, "high": 5},
+}
+
+
+class RunningStats:
+    """Mean and variance of a stream of values (Welford's algorithm)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def half_width(self, confidence=0.95):
+        """Half-width of the normal-approximation confidence interval of the mean"""
+        if self.count < 2:
+            return math.inf
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        return z * math.sqrt(self.variance() / self.count)
+
+
+def _check_distribution(name, dist):
+    kind = dist.get("dist")
+    required = {"constant": ("value",), "uniform": ("low", "high"),
+                "exponential": ("mean",), "normal": ("mean", "stddev")}
+    if kind not in required:
+        raise ValueError(f"Unknown distribution for {name}: {kind}")
+    missing = [key for key in required[kind] if key not in dist]
+    if missing:
+        raise ValueError(f"Distribution for {name} needs {', '.join(missing)}")
+    if kind == "uniform" and dist["low"] > dist["high"]:
+        raise ValueError(f"Uniform distribution for {name} has low > high")
+    if kind == "exponential" and dist["mean"] <= 0:
+        raise ValueError(f"Exponential distribution for {name} needs a positive mean")
+    return dist
+
+
+class WorkloadSpec:
+    """Random workload generator described by a JSON-style dict.
+
+    "processes" is a count or a [low, high] range; "interarrival", "burst"
+    and "priority" are distributions such as {"dist": "uniform", "low": 1,
+    "high": 10}, {"dist": "exponential", "mean": 3}, {"dist": "normal",
+    "mean": 5, "stddev": 2} or {"dist": "constant", "value": 4}. Samples
+    are rounded to whole time units; bursts are at least 1 and the first
+    process arrives at time 0. The same seed always gives the same workload.
+    """
+
+    def __init__(self, spec=None):
+        spec = dict(DEFAULT_SPEC, **(spec or {}))
+        processes = spec["processes"]
+        if isinstance(processes, int):
+            processes = [processes, processes]
+        if len(processes) != 2 or not 1 <= processes[0] <= processes[1]:
+            raise ValueError("processes must be a positive count or a [low, high] range")
+        self.processes = tuple(processes)
+        self.interarrival = _check_distribution("interarrival", spec["interarrival"])
+        self.burst = _check_distribution("burst", spec["burst"])
+        self.priority = _check_distribution("priority", spec["priority"])
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            return cls(json.load(f))
+
+    @staticmethod
+    def sample(rng, dist):
+        kind = dist["dist"]
+        if kind == "constant":
+            return dist["value"]
+        if kind == "uniform":
+            return rng.randint(dist["low"], dist["high"])
+        if kind == "exponential":
+            return round(rng.expovariate(1 / dist["mean"]))
+        return round(rng.gauss(dist["mean"], dist["stddev"]))
+
+    def generate(self, seed):
+        rng = random.Random(seed)
+        records = []
+        arrival = 0
+        for pid in range(1, rng.randint(*self.processes) + 1):
+            if pid > 1:
+                arrival += max(0, self.sample(rng, self.interarrival))
+            records.append((pid, arrival, max(1, self.sample(rng, self.burst)),
+                            max(0, self.sample(rng, self.priority))))
+        return Workload.from_records(records)
+
+
+def simulate_seed(spec, seed, algorithms, time_quantum):
+    """Summary metrics of every algorithm on the workload generated from `seed`"""
+    workload = spec.generate(seed)
+    results = {}
+    for algo in algorithms:
+        gantt_data, metrics = run_fast(workload, algo, time_quantum)
+        summary = summarize(workload, gantt_data, metrics)
+        results[algo] = [summary[metric] for metric in SUMMARY_FIELDS]
+    return results
+
+
+def _simulate_task(task):
+    return simulate_seed(*task)
+
+
+class MonteCarlo:
+    """Runs seeded random workloads through each algorithm until the means are tight.
+
+    Seeds `seed`, `seed + 1`, ... are simulated in batches (in a process pool
+    unless max_workers is 1) and folded into one RunningStats per algorithm
+    and metric as they return, so memory does not grow with the number of
+    runs. Sampling stops after `max_runs`, or once at least `min_runs` are in
+    and every confidence interval is within `precision` of its mean or within
+    `abs_tolerance` (in the metric's own units), whichever is wider. The
+    absolute bound lets metrics whose mean is near 0, such as waiting time
+    on a lightly loaded CPU, converge.
+    """
+
+    def __init__(self, spec, algorithms=None, time_quantum=3, seed=0, confidence=0.95,
+                 precision=0.02, min_runs=30, max_runs=1000, batch_size=100, max_workers=None,
+                 abs_tolerance=0.01):
+        if not 0 < confidence < 1:
+            raise ValueError("Confidence must be between 0 and 1")
+        if abs_tolerance < 0:
+            raise ValueError("Absolute tolerance cannot be negative")
+        if min_runs < 2 or max_runs < min_runs:
+            raise ValueError("Need 2 <= min_runs <= max_runs")
+        self.spec = spec
+        self.algorithms = list(algorithms or ALGORITHMS)
+        self.time_quantum = time_quantum
+        self.seed = seed
+        self.confidence = confidence
+        self.precision = precision
+        self.abs_tolerance = abs_tolerance
+        self.min_runs = min_runs
+        self.max_runs = max_runs
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.stats = {algo: {metric: RunningStats() for metric in SUMMARY_FIELDS}
+                      for algo in self.algorithms}
+        self.runs = 0
+
+    def add_run(self, results):
+        for algo, values in results.items():
+            for metric, value in zip(SUMMARY_FIELDS, values):
+                self.stats[algo][metric].add(value)
+        self.runs += 1
+
+    def converged(self):
+        if self.runs < self.min_runs:
+            return False
+        for per_metric in self.stats.values():
+            for stats in per_metric.values():
+                allowed = max(self.precision * abs(stats.mean), self.abs_tolerance)
+                if stats.half_width(self.confidence) > allowed:
+                    return False
+        return True
+
+    def run(self):
+        """Sample until converged or max_runs; returns report()"""
+        pool = None
+        if self.max_workers != 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            while self.runs < self.max_runs and not self.converged():
+                start = self.seed + self.runs
+                count = min(self.batch_size, self.max_runs - self.runs)
+                tasks = [(self.spec, seed, self.algorithms, self.time_quantum)
+                         for seed in range(start, start + count)]
+                if pool is None:
+                    batch = map(_simulate_task, tasks)
+                else:
+                    batch = pool.map(_simulate_task, tasks, chunksize=max(1, count // 32))
+                # Results come back in seed order, so stopping is reproducible
+                for results in batch:
+                    self.add_run(results)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return self.report()
+
+    def report(self):
+        """{algorithm: {metric: (mean, half_width)}} over the runs so far"""
+        return {algo: {metric: (stats.mean, stats.half_width(self.confidence))
+                       for metric, stats in per_metric.items()}
+                for algo, per_metric in self.stats.items()}
+
+
+def format_report(report, runs, confidence):
+    lines = [f"{runs} runs, {confidence:.0%} confidence intervals"]
+    for algo, metrics in report.items():
+        lines.append(f"\n=== {ALGORITHMS[algo][0]} ===")
+        for metric, (mean, half_width) in metrics.items():
+            lines.append(f"{metric} = {mean:.3f} ± {half_width:.3f}")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Monte Carlo comparison of scheduling algorithms over random workloads.")
+    parser.add_argument("spec", nargs="?", default=None,
+                        help="JSON workload distribution spec (default: built-in spec)")
+    parser.add_argument("-a", "--algorithms", default="all",
+                        help=f"comma separated algorithm codes or 'all' (choices: {', '.join(ALGORITHMS)})")
+    parser.add_argument("-q", "--quantum", type=int, default=3,
+                        help="Round Robin time quantum (default: 3)")
+    parser.add_argument("-k", "--runs", type=int, default=1000,
+                        help="maximum number of workloads (default: 1000)")
+    parser.add_argument("--min-runs", type=int, default=30,
+                        help="runs before early stopping is considered (default: 30)")
+    parser.add_argument("--seed", type=int, default=0, help="first workload seed (default: 0)")
+    parser.add_argument("--confidence", type=float, default=0.95,
+                        help="confidence level of the intervals (default: 0.95)")
+    parser.add_argument("--precision", type=float, default=0.02,
+                        help="stop once every interval half-width is within this "
+                             "fraction of its mean (default: 0.02)")
+    parser.add_argument("--abs-tolerance", type=float, default=0.01,
+                        help="also stop once every half-width is within this many metric "
+                             "units, for means near 0 (default: 0.01)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU, 1 runs in-process)")
+    args = parser.parse_args(argv)
+    try:
+        from scheduler_cli import parse_algorithms
+
+        if args.quantum <= 0:
+            raise ValueError("Time quantum must be positive")
+        spec = WorkloadSpec.load(args.spec) if args.spec else WorkloadSpec()
+        monte_carlo = MonteCarlo(spec, parse_algorithms(args.algorithms), args.quantum, args.seed,
+                                 args.confidence, args.precision, args.min_runs, args.runs,
+                                 max_workers=args.workers, abs_tolerance=args.abs_tolerance)
+        report = monte_carlo.run()
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 1
+    sys.stdout.write(format_report(report, monte_carlo.runs, args.confidence))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+import heapq
+from collections import deque
+
+
+class SchedulerListener:
+    """Receives events from an OnlineScheduler; override the hooks you need."""
+
+    def on_segment(self, pid, start, end):
+        """A process ran on the CPU from `start` to `end`"""
+
+    def on_complete(self, process, time):
+        """A process finished at `time`"""
+
+    def on_advance(self, time):
+        """The clock reached `time` at the end of an advance_to() call"""
+
+    def on_queue(self, time, ready, pending, busy):
+        """At `time` there are `ready` queued jobs, `pending` not yet arrived, and the CPU is `busy`"""
+
+
+class FifoPolicy:
+    """Round Robin ready queue: FIFO order with a fixed time slice"""
+
+    preemptive = False
+
+    def __init__(self, quantum):
+        self.quantum = quantum
+        self.queue = deque()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def check(self, process):
+        """Raise ValueError if `process` cannot be queued (nothing to check here)"""
+
+    def push(self, process):
+        self.queue.append(process)
+
+    def pop(self):
+        return self.queue.popleft()
+
+    def preempts(self, running):
+        return False
+
+    def pids(self):
+        return [p.pid for p in self.queue]
+
+
+class KeyedPolicy:
+    """Ready queue ordered by a per-process key; the smallest key runs next"""
+
+    quantum = None
+
+    def __init__(self, key, preemptive):
+        self.key = key
+        self.preemptive = preemptive
+        self.heap = []
+        self.seq = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def check(self, process):
+        """Raise ValueError if `process` cannot be queued (nothing to check here)"""
+
+    def push(self, process):
+        self.seq += 1
+        heapq.heappush(self.heap, (self.key(process), self.seq, process))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[2]
+
+    def preempts(self, running):
+        return bool(self.heap) and self.heap[0][0] < self.key(running)
+
+    def pids(self):
+        return [entry[2].pid for entry in sorted(self.heap)]
+
+
+def make_policy(algorithm, time_quantum=3, seed=0):
+    """Ready-queue policy equivalent to the CPUScheduler algorithm `algorithm`.
+
+    `seed` picks the random sequence of lottery scheduling.
+    """
+    if algorithm == "rr":
+        return FifoPolicy(time_quantum)
+    if algorithm == "fcfs":
+        # Ties on arrival keep submission order through the heap sequence
+        return KeyedPolicy(lambda p: p.arrival_time, False)
+    if algorithm == "sjf":
+        return KeyedPolicy(lambda p: (p.burst_time, p.arrival_time, p.pid), False)
+    if algorithm == "sjf_p":
+        return KeyedPolicy(lambda p: (p.remaining_time, p.pid), True)
+    if algorithm in ("priority", "priority_p"):
+        return KeyedPolicy(lambda p: (p.priority, p.pid), algorithm == "priority_p")
+    # Real-time policies; jobs carry a deadline and period (see realtime.py)
+    if algorithm == "edf":
+        return KeyedPolicy(lambda p: (p.deadline, p.pid), True)
+    if algorithm == "rms":
+        return KeyedPolicy(lambda p: (p.period, p.pid), True)
+    # Proportional-share policies; jobs carry tickets (see proportional_share.py)
+    if algorithm in ("stride", "lottery"):
+        from proportional_share import LotteryPolicy, StridePolicy
+
+        return StridePolicy(time_quantum) if algorithm == "stride" else LotteryPolicy(time_quantum, seed)
+    # Hierarchical fair share with default group weights (see fair_share.py)
+    if algorithm == "fair_share":
+        from fair_share import HierarchicalFairPolicy
+
+        return HierarchicalFairPolicy(time_quantum)
+    raise ValueError(f"Unknown algorithm: {algorithm}")
+
+
+class OnlineScheduler:
+    """Incremental, event-driven scheduler that accepts jobs while it runs.
+
+    Jobs are submitted with submit() and the clock is moved with
+    advance_to(); each call only does work proportional to the arrivals,
+    dispatches and completions it processes. Decisions due exactly at the
+    target time are deferred to the next call, so jobs submitted for the
+    current time still compete for the CPU. Given the same jobs up front it
+    produces the same Gantt data as the matching CPUScheduler algorithm.
+    """
+
+    def __init__(self, algorithm="rr", time_quantum=3, record_history=True, policy=None, seed=0):
+        self.algorithm = algorithm
+        # A ready-made policy (e.g. a configured HierarchicalFairPolicy) skips the lookup
+        self.policy = policy if policy is not None else make_policy(algorithm, time_quantum, seed)
+        self.record_history = record_history
+        self.time = 0
+        self.pending = []  # (arrival_time, seq, process) heap of future arrivals
+        self.seq = 0
+        self.running = None
+        self.slice_end = 0
+        self.segment_start = 0
+        self.submitted = 0
+        self.completed = 0
+        self.work_left = 0
+        self.last_arrival = 0
+        self.segments = 0  # Segments emitted so far, recorded or not
+        self.processes = []
+        self.gantt_chart = []
+        self.time_chart = []
+        self.listeners = []
+        # Only kept while listeners are attached: arrival times still ahead, and
+        # jobs that arrived mid-slice but are admitted when the slice ends
+        self.arrival_times = None
+        self.arrived = 0
+
+    @classmethod
+    def from_workload(cls, workload, algorithm="rr", time_quantum=3, **kwargs):
+        """Scheduler with every process of `workload` already submitted"""
+        scheduler = cls(algorithm, time_quantum, **kwargs)
+        for process in workload.to_processes():
+            scheduler.submit(process)
+        return scheduler
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+        if self.arrival_times is None:
+            times = [entry[0] for entry in self.pending]
+            self.arrival_times = [time for time in times if time > self.time]
+            heapq.heapify(self.arrival_times)
+            self.arrived = len(times) - len(self.arrival_times)
+
+    def submit(self, process):
+        """Queue a job; it becomes ready at its arrival_time"""
+        if process.arrival_time < self.time:
+            raise ValueError(f"Arrival time {process.arrival_time} is before the current time {self.time}")
+        if process.burst_time <= 0:
+            raise ValueError("Burst time must be positive")
+        # Checked here, before any state changes, as admission later cannot back out
+        self.policy.check(process)
+        self.seq += 1
+        heapq.heappush(self.pending, (process.arrival_time, self.seq, process))
+        self.submitted += 1
+        self.work_left += process.remaining_time
+        self.last_arrival = max(self.last_arrival, process.arrival_time)
+        if self.arrival_times is not None:
+            if process.arrival_time > self.time:
+                heapq.heappush(self.arrival_times, process.arrival_time)
+            else:
+                self.arrived += 1
+        if self.record_history:
+            self.processes.append(process)
+        self._queue_changed()
+
+    def advance_to(self, t, stop_when_idle=False):
+        """Simulate up to time `t`, or only until the CPU runs dry if `stop_when_idle`"""
+        if t < self.time:
+            raise ValueError(f"Cannot move the clock back from {self.time} to {t}")
+        pending = self.pending
+        policy = self.policy
+        while True:
+            if self.running is None:
+                if self.time >= t:
+                    break
+                self._admit()
+                if not len(policy):
+                    if pending and pending[0][0] < t:
+                        self.time = pending[0][0]  # Idle until the next arrival
+                        continue
+                    if not stop_when_idle:
+                        self.time = t
+                    break
+                self._dispatch()
+
+            stop = min(self.slice_end, t)
+            if policy.preemptive and pending and pending[0][0] < stop:
+                stop = pending[0][0]
+            if self.arrival_times and self.arrival_times[0] < stop:
+                stop = self.arrival_times[0]  # Listeners see every arrival when it happens
+            self._run_until(stop)
+
+            if self.time == self.slice_end:
+                self._end_slice()
+            elif self.time < t:
+                if policy.preemptive:
+                    # An arrival may preempt the running process
+                    self._admit()
+                    if policy.preempts(self.running):
+                        self._preempt()
+                else:
+                    self._note_arrivals()
+            else:
+                break
+        for listener in self.listeners:
+            listener.on_advance(self.time)
+
+    def drain(self):
+        """Run until every submitted job has completed"""
+        self.advance_to(max(self.time, self.last_arrival) + self.work_left, stop_when_idle=True)
+
+    def is_idle(self):
+        return self.running is None and not len(self.policy) and not self.pending
+
+    def gantt_data(self):
+        """(gantt_chart, time_chart) recorded so far"""
+        return self.gantt_chart, self.time_chart
+
+    def snapshot(self):
+        """Point-in-time view of the scheduler state"""
+        running = self.running
+        return {
+            "time": self.time,
+            "running": running.pid if running else None,
+            "running_remaining": running.remaining_time if running else 0,
+            "segment_start": self.segment_start if running else None,
+            "ready": self.policy.pids(),
+            "pending": len(self.pending),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "segments": self.segments,
+        }
+
+    def _admit(self):
+        """Move arrived jobs into the ready queue in submission order"""
+        pending = self.pending
+        if not pending or pending[0][0] > self.time:
+            return
+        arrived = []
+        while pending and pending[0][0] <= self.time:
+            arrived.append(heapq.heappop(pending))
+        arrived.sort(key=lambda entry: entry[1])
+        for _, _, process in arrived:
+            self.policy.push(process)
+        if self.arrival_times is not None:
+            while self.arrival_times and self.arrival_times[0] <= self.time:
+                heapq.heappop(self.arrival_times)
+            self.arrived = 0
+        self._queue_changed()
+
+    def _note_arrivals(self):
+        """Report jobs arriving mid-slice; non-preemptive policies admit them when it ends"""
+        arrival_times = self.arrival_times
+        while arrival_times and arrival_times[0] <= self.time:
+            heapq.heappop(arrival_times)
+            self.arrived += 1
+        self._queue_changed()
+
+    def _dispatch(self):
+        process = self.policy.pop()
+        quantum = self.policy.quantum
+        run_time = process.remaining_time if quantum is None else min(quantum, process.remaining_time)
+        self.running = process
+        self.segment_start = self.time
+        self.slice_end = self.time + run_time
+        process.update_state("running", self.time)
+        self._queue_changed()
+
+    def _run_until(self, stop):
+        elapsed = stop - self.time
+        if elapsed:
+            self.running.remaining_time -= elapsed
+            self.work_left -= elapsed
+            self.time = stop
+
+    def _queue_changed(self):
+        if self.listeners:
+            # Arrived jobs waiting for admission count as ready, not as pending
+            ready = len(self.policy) + self.arrived
+            pending = len(self.pending) - self.arrived
+            busy = self.running is not None
+            for listener in self.listeners:
+                listener.on_queue(self.time, ready, pending, busy)
+
+    def _close_segment(self):
+        pid, start, end = self.running.pid, self.segment_start, self.time
+        if end > start:
+            self.segments += 1
+            if self.record_history:
+                self.gantt_chart.append(pid)
+                self.time_chart.append((start, end))
+            for listener in self.listeners:
+                listener.on_segment(pid, start, end)
+
+    def _end_slice(self):
+        process = self.running
+        self._close_segment()
+        self.running = None
+        if process.remaining_time == 0:
+            process.update_state("completed", self.time)
+            self.completed += 1
+            for listener in self.listeners:
+                listener.on_complete(process, self.time)
+        else:
+            process.update_state("ready", self.time)
+            self.policy.push(process)
+        self._queue_changed()
+
+    def _preempt(self):
+        process = self.running
+        self._close_segment()
+        process.update_state("ready", self.time)
+        self.policy.push(process)
+        self.running = None
+        self._dispatch()
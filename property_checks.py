@@ -0,0 +1,321 @@
+"""Randomized behavioural checks of the modules the engines feed.
+
+Each case builds a small random input and compares a module against a
+brute-force or independent answer: checkpoint round trips against an
+uninterrupted run, RollingMetrics and the timeline against per-tick
+counts, the real-time schedulability pre-check against simulation,
+fair-share group splits against their weights, and Gantt export
+downsampling against per-slot occupancy.
+
+Usage: python property_checks.py [--cases N] [--seed S] [-c CHECKS]
+"""
+import argparse
+import random
+import sys
+import time
+
+from checkpoint import dump_scheduler, load_scheduler
+from cpu_scheduler import ALGORITHMS, DEFAULT_TICKETS, Process
+from differential import entry_mismatch, random_case
+from fair_share import simulate_fair_share
+from gantt_export import level_of_detail
+from online_scheduler import OnlineScheduler, SchedulerListener
+from realtime import Task, check_schedulability, simulate
+from result_cache import ResultCache
+from rolling_metrics import RollingMetrics
+from timeline import TimelineRecorder
+
+# Largest difference allowed between a group's CPU share and its weight share
+SHARE_TOLERANCE = 0.02
+# (wcet, period, deadline) sets where a task's own earlier jobs delay its
+# later ones; random sets rarely hit this, so some cases draw from here
+KNOWN_TASK_SETS = (
+    ((3, 6, 4), (5, 10, 11)),
+    ((1, 3, 2), (5, 15, 30), (3, 9, 5)),
+    ((4, 16, 18), (5, 17, 21), (3, 11, 7), (4, 22, 38)),
+)
+
+
+class CompletionLog(SchedulerListener):
+    def __init__(self):
+        self.times = []
+
+    def on_complete(self, process, time):
+        self.times.append(time)
+
+
+def scheduler_entry(scheduler, workload):
+    by_pid = {p.pid: p for p in scheduler.processes}
+    processes = [by_pid[pid] for pid in workload.pids]
+    return ResultCache.make_entry(processes, scheduler.gantt_chart, scheduler.time_chart)
+
+
+def busy_ticks(scheduler, end):
+    """busy[k] is 1 when the CPU ran during [k, k + 1), counting the open slice"""
+    busy = [0] * end
+    for start, stop in scheduler.time_chart:
+        for k in range(start, min(stop, end)):
+            busy[k] = 1
+    if scheduler.running is not None:
+        for k in range(scheduler.segment_start, end):
+            busy[k] = 1
+    return busy
+
+
+def check_checkpoint(rng):
+    """Stopping anywhere, saving and restoring (twice) must not change the run"""
+    workload, time_quantum = random_case(rng)
+    algorithm = rng.choice(list(ALGORITHMS))
+    straight = OnlineScheduler.from_workload(workload, algorithm, time_quantum)
+    straight.drain()
+    expected = scheduler_entry(straight, workload)
+
+    stopped = OnlineScheduler.from_workload(workload, algorithm, time_quantum)
+    stopped.advance_to(rng.randint(0, straight.time))
+    data = dump_scheduler(stopped)
+    failures = []
+    for fork in range(2):
+        restored = load_scheduler(data)
+        if fork == 0 and dump_scheduler(restored) != data:
+            failures.append(f"{algorithm}: re-dumping a restored checkpoint changed the bytes")
+        restored.drain()
+        mismatch = entry_mismatch(expected, scheduler_entry(restored, workload))
+        if mismatch:
+            failures.append(f"{algorithm} fork {fork}: {mismatch}")
+    return failures
+
+
+def check_rolling_metrics(rng):
+    """Cumulative and window utilization/throughput against per-tick counts"""
+    workload, time_quantum = random_case(rng)
+    algorithm = rng.choice(list(ALGORITHMS))
+    window = rng.randint(1, 15)
+    scheduler = OnlineScheduler.from_workload(workload, algorithm, time_quantum)
+    metrics = RollingMetrics(window)
+    scheduler.add_listener(metrics)
+    completions = CompletionLog()
+    scheduler.add_listener(completions)
+    failures = []
+    now = 0
+    while not scheduler.is_idle():
+        now += rng.randint(0, 6)
+        scheduler.advance_to(now)
+        busy = busy_ticks(scheduler, now)
+        span = min(window, now)
+        expected = {
+            "utilization": sum(busy) / now * 100 if now else 0,
+            "window_utilization": sum(busy[now - span:]) / span * 100 if span else 0,
+            "window_throughput": sum(1 for t in completions.times if now - window < t <= now) / span
+                                 if span else 0,
+        }
+        for name, want in expected.items():
+            got = getattr(metrics, name)()
+            if abs(got - want) > 1e-9:
+                failures.append(f"{algorithm} window={window} t={now} {name}: expected {want}, got {got}")
+                return failures
+    return failures
+
+
+def check_timeline(rng):
+    """Ready, pending and busy series against per-tick counts from the Gantt chart"""
+    workload, time_quantum = random_case(rng)
+    algorithm = rng.choice(list(ALGORITHMS))
+    scheduler = OnlineScheduler(algorithm, time_quantum)
+    recorder = TimelineRecorder()
+    scheduler.add_listener(recorder)
+    processes = workload.to_processes()
+    for process in processes:
+        scheduler.submit(process)
+    scheduler.drain()
+    end = scheduler.time
+    running = {}
+    for pid, (start, stop) in zip(scheduler.gantt_chart, scheduler.time_chart):
+        for k in range(start, stop):
+            running[k] = pid
+    recorder.downsample(end)  # Folds the values up to the end in
+    for name in ("ready", "pending", "busy"):
+        values = {}
+        for start, stop, low, high, _ in recorder.series[name].rows(0, recorder.start, end):
+            for k in range(start, stop):
+                values[k] = (low, high)
+        for k in range(recorder.start, end):
+            if name == "ready":
+                want = sum(1 for p in processes
+                           if p.arrival_time <= k < p.completion_time and running.get(k) != p.pid)
+            elif name == "pending":
+                want = sum(1 for p in processes if p.arrival_time > k)
+            else:
+                want = int(k in running)
+            if values.get(k) != (want, want):
+                return [f"{algorithm} quantum={time_quantum} {name} at t={k}: "
+                        f"expected {want}, got {values.get(k)}"]
+    return []
+
+
+def check_schedulability_test(rng):
+    """Conclusive pre-check verdicts and RMS response times against simulation"""
+    if rng.random() < 0.1:
+        tasks = [Task(f"t{k}", *params) for k, params in enumerate(rng.choice(KNOWN_TASK_SETS))]
+    else:
+        periods = rng.sample(range(3, 25), rng.randint(2, 4))  # Distinct, so RMS ranks are fixed
+        # Utilization near 1 and deadlines past the period are where the tests are hard
+        shares = [rng.random() for _ in periods]
+        target = rng.uniform(0.7, 1.0)
+        tasks = []
+        for k, period in enumerate(periods):
+            wcet = max(1, round(target * shares[k] / sum(shares) * period))
+            deadline = rng.randint(period, 2 * period) if rng.random() < 0.5 else rng.randint(wcet, period)
+            tasks.append(Task(f"t{k}", wcet, period, deadline))
+    described = [(t.wcet, t.period, t.deadline) for t in tasks]
+    failures = []
+    for algorithm in ("rms", "edf"):
+        check = check_schedulability(tasks, algorithm)
+        if check["utilization"] > 1 or check["schedulable"] is None:
+            continue  # Overload may only show after the simulated horizon
+        report, _ = simulate(tasks, algorithm)
+        met = report["deadline_misses"] == 0
+        exact = algorithm == "rms" and check["test"] == "response-time analysis"
+        if (check["schedulable"] and not met) or (exact and check["schedulable"] != met):
+            failures.append(f"{algorithm} {described}: pre-check says {check['schedulable']} "
+                            f"({check['test']}), simulation missed {report['deadline_misses']}")
+        if algorithm == "rms" and met:
+            for task in tasks:
+                want = check["response_times"][task.task_id]
+                got = report["per_task"][task.task_id]["max_response"]
+                if want != got:
+                    failures.append(f"rms {described}: {task.task_id} response time {want}, "
+                                    f"simulated {got}")
+    return failures
+
+
+def check_fair_share(rng):
+    """Each busy group's share of its parent follows the weights of its siblings"""
+    weights = {}
+    children = {"": []}  # Group path -> [(child weight, child group path or None)]
+    processes = []
+
+    def add_process(path):
+        tickets = rng.choice((DEFAULT_TICKETS, rng.randint(1, 300)))
+        processes.append(Process(len(processes) + 1, 0, 10 ** 6, tickets=tickets, group=path or None))
+        children[path].append((tickets, None))
+
+    def add_group(parent, name):
+        path = f"{parent}/{name}" if parent else name
+        weight = DEFAULT_TICKETS
+        if rng.random() < 0.7:
+            weight = weights[path] = rng.randint(1, 300)
+        children[path] = []
+        children[parent].append((weight, path))
+        return path
+
+    for g in range(rng.randint(1, 3)):
+        group = add_group("", f"g{g}")
+        for _ in range(rng.randint(0, 2)):
+            add_process(group)
+        if rng.random() < 0.5 or not children[group]:
+            add_process(add_group(group, "sub"))
+    if rng.random() < 0.5:
+        add_process("")
+
+    report = simulate_fair_share(processes, weights, until=5000)
+    failures = []
+    for parent, members in children.items():
+        total = sum(weight for weight, _ in members)
+        for weight, path in members:
+            if path is None:
+                continue
+            got = report[path]["share"]
+            if abs(got - weight / total) > SHARE_TOLERANCE:
+                failures.append(f"group {path}: share {got:.3f}, weights ask for {weight / total:.3f} "
+                                f"(weights={weights})")
+    return failures
+
+
+def check_gantt_downsampling(rng):
+    """Downsampled Gantt slots against occupancy counted per slot, on dense multi-process traces"""
+    pids = rng.sample(range(1, 100), rng.randint(2, 5))
+    gantt_chart, time_chart = [], []
+    now = 0
+    for _ in range(rng.randint(200, 2000)):
+        now += rng.choice((0, 0, 0, 1, 2))  # Mostly busy, with short idle gaps
+        run = rng.randint(1, 4)
+        gantt_chart.append(rng.choice(pids))
+        time_chart.append((now, now + run))
+        now += run
+    columns = rng.randint(10, 150)
+    makespan, bars = level_of_detail(gantt_chart, time_chart, columns)
+    step = makespan / columns
+    shown = [None] * columns
+    for start, end, pid in bars:
+        for c in range(round(start / step), round(end / step)):
+            shown[c] = pid
+    # Occupancy of slot c = [c * makespan, (c + 1) * makespan) on the timeline scaled by columns
+    occupancy = [{} for _ in range(columns)]
+    for pid, (start, end) in zip(gantt_chart, time_chart):
+        xs, xe = start * columns, end * columns
+        for c in range(xs // makespan, min(columns, (xe - 1) // makespan + 1)):
+            overlap = min(xe, (c + 1) * makespan) - max(xs, c * makespan)
+            occupancy[c][pid] = occupancy[c].get(pid, 0) + overlap
+    for c, shares in enumerate(occupancy):
+        busy = sum(shares.values())
+        if 2 * busy >= makespan and (shown[c] is None or shares.get(shown[c]) != max(shares.values())):
+            return [f"slot {c} of {columns} busy for {busy / columns} of {step}: "
+                    f"shows {shown[c]}, occupancy {shares}"]
+        if 2 * busy < makespan and shown[c] is not None:
+            return [f"slot {c} of {columns} busy for only {busy / columns} of {step}: shows {shown[c]}"]
+    if bars and all(pid is None for _, _, pid in bars):
+        return [f"{len(gantt_chart)} segments over {len(pids)} pids drawn as all idle"]
+    return []
+
+
+CHECKS = {
+    "checkpoint": check_checkpoint,
+    "rolling_metrics": check_rolling_metrics,
+    "timeline": check_timeline,
+    "schedulability": check_schedulability_test,
+    "fair_share": check_fair_share,
+    "gantt": check_gantt_downsampling,
+}
+
+
+def run_checks(cases, seed=0, names=None):
+    """Run `cases` random cases of each check; returns a list of (case seed, check, failures).
+
+    Case i uses seed + i, so a failure reproduces with --seed <case seed> --cases 1.
+    """
+    failures = []
+    for name in names or CHECKS:
+        for case_seed in range(seed, seed + cases):
+            problems = CHECKS[name](random.Random(case_seed))
+            if problems:
+                failures.append((case_seed, name, problems))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-c", "--checks", default="all",
+                        help=f"comma separated checks or 'all' (choices: {', '.join(CHECKS)})")
+    args = parser.parse_args(argv)
+    names = list(CHECKS) if args.checks == "all" else [n.strip() for n in args.checks.split(",")]
+    unknown = [name for name in names if name not in CHECKS]
+    if unknown:
+        sys.stderr.write(f"Error: Unknown check(s): {', '.join(unknown)}\n")
+        return 1
+
+    start = time.perf_counter()
+    failures = run_checks(args.cases, args.seed, names)
+    elapsed = time.perf_counter() - start
+    for case_seed, name, problems in failures[:20]:
+        print(f"seed {case_seed} {name}")
+        for problem in problems:
+            print(f"    {problem}")
+    print(f"{args.cases} cases of {len(names)} checks in {elapsed:.1f}s, "
+          f"{len(failures)} failing cases")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
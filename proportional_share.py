@@ -0,0 +1,206 @@
+import heapq
+import random
+
+from online_scheduler import OnlineScheduler, SchedulerListener
+
+# Stride numerator; strides are STRIDE1 // tickets, so keep tickets well below it
+STRIDE1 = 1 << 20
+
+
+def check_tickets(process, limit=STRIDE1):
+    """Reject ticket counts that would divide by zero or round a stride down to 0"""
+    if not 0 < process.tickets < limit:
+        raise ValueError(f"Process {process.pid} needs 0 < tickets < {limit}, got {process.tickets}")
+
+
+class StridePolicy:
+    """Deterministic proportional share: the lowest pass value runs next.
+
+    Each process advances its pass by its stride (inversely proportional
+    to its tickets) for every time unit it runs, so over time CPU is split
+    in proportion to tickets. Newcomers start at the current virtual time
+    instead of 0 so they cannot monopolize the CPU. Push and pop are heap
+    operations, O(log n).
+    """
+
+    preemptive = False
+
+    def __init__(self, quantum):
+        self.quantum = quantum
+        self.heap = []
+        self.seq = 0
+        self.passes = {}  # id(process) -> (pass value, remaining time when dispatched)
+        self.virtual_time = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def check(self, process):
+        check_tickets(process)
+
+    def push(self, process):
+        key = id(process)
+        if key in self.passes:
+            pass_value, dispatched_with = self.passes[key]
+            pass_value += (STRIDE1 // process.tickets) * (dispatched_with - process.remaining_time)
+        else:
+            pass_value = self.virtual_time
+        self.seq += 1
+        heapq.heappush(self.heap, (pass_value, self.seq, process))
+        self.passes[key] = (pass_value, process.remaining_time)
+
+    def pop(self):
+        pass_value, _, process = heapq.heappop(self.heap)
+        self.virtual_time = max(self.virtual_time, pass_value)
+        if process.remaining_time <= self.quantum:
+            del self.passes[id(process)]  # Finishes in this slice
+        else:
+            self.passes[id(process)] = (pass_value, process.remaining_time)
+        return process
+
+    def preempts(self, running):
+        return False
+
+    def pids(self):
+        return [entry[2].pid for entry in sorted(self.heap, key=lambda e: e[:2])]
+
+
+class FenwickTree:
+    """Prefix sums over ticket counts with O(log n) update and search"""
+
+    def __init__(self, size=1):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def add(self, index, delta):
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def find(self, target):
+        """Smallest index whose prefix sum exceeds `target`"""
+        pos = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and self.tree[nxt] <= target:
+                pos = nxt
+                target -= self.tree[nxt]
+            step >>= 1
+        return pos
+
+    def grow(self, values):
+        """Rebuild with room for twice as many slots from the per-slot values"""
+        self.size *= 2
+        self.tree = [0] * (self.size + 1)
+        for i, value in enumerate(values, 1):
+            self.tree[i] += value
+            parent = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
+
+
+class LotteryPolicy:
+    """Randomized proportional share: each slice goes to a ticket drawn at random.
+
+    Ready processes occupy slots of a Fenwick tree weighted by tickets, so
+    a draw is a prefix-sum search and joining or leaving is a point update,
+    all O(log n). Freed slots are reused and the tree doubles when full.
+    """
+
+    preemptive = False
+
+    def __init__(self, quantum, seed=0):
+        self.quantum = quantum
+        self.rng = random.Random(seed)
+        self.tree = FenwickTree(16)
+        self.slots = [None] * 16
+        self.weights = [0] * 16
+        self.free = list(range(15, -1, -1))
+        self.total = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def check(self, process):
+        check_tickets(process)
+
+    def push(self, process):
+        if not self.free:
+            old = len(self.slots)
+            self.tree.grow(self.weights)
+            self.slots.extend([None] * old)
+            self.weights.extend([0] * old)
+            self.free = list(range(2 * old - 1, old - 1, -1))
+        slot = self.free.pop()
+        self.slots[slot] = process
+        self.weights[slot] = process.tickets
+        self.tree.add(slot, process.tickets)
+        self.total += process.tickets
+        self.count += 1
+
+    def pop(self):
+        slot = self.tree.find(self.rng.randrange(self.total))
+        process = self.slots[slot]
+        self.tree.add(slot, -self.weights[slot])
+        self.total -= self.weights[slot]
+        self.slots[slot] = None
+        self.weights[slot] = 0
+        self.free.append(slot)
+        self.count -= 1
+        return process
+
+    def preempts(self, running):
+        return False
+
+    def pids(self):
+        return [p.pid for p in self.slots if p is not None]
+
+
+class ShareMonitor(SchedulerListener):
+    """Compares the CPU share each process received with the share its tickets ask for"""
+
+    def __init__(self):
+        self.cpu_time = {}
+        self.busy_time = 0
+
+    def on_segment(self, pid, start, end):
+        self.cpu_time[pid] = self.cpu_time.get(pid, 0) + end - start
+        self.busy_time += end - start
+
+    def report(self, processes):
+        """[{pid, tickets, requested, achieved, cpu_time}] for `processes`.
+
+        Requested share is tickets over all tickets given, so the comparison
+        is meaningful for processes that were runnable over the same period.
+        """
+        total_tickets = sum(p.tickets for p in processes)
+        rows = []
+        for p in processes:
+            cpu = self.cpu_time.get(p.pid, 0)
+            rows.append({"pid": p.pid, "tickets": p.tickets,
+                         "requested": p.tickets / total_tickets if total_tickets else 0,
+                         "achieved": cpu / self.busy_time if self.busy_time else 0,
+                         "cpu_time": cpu})
+        return rows
+
+
+def simulate_shares(processes, algorithm="stride", time_quantum=1, until=None, seed=0):
+    """Run processes under stride or lottery scheduling and report achieved shares.
+
+    With `until` the run stops at that time, which is how contention among
+    long-running processes is measured; otherwise it runs to completion.
+    `seed` picks the lottery draws.
+    """
+    scheduler = OnlineScheduler(algorithm, time_quantum, record_history=False, seed=seed)
+    monitor = ShareMonitor()
+    scheduler.add_listener(monitor)
+    for process in processes:
+        scheduler.submit(process)
+    if until is None:
+        scheduler.drain()
+    else:
+        scheduler.advance_to(until)
+    return monitor.report(processes)
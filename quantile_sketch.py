@@ -0,0 +1,135 @@
+import math
+
+from online_scheduler import SchedulerListener
+
+# Percentiles reported for latency metrics, as (label, quantile)
+REPORTED_QUANTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p99.9", 0.999))
+LATENCY_METRICS = ("waiting", "turnaround", "response")
+
+
+class DDSketch:
+    """Streaming quantile sketch with bounded relative error (DDSketch).
+
+    Positive values are counted in logarithmic buckets so any reported
+    quantile is within `relative_accuracy` of the true value; values <= 0
+    share a single zero bucket. Memory depends on the value range, not on
+    the number of samples, and is capped at `max_buckets` by collapsing the
+    lowest buckets.
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Relative accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value, weight=1):
+        self.count += weight
+        self.total += value * weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= 0:
+            self.zero_count += weight
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + weight
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other):
+        """Fold another sketch with the same accuracy into this one"""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for index, weight in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + weight
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        while len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def quantile(self, q):
+        """Estimated value at quantile `q` (0..1), or None when empty"""
+        if not self.count:
+            return None
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return min(max(0, self.min), self.max)
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                estimate = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def _collapse(self):
+        # Merge the two lowest buckets; accuracy is only lost at the low end
+        lowest, second = sorted(self.buckets)[:2]
+        self.buckets[second] += self.buckets.pop(lowest)
+
+
+class LatencySketches(SchedulerListener):
+    """Waiting, turnaround and response time sketches fed from completions.
+
+    Usable as an OnlineScheduler listener or filled from finished
+    processes with add_process().
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.sketches = {metric: DDSketch(relative_accuracy) for metric in LATENCY_METRICS}
+
+    @classmethod
+    def from_processes(cls, processes):
+        sketches = cls()
+        for process in processes:
+            sketches.add_process(process)
+        return sketches
+
+    def add_process(self, process):
+        self.sketches["waiting"].add(process.waiting_time)
+        self.sketches["turnaround"].add(process.turnaround_time)
+        self.sketches["response"].add(max(process.response_time, 0))
+
+    def on_complete(self, process, time):
+        self.add_process(process)
+
+    def merge(self, other):
+        for metric, sketch in self.sketches.items():
+            sketch.merge(other.sketches[metric])
+
+    def percentiles(self):
+        """{metric: {"p50": value, ...}} for every latency metric"""
+        return {metric: {label: sketch.quantile(q) for label, q in REPORTED_QUANTILES}
+                for metric, sketch in self.sketches.items()}
+
+    def format_lines(self):
+        """One human-readable percentile line per metric"""
+        return format_percentiles(self.percentiles())
+
+
+def format_percentiles(percentiles):
+    """Render a LatencySketches.percentiles() dict as one line per metric"""
+    lines = []
+    for metric, values in percentiles.items():
+        parts = ", ".join(f"{label} = {value:.2f}" for label, value in values.items()
+                          if value is not None)
+        lines.append(f"{metric.title()} Time Percentiles: {parts}")
+    return lines
@@ -0,0 +1,285 @@
+import argparse
+import json
+import math
+import random
+import sys
+from fractions import Fraction
+
+from cpu_scheduler import Process
+from online_scheduler import OnlineScheduler, SchedulerListener
+from quantile_sketch import DDSketch, REPORTED_QUANTILES
+
+REALTIME_ALGORITHMS = {
+    "edf": "Earliest Deadline First",
+    "rms": "Rate Monotonic",
+}
+# Simulations without an explicit horizon stop after this many time units
+# when the hyperperiod is longer
+MAX_DEFAULT_HORIZON = 1000000
+
+
+class Task:
+    """Periodic (or sporadic, with `period` as the minimum separation) real-time task"""
+
+    def __init__(self, task_id, wcet, period, deadline=None, phase=0):
+        deadline = period if deadline is None else deadline
+        if wcet <= 0 or period <= 0 or deadline <= 0 or phase < 0:
+            raise ValueError(f"Invalid parameters for task {task_id}")
+        self.task_id = task_id
+        self.wcet = wcet
+        self.period = period
+        self.deadline = deadline  # Relative to each release
+        self.phase = phase
+
+    @classmethod
+    def from_dict(cls, item):
+        try:
+            return cls(item["task"], int(item["wcet"]), int(item["period"]),
+                       int(item["deadline"]) if "deadline" in item else None,
+                       int(item.get("phase", 0)))
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Malformed task entry: {e}")
+
+
+def load_tasks(path):
+    """Read a JSON list of {"task", "wcet", "period"[, "deadline", "phase"]} objects"""
+    with open(path, "r") as f:
+        items = json.load(f)
+    if not isinstance(items, list) or not items:
+        raise ValueError("Task file must hold a non-empty list")
+    return [Task.from_dict(item) for item in items]
+
+
+def utilization(tasks):
+    return float(exact_utilization(tasks))
+
+
+def exact_utilization(tasks):
+    """Utilization as a Fraction, so a set using exactly all the CPU compares equal to 1"""
+    return sum((Fraction(t.wcet) / Fraction(t.period) for t in tasks), Fraction(0))
+
+
+def liu_layland_bound(n):
+    """Utilization below which n implicit-deadline tasks are always RM-schedulable"""
+    return n * (2 ** (1 / n) - 1)
+
+
+def rms_response_times(tasks):
+    """Worst-case response time of each task under rate-monotonic priorities.
+
+    Level-i busy-period analysis, which also holds for deadlines past the
+    period where a task's own earlier jobs delay later ones: every job q
+    released in the busy period started at a critical instant finishes at
+    the fixed point of w = (q + 1) * C + sum(ceil(w / Tj) * Cj) over the
+    higher priority tasks, and the response time is the worst w - q * T.
+    A task whose response time passes its deadline gets None.
+    """
+    order = sorted(range(len(tasks)), key=lambda i: (tasks[i].period, i))
+    response = [None] * len(tasks)
+    for rank, i in enumerate(order):
+        task = tasks[i]
+        higher = [tasks[j] for j in order[:rank]]
+        level = higher + [task]
+        if exact_utilization(level) > 1:
+            continue  # The busy period never ends
+        busy = sum(t.wcet for t in level)
+        while True:
+            nxt = sum(math.ceil(busy / t.period) * t.wcet for t in level)
+            if nxt == busy:
+                break
+            busy = nxt
+        worst = 0
+        for q in range(math.ceil(busy / task.period)):
+            w = (q + 1) * task.wcet
+            while w - q * task.period <= task.deadline:
+                nxt = (q + 1) * task.wcet + sum(math.ceil(w / h.period) * h.wcet for h in higher)
+                if nxt == w:
+                    break
+                w = nxt
+            if w - q * task.period > task.deadline:
+                worst = None
+                break
+            worst = max(worst, w - q * task.period)
+        response[i] = worst
+    return response
+
+
+def check_schedulability(tasks, algorithm):
+    """Analytical pre-check of a task set before any simulation.
+
+    Returns {"utilization", "schedulable", "test"}; "schedulable" is True or
+    False when a test is conclusive and None when only simulation can tell.
+    EDF is exact (U <= 1) for deadlines of at least the period and uses the
+    density test otherwise. RMS tries the Liu-Layland bound and falls back
+    to exact response-time analysis, also reporting "response_times".
+    """
+    u = exact_utilization(tasks)  # Float sums can land either side of an exact 1
+    result = {"utilization": float(u)}
+    if u > 1:
+        result.update(schedulable=False, test="utilization > 1")
+    elif algorithm == "edf":
+        if all(t.deadline >= t.period for t in tasks):
+            result.update(schedulable=True, test="utilization <= 1")
+        elif sum(Fraction(t.wcet) / Fraction(min(t.deadline, t.period)) for t in tasks) <= 1:
+            result.update(schedulable=True, test="density <= 1")
+        else:
+            result.update(schedulable=None, test="inconclusive (constrained deadlines)")
+    elif algorithm == "rms":
+        bound = liu_layland_bound(len(tasks))
+        response = rms_response_times(tasks)
+        result["liu_layland_bound"] = bound
+        result["response_times"] = {t.task_id: r for t, r in zip(tasks, response)}
+        if u <= bound and all(t.deadline >= t.period for t in tasks):
+            result.update(schedulable=True, test="Liu-Layland bound")
+        else:
+            result.update(schedulable=all(r is not None for r in response),
+                          test="response-time analysis")
+    else:
+        raise ValueError(f"Unknown real-time algorithm: {algorithm}")
+    return result
+
+
+def hyperperiod(tasks):
+    return math.lcm(*(t.period for t in tasks))
+
+
+def release_jobs(tasks, horizon, sporadic_delay=0, seed=None):
+    """Jobs (Process objects with absolute deadlines) released before `horizon`.
+
+    Periodic tasks release every period from their phase. With
+    `sporadic_delay`, each release is pushed back by a random 0..delay on
+    top of the period, which models sporadic tasks. Returns the jobs in
+    release order and the task_id of each job's pid.
+    """
+    rng = random.Random(seed)
+    releases = []
+    for index, task in enumerate(tasks):
+        release = task.phase
+        while release < horizon:
+            releases.append((release, index))
+            release += task.period + (rng.randint(0, sporadic_delay) if sporadic_delay else 0)
+    releases.sort()
+    jobs = []
+    owners = {}
+    for pid, (release, index) in enumerate(releases, 1):
+        task = tasks[index]
+        jobs.append(Process(pid, release, task.wcet, deadline=release + task.deadline,
+                            period=task.period))
+        owners[pid] = task.task_id
+    return jobs, owners
+
+
+class DeadlineMonitor(SchedulerListener):
+    """Counts deadline misses and sketches lateness as jobs complete"""
+
+    def __init__(self, owners):
+        self.owners = owners
+        self.per_task = {}
+        self.jobs = 0
+        self.misses = 0
+        self.total_lateness = 0
+        self.max_lateness = -math.inf
+        self.tardiness = DDSketch()  # Lateness of the jobs that missed
+
+    def on_complete(self, process, time):
+        lateness = time - process.deadline
+        stats = self.per_task.setdefault(self.owners[process.pid],
+                                         {"jobs": 0, "misses": 0, "max_lateness": -math.inf,
+                                          "max_response": 0})
+        stats["jobs"] += 1
+        stats["max_lateness"] = max(stats["max_lateness"], lateness)
+        stats["max_response"] = max(stats["max_response"], time - process.arrival_time)
+        self.jobs += 1
+        self.total_lateness += lateness
+        self.max_lateness = max(self.max_lateness, lateness)
+        if lateness > 0:
+            stats["misses"] += 1
+            self.misses += 1
+            self.tardiness.add(lateness)
+
+    def report(self):
+        return {
+            "jobs": self.jobs,
+            "deadline_misses": self.misses,
+            "miss_ratio": self.misses / self.jobs if self.jobs else 0,
+            "mean_lateness": self.total_lateness / self.jobs if self.jobs else 0,
+            "max_lateness": self.max_lateness if self.jobs else 0,
+            "tardiness": {label: self.tardiness.quantile(q) for label, q in REPORTED_QUANTILES},
+            "per_task": self.per_task,
+        }
+
+
+def simulate(tasks, algorithm="edf", horizon=None, sporadic_delay=0, seed=None,
+             record_history=False):
+    """Run a task set under EDF or RMS and return (DeadlineMonitor report, scheduler).
+
+    Jobs run to completion even when late, so lateness keeps accumulating
+    on overloaded task sets. The horizon defaults to one hyperperiod after
+    the largest phase.
+    """
+    if algorithm not in REALTIME_ALGORITHMS:
+        raise ValueError(f"Unknown real-time algorithm: {algorithm}")
+    if horizon is None:
+        horizon = min(max(t.phase for t in tasks) + hyperperiod(tasks), MAX_DEFAULT_HORIZON)
+    jobs, owners = release_jobs(tasks, horizon, sporadic_delay, seed)
+    scheduler = OnlineScheduler(algorithm, record_history=record_history)
+    monitor = DeadlineMonitor(owners)
+    scheduler.add_listener(monitor)
+    for job in jobs:
+        scheduler.submit(job)
+    scheduler.drain()
+    return monitor.report(), scheduler
+
+
+def format_report(tasks, algorithm, check, report):
+    lines = [f"=== {REALTIME_ALGORITHMS[algorithm]} ===",
+             f"Utilization = {check['utilization']:.4f}"]
+    if "liu_layland_bound" in check:
+        lines.append(f"Liu-Layland bound = {check['liu_layland_bound']:.4f}")
+    verdict = {True: "schedulable", False: "not schedulable", None: "unknown"}[check["schedulable"]]
+    lines.append(f"Pre-check: {verdict} ({check['test']})")
+    if report is None:
+        return "\n".join(lines) + "\n"
+    lines.append(f"Jobs = {report['jobs']}, deadline misses = {report['deadline_misses']} "
+                 f"({report['miss_ratio']:.2%})")
+    lines.append(f"Lateness: mean = {report['mean_lateness']:.2f}, max = {report['max_lateness']}")
+    tardiness = ", ".join(f"{label} = {value:.2f}" for label, value in report["tardiness"].items()
+                          if value is not None)
+    if tardiness:
+        lines.append(f"Tardiness of missed jobs: {tardiness}")
+    for task in tasks:
+        stats = report["per_task"].get(task.task_id)
+        if stats:
+            lines.append(f"Task {task.task_id}: jobs = {stats['jobs']}, misses = {stats['misses']}, "
+                         f"max response = {stats['max_response']}, "
+                         f"max lateness = {stats['max_lateness']}")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen and simulate a real-time task set.")
+    parser.add_argument("tasks", help="JSON list of tasks with task, wcet, period[, deadline, phase]")
+    parser.add_argument("-a", "--algorithm", choices=tuple(REALTIME_ALGORITHMS), default="edf")
+    parser.add_argument("--horizon", type=int, default=None,
+                        help="simulated time (default: one hyperperiod)")
+    parser.add_argument("--sporadic-delay", type=int, default=0,
+                        help="random extra separation of up to this much between releases")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--check-only", action="store_true",
+                        help="run the analytical pre-check without simulating")
+    args = parser.parse_args(argv)
+    try:
+        tasks = load_tasks(args.tasks)
+        check = check_schedulability(tasks, args.algorithm)
+        report = None
+        if not args.check_only:
+            report, _ = simulate(tasks, args.algorithm, args.horizon, args.sporadic_delay, args.seed)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 1
+    sys.stdout.write(format_report(tasks, args.algorithm, check, report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+from cpu_scheduler import ALGORITHMS
+
+# Process fields restored from a cached run, in storage order
+PROCESS_FIELDS = ("state", "remaining_time", "waiting_time", "turnaround_time",
+                  "completion_time", "response_time", "start_time")
+
+
+def workload_key(processes, algorithm, time_quantum, preemptive=False):
+    """Content hash of a workload and the parameters it is scheduled with"""
+    payload = {
+        "workload": [(p.pid, p.arrival_time, p.burst_time, p.priority) for p in processes],
+        "algorithm": algorithm,
+        "quantum": time_quantum,
+        "preemptive": preemptive,
+    }
+    encoded = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ResultCache:
+    """Memoizes scheduling results in an in-memory LRU with an optional on-disk tier.
+
+    Entries are keyed by workload_key(), so an identical process set run with
+    the same algorithm and parameters is never simulated twice.
+    """
+
+    def __init__(self, max_entries=128, cache_dir=None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def key_for(self, scheduler, algorithm):
+        """Cache key for running `algorithm` over the scheduler's processes"""
+        _, _, kwargs = ALGORITHMS[algorithm]
+        return workload_key(scheduler.processes, algorithm,
+                            scheduler.time_quantum, kwargs.get("preemptive", False))
+
+    def get(self, key, load=True):
+        """Return the cached entry for `key`, or None; `load=False` skips the disk tier"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry
+        entry = self.load(key) if load else None
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def put(self, key, entry, store=True):
+        """Store an entry in memory and, if configured and `store` is true, on disk"""
+        self._remember(key, entry)
+        if store:
+            self.store(key, entry)
+
+    def clear(self):
+        """Drop the in-memory tier (the disk tier is kept)"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def run(self, scheduler, algorithm):
+        """Run `algorithm` through the cache, returning (gantt_chart, time_chart).
+
+        On a hit the cached per-process metrics are written back onto the
+        scheduler's processes, exactly as a fresh run would leave them.
+        """
+        key = self.key_for(scheduler, algorithm)
+        entry = self.get(key)
+        if entry is None:
+            self.misses += 1
+            gantt_chart, time_chart = scheduler.run(algorithm)
+            entry = self.make_entry(scheduler.processes, gantt_chart, time_chart)
+            self.put(key, entry)
+        else:
+            self.hits += 1
+            self.apply_entry(scheduler.processes, entry)
+        return list(entry["gantt_chart"]), [tuple(t) for t in entry["time_chart"]]
+
+    @staticmethod
+    def make_entry(processes, gantt_chart, time_chart):
+        """Build a cache entry from a finished run"""
+        return {
+            "gantt_chart": list(gantt_chart),
+            "time_chart": [list(t) for t in time_chart],
+            "processes": [[p.pid] + [getattr(p, f) for f in PROCESS_FIELDS] for p in processes],
+        }
+
+    @staticmethod
+    def apply_entry(processes, entry):
+        """Write the per-process metrics of an entry back onto `processes`"""
+        by_pid = {p.pid: p for p in processes}
+        for row in entry["processes"]:
+            process = by_pid[row[0]]
+            process.reset()
+            for field, value in zip(PROCESS_FIELDS, row[1:]):
+                setattr(process, field, value)
+
+    def _remember(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def load(self, key):
+        """Entry for `key` from the disk tier only, or None"""
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key, entry):
+        """Write an entry to the disk tier only (a no-op without cache_dir)"""
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk tier is best effort; the in-memory entry is still valid
+            pass
@@ -0,0 +1,125 @@
+from collections import deque
+
+from online_scheduler import SchedulerListener
+
+
+class RollingMetrics(SchedulerListener):
+    """Running and sliding-window scheduling metrics with O(1) reads.
+
+    Fed with Gantt segments and completions (directly or as an
+    OnlineScheduler listener), it keeps cumulative totals plus the busy
+    intervals and completion times inside the last `window` time units.
+    CPU utilization is busy time over elapsed time, not a count of
+    processes in the running state. As a listener it also sees on_queue(),
+    so the slice still running counts as busy up to the current time.
+    """
+
+    def __init__(self, window=20):
+        if window <= 0:
+            raise ValueError("Window must be positive")
+        self.window = window
+        self.now = 0
+        self.busy_time = 0
+        self.completions = 0
+        self.context_switches = 0
+        self.total_response = 0
+        self.total_waiting = 0
+        self.total_turnaround = 0
+        self.last_pid = None
+        self.open_start = None  # Start of the running slice not yet reported as a segment
+        # Busy intervals and completion times that may still fall in the window
+        self.window_intervals = deque()
+        self.window_interval_sum = 0
+        self.window_completions = deque()
+
+    def on_segment(self, pid, start, end):
+        if self.last_pid is not None and pid != self.last_pid:
+            self.context_switches += 1
+        self.last_pid = pid
+        self.busy_time += end - start
+        intervals = self.window_intervals
+        if intervals and intervals[-1][1] == start:
+            # Extend a contiguous busy period instead of growing the deque
+            prev_start, _ = intervals.pop()
+            self.window_interval_sum -= start - prev_start
+            start = prev_start
+        intervals.append((start, end))
+        self.window_interval_sum += end - start
+        if self.open_start is not None:
+            self.open_start = max(self.open_start, end)
+        self.advance(end)
+
+    def on_complete(self, process, time):
+        self.completions += 1
+        self.total_response += max(process.response_time, 0)
+        self.total_waiting += process.waiting_time
+        self.total_turnaround += process.turnaround_time
+        self.window_completions.append(time)
+        self.advance(time)
+
+    def on_advance(self, time):
+        self.advance(time)
+
+    def on_queue(self, time, ready, pending, busy):
+        if not busy:
+            self.open_start = None
+        elif self.open_start is None:
+            self.open_start = time
+        self.advance(time)
+
+    def open_time(self, since=0):
+        """Busy time of the running slice after `since`"""
+        if self.open_start is None:
+            return 0
+        return max(0, self.now - max(self.open_start, since))
+
+    def advance(self, time):
+        """Move the clock forward and evict events that left the window"""
+        if time > self.now:
+            self.now = time
+        cutoff = self.now - self.window
+        intervals = self.window_intervals
+        while intervals and intervals[0][1] <= cutoff:
+            start, end = intervals.popleft()
+            self.window_interval_sum -= end - start
+        completions = self.window_completions
+        while completions and completions[0] <= cutoff:
+            completions.popleft()
+
+    def utilization(self):
+        """CPU busy percentage since time 0"""
+        return (self.busy_time + self.open_time()) / self.now * 100 if self.now else 0
+
+    def throughput(self):
+        """Completed processes per time unit since time 0"""
+        return self.completions / self.now if self.now else 0
+
+    def window_span(self):
+        return min(self.window, self.now)
+
+    def window_utilization(self):
+        """CPU busy percentage over the last `window` time units"""
+        span = self.window_span()
+        if not span:
+            return 0
+        busy = self.window_interval_sum
+        if self.window_intervals:
+            # Clip the part of the oldest interval that precedes the window
+            start, end = self.window_intervals[0]
+            busy -= max(0, min(end, self.now - span) - start)
+        busy += self.open_time(self.now - span)
+        return busy / span * 100
+
+    def window_throughput(self):
+        """Completions per time unit over the last `window` time units"""
+        span = self.window_span()
+        return len(self.window_completions) / span if span else 0
+
+    def avg_response(self):
+        return self.total_response / self.completions if self.completions else 0
+
+    def avg_waiting(self):
+        return self.total_waiting / self.completions if self.completions else 0
+
+    def avg_turnaround(self):
+        return self.total_turnaround / self.completions if self.completions else 0
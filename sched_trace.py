@@ -0,0 +1,212 @@
+import argparse
+import re
+import sys
+
+from cpu_scheduler import ALGORITHMS
+from quantile_sketch import LatencySketches, format_percentiles
+from workload import Workload
+
+# Event header shared by ftrace ("comm-pid [cpu] flags ts: event:") and
+# `perf sched script` ("comm pid [cpu] ts: sched:event:") text output
+EVENT_RE = re.compile(r"\[(\d+)\]\s+(?:\S+\s+)?(\d+)\.(\d+):\s+(?:sched:)?"
+                      r"(sched_switch|sched_wakeup_new|sched_wakeup):\s*(.*)$")
+SWITCH_FIELDS_RE = re.compile(r"prev_pid=(\d+).*?prev_state=(\S+).*?next_pid=(\d+)\s+next_prio=(-?\d+)")
+SWITCH_COMPACT_RE = re.compile(r":(\d+) \[-?\d+\] (\S+) ==> .*:(\d+) \[(-?\d+)\]")
+WAKEUP_FIELDS_RE = re.compile(r"\bpid=(\d+)\s+prio=(-?\d+)(?:.*?target_cpu=(\d+))?")
+WAKEUP_COMPACT_RE = re.compile(r":(\d+) \[(-?\d+)\](?:.*?CPU:(\d+))?")
+# The idle task is never a job
+IDLE_PID = 0
+# Round Robin slice for replays, in the default microsecond ticks; a slice
+# of a few ticks would split every traced burst into thousands of segments
+DEFAULT_QUANTUM = 4000
+
+
+class TraceJob:
+    """One wakeup-to-block cycle of a task, with its observed timing in ticks.
+
+    Exposes waiting_time, turnaround_time and response_time like a finished
+    Process so observed jobs can be fed to the same latency sketches.
+    """
+
+    __slots__ = ("task_pid", "arrival_time", "first_run", "end_time", "run_time", "priority")
+
+    def __init__(self, task_pid, arrival_time, priority):
+        self.task_pid = task_pid
+        self.arrival_time = arrival_time
+        self.first_run = None
+        self.end_time = None
+        self.run_time = 0
+        self.priority = priority
+
+    @property
+    def burst_time(self):
+        # The simulator needs whole, positive bursts
+        return max(1, self.run_time)
+
+    @property
+    def response_time(self):
+        return self.first_run - self.arrival_time
+
+    @property
+    def turnaround_time(self):
+        return self.end_time - self.arrival_time
+
+    @property
+    def waiting_time(self):
+        return max(0, self.turnaround_time - self.run_time)
+
+
+def parse_event(line):
+    """Parse one trace line into (event, cpu, seconds, fraction, fields) or None.
+
+    For sched_switch, fields is (prev_pid, prev_state, next_pid, next_prio);
+    for the wakeup events it is (pid, prio, target_cpu or None).
+    """
+    match = EVENT_RE.search(line)
+    if not match:
+        return None
+    cpu, seconds, fraction, event, payload = match.groups()
+    if event == "sched_switch":
+        fields = SWITCH_FIELDS_RE.search(payload) or SWITCH_COMPACT_RE.search(payload)
+        if not fields:
+            return None
+        prev_pid, prev_state, next_pid, next_prio = fields.groups()
+        fields = (int(prev_pid), prev_state, int(next_pid), int(next_prio))
+    else:
+        fields = WAKEUP_FIELDS_RE.search(payload) or WAKEUP_COMPACT_RE.search(payload)
+        if not fields:
+            return None
+        pid, prio, target = fields.groups()
+        fields = (int(pid), int(prio), int(target) if target is not None else None)
+    return event, int(cpu), seconds, fraction, fields
+
+
+def iter_jobs(lines, ticks_per_second=1000000, cpu=None):
+    """Stream finished TraceJobs out of sched_switch/sched_wakeup text lines.
+
+    A job starts when a task is woken (or first seen running) and ends when
+    it is switched out in a sleeping state; being switched out while still
+    runnable (R, R+) is a preemption and the job continues. Times are ticks
+    since the first event. With `cpu`, only that CPU's switches and the
+    wakeups targeting it are used. Memory is bounded by the number of
+    tasks, not the length of the trace.
+    """
+    base = None
+    jobs = {}  # task pid -> open TraceJob
+    running = {}  # task pid -> tick it was last switched in
+    for line in lines:
+        if "sched_switch" not in line and "sched_wakeup" not in line:
+            continue
+        parsed = parse_event(line)
+        if parsed is None:
+            continue
+        event, event_cpu, seconds, fraction, fields = parsed
+        # Exact integer ticks, no float rounding on long traces
+        nanos = int(seconds) * 1000000000 + int(fraction[:9].ljust(9, "0"))
+        if base is None:
+            base = nanos
+        now = (nanos - base) * ticks_per_second // 1000000000
+
+        if event == "sched_switch":
+            if cpu is not None and event_cpu != cpu:
+                continue
+            prev_pid, prev_state, next_pid, next_prio = fields
+            job = jobs.get(prev_pid)
+            if prev_pid != IDLE_PID and job is not None and prev_pid in running:
+                job.run_time += now - running.pop(prev_pid)
+                if not prev_state.startswith("R"):
+                    job.end_time = now
+                    del jobs[prev_pid]
+                    yield job
+            if next_pid != IDLE_PID:
+                job = jobs.get(next_pid)
+                if job is None:
+                    # Runs without a wakeup we saw, e.g. at the start of the trace
+                    job = jobs[next_pid] = TraceJob(next_pid, now, next_prio)
+                if job.first_run is None:
+                    job.first_run = now
+                running[next_pid] = now
+        else:
+            pid, prio, target = fields
+            if cpu is not None and target is not None and target != cpu:
+                continue
+            if pid != IDLE_PID and pid not in jobs:
+                jobs[pid] = TraceJob(pid, now, prio)
+
+
+def import_trace(path, ticks_per_second=1000000, cpu=None):
+    """Read a perf sched / ftrace text dump into (Workload, observed LatencySketches).
+
+    Every job becomes one process (pids are numbered from 1 in completion
+    order) with its measured run time as the burst, so the I/O between a
+    task's jobs shows up as the gap between their arrivals. Lines are read
+    one at a time and observed latencies are sketched as they stream past.
+    """
+    records = []
+    observed = LatencySketches()
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for job in iter_jobs(f, ticks_per_second, cpu):
+            records.append((len(records) + 1, job.arrival_time, job.burst_time, max(job.priority, 0)))
+            observed.add_process(job)
+    if not records:
+        raise ValueError(f"No complete scheduling cycles found in {path}")
+    return Workload.from_records(records), observed
+
+
+def compare_observed(workload, observed, algorithms=None, time_quantum=DEFAULT_QUANTUM, cache=None):
+    """Re-schedule an imported workload and pair observed with simulated latency.
+
+    Returns {"observed": percentiles, algorithm: percentiles, ...} in the
+    LatencySketches.percentiles() layout. The simulator has a single CPU, so
+    traces of busy multi-CPU hosts are best imported per CPU.
+    """
+    from comparison import compare_all
+
+    results = compare_all(workload, algorithms, time_quantum, cache)
+    report = {"observed": observed.percentiles()}
+    for algo, result in results.items():
+        report[algo] = LatencySketches.from_processes(result["processes"]).percentiles()
+    return report
+
+
+def format_report(report):
+    lines = []
+    for source, percentiles in report.items():
+        title = "Observed" if source == "observed" else f"{ALGORITHMS[source][0]} (simulated)"
+        lines.append(f"=== {title} ===")
+        lines.extend(format_percentiles(percentiles))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Replay a Linux sched_switch/sched_wakeup trace (perf sched script or "
+                    "ftrace text) under each scheduling policy.")
+    parser.add_argument("trace", help="text dump from `perf sched script` or the ftrace buffer")
+    parser.add_argument("-a", "--algorithms", default="all",
+                        help=f"comma separated algorithm codes or 'all' (choices: {', '.join(ALGORITHMS)})")
+    parser.add_argument("-q", "--quantum", type=int, default=DEFAULT_QUANTUM,
+                        help=f"Round Robin time quantum in ticks (default: {DEFAULT_QUANTUM}, "
+                             "4 ms at the default tick rate)")
+    parser.add_argument("--ticks-per-second", type=int, default=1000000,
+                        help="simulated ticks per traced second (default: 1000000, i.e. microseconds)")
+    parser.add_argument("--cpu", type=int, default=None, help="only replay events of this CPU")
+    args = parser.parse_args(argv)
+    try:
+        from scheduler_cli import parse_algorithms
+
+        algorithms = parse_algorithms(args.algorithms)
+        if args.quantum <= 0 or args.ticks_per_second <= 0:
+            raise ValueError("Time quantum and ticks per second must be positive")
+        workload, observed = import_trace(args.trace, args.ticks_per_second, args.cpu)
+        report = compare_observed(workload, observed, algorithms, args.quantum)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 1
+    sys.stdout.write(f"{len(workload)} jobs imported\n\n" + format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
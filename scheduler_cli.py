@@ -0,0 +1,207 @@
+import argparse
+import sys
+
+from cpu_scheduler import ALGORITHMS, SUMMARY_FIELDS
+from comparison import compare_all
+from result_cache import ResultCache
+from workload import load_workload
+
+# Binary output layout (little endian): magic, version, algorithm count, then
+# per algorithm a length-prefixed code, the summary as doubles and the
+# process/segment tables as int64 rows.
+BINARY_MAGIC = b"CPUS"
+BINARY_VERSION = 1
+PROCESS_COLUMNS = ("pid", "arrival_time", "burst_time", "priority", "completion_time",
+                   "waiting_time", "turnaround_time", "response_time")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="cpu_scheduler",
+        description="Run CPU scheduling algorithms over a trace file without the interactive menu.")
+    parser.add_argument("trace", help="workload trace (.json as saved by the GUI, or .csv)")
+    parser.add_argument("-a", "--algorithms", default="all",
+                        help="comma separated algorithm codes or 'all' "
+                             f"(choices: {', '.join(ALGORITHMS)})")
+    parser.add_argument("-q", "--quantum", type=int, default=3,
+                        help="Round Robin time quantum (default: 3)")
+    parser.add_argument("-f", "--format", choices=("text", "json", "csv", "bin"), default="text",
+                        help="output format (default: text)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="output file, '-' for stdout (default)")
+    parser.add_argument("--quiet", "--stats-only", dest="stats_only", action="store_true",
+                        help="report summary metrics only and skip Gantt/per-process output")
+    parser.add_argument("--cache-dir", default=None,
+                        help="directory for the on-disk result cache")
+    parser.add_argument("--gantt", default=None, metavar="FILE",
+                        help="also export the Gantt chart as .svg or .png; with several "
+                             "algorithms the code is appended to the file name")
+    parser.add_argument("--gantt-width", type=int, default=1200,
+                        help="Gantt export width in pixels (default: 1200)")
+    parser.add_argument("--chrome-trace", default=None, metavar="FILE",
+                        help="also write the schedules as Chrome Trace Event JSON "
+                             "(viewable in chrome://tracing or Perfetto)")
+    parser.add_argument("--timeline", default=None, metavar="FILE",
+                        help="also record ready-queue, pending and busy timelines as .svg or "
+                             ".csv; with several algorithms the code is appended to the file name")
+    parser.add_argument("--timeline-points", type=int, default=1000,
+                        help="approximate buckets per series in a .csv timeline (default: 1000)")
+    return parser
+
+
+def parse_algorithms(value):
+    """Expand the --algorithms argument into a list of algorithm codes"""
+    if value == "all":
+        return list(ALGORITHMS)
+    algorithms = [a.strip() for a in value.split(",") if a.strip()]
+    unknown = [a for a in algorithms if a not in ALGORITHMS]
+    if unknown or not algorithms:
+        raise ValueError(f"Unknown algorithm(s): {', '.join(unknown) or value}")
+    return algorithms
+
+
+def process_rows(processes):
+    return [[getattr(p, col) for col in PROCESS_COLUMNS] for p in processes]
+
+
+def format_text(results, stats_only):
+    parts = []
+    for algo, result in results.items():
+        parts.append(f"=== {ALGORITHMS[algo][0]} ===\n")
+        if not stats_only:
+            scheduler = result["scheduler"]
+            parts.append(scheduler.format_gantt_chart(result["gantt"]))
+            parts.append(scheduler.format_statistics())
+        parts.append("".join(f"{field} = {result['summary'][field]}\n" for field in SUMMARY_FIELDS))
+        parts.append("\n")
+    return "".join(parts)
+
+
+def format_json(results, stats_only):
+    import json
+
+    payload = {}
+    for algo, result in results.items():
+        entry = {"name": ALGORITHMS[algo][0], "summary": result["summary"]}
+        if not stats_only:
+            gantt_chart, time_chart = result["gantt"]
+            entry["segments"] = [[pid, start, end]
+                                 for pid, (start, end) in zip(gantt_chart, time_chart)]
+            entry["processes"] = [dict(zip(PROCESS_COLUMNS, row))
+                                  for row in process_rows(result["processes"])]
+        payload[algo] = entry
+    return json.dumps(payload, separators=(",", ":")) + "\n"
+
+
+def format_csv(results, stats_only):
+    import csv
+    import io
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if stats_only:
+        writer.writerow(("algorithm",) + SUMMARY_FIELDS)
+        writer.writerows([algo] + [result["summary"][f] for f in SUMMARY_FIELDS]
+                         for algo, result in results.items())
+    else:
+        writer.writerow(("algorithm",) + PROCESS_COLUMNS)
+        for algo, result in results.items():
+            writer.writerows([algo] + row for row in process_rows(result["processes"]))
+    return buffer.getvalue()
+
+
+def format_binary(results, stats_only):
+    import struct
+    from array import array
+
+    out = bytearray(struct.pack("<4sHH", BINARY_MAGIC, BINARY_VERSION, len(results)))
+    for algo, result in results.items():
+        code = algo.encode("utf-8")
+        out += struct.pack("<H", len(code)) + code
+        out += struct.pack(f"<{len(SUMMARY_FIELDS)}d",
+                           *(float(result["summary"][f]) for f in SUMMARY_FIELDS))
+        if stats_only:
+            out += struct.pack("<QQ", 0, 0)
+            continue
+        gantt_chart, time_chart = result["gantt"]
+        processes = array("q", (v for row in process_rows(result["processes"]) for v in row))
+        segments = array("q", (v for pid, (start, end) in zip(gantt_chart, time_chart)
+                               for v in (pid, start, end)))
+        if sys.byteorder != "little":
+            processes.byteswap()
+            segments.byteswap()
+        out += struct.pack("<QQ", len(result["processes"]), len(gantt_chart))
+        out += processes.tobytes() + segments.tobytes()
+    return bytes(out)
+
+
+FORMATTERS = {
+    "text": format_text,
+    "json": format_json,
+    "csv": format_csv,
+    "bin": format_binary,
+}
+
+
+def write_output(data, path):
+    """Write the whole rendered output with a single call"""
+    binary = isinstance(data, bytes)
+    if path == "-":
+        stream = sys.stdout.buffer if binary else sys.stdout
+        stream.write(data)
+        stream.flush()
+    else:
+        with (open(path, "wb") if binary else open(path, "w", newline="")) as f:
+            f.write(data)
+
+
+def export_gantts(results, path, width):
+    """Write one Gantt image per algorithm"""
+    import os
+    from gantt_export import export_gantt
+
+    root, extension = os.path.splitext(path)
+    for algo, result in results.items():
+        target = path if len(results) == 1 else f"{root}_{algo}{extension}"
+        export_gantt(target, result["gantt"], width, title=ALGORITHMS[algo][0])
+
+
+def export_timelines(workload, algorithms, time_quantum, path, points, width):
+    """Replay each algorithm through OnlineScheduler and write its queue timeline"""
+    import os
+    from timeline import export_timeline, record_timeline
+
+    root, extension = os.path.splitext(path)
+    for algo in algorithms:
+        target = path if len(algorithms) == 1 else f"{root}_{algo}{extension}"
+        recorder = record_timeline(workload, algo, time_quantum)
+        export_timeline(target, recorder, points, width, title=ALGORITHMS[algo][0])
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        algorithms = parse_algorithms(args.algorithms)
+        if args.quantum <= 0:
+            raise ValueError("Time quantum must be positive")
+        workload = load_workload(args.trace)
+        cache = ResultCache(cache_dir=args.cache_dir)
+        results = compare_all(workload, algorithms, time_quantum=args.quantum, cache=cache)
+        write_output(FORMATTERS[args.format](results, args.stats_only), args.output)
+        if args.gantt:
+            export_gantts(results, args.gantt, args.gantt_width)
+        if args.chrome_trace:
+            from trace_export import export_chrome_trace
+            export_chrome_trace(args.chrome_trace, results)
+        if args.timeline:
+            export_timelines(workload, algorithms, args.quantum, args.timeline,
+                             args.timeline_points, args.gantt_width)
+    except (OSError, ValueError, KeyError) as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,20 @@
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from tkinter import messagebox
-from cpu_scheduler import CPUScheduler, Process
-from threading import Thread
-import time
+from cpu_scheduler import ALGORITHMS, CPUScheduler
+from result_cache import ResultCache
+from rolling_metrics import RollingMetrics
 import json
 import os
+import time
+
+# Time units covered by the sliding-window metrics
+METRICS_WINDOW = 20
+# Animation redraws at most this often (~60 fps); each frame advances as
+# many simulated time units as the playback speed calls for
+FRAME_INTERVAL_MS = 16
+# Playback speeds in simulated time units per second
+SPEEDS = ("1x", "10x", "100x", "1000x")
 
 class SchedulerGUI:
     def __init__(self, root):
@@ -47,6 +56,7 @@ class SchedulerGUI:
         
         # Initialize variables
         self.scheduler = CPUScheduler()
+        self.result_cache = ResultCache()
         
         # Initialize StringVar variables using ttk
         self.cpu_util_var = ttk.StringVar(value="CPU: 0%")
@@ -58,13 +68,16 @@ class SchedulerGUI:
         self.algo_var = ttk.StringVar(value="rr")
         
         # Initialize other variables
-        self.animation_speed = 1.0
+        self.animation_speed = 1.0  # Simulated time units per second
+        self.frame_job = None  # Pending after() id of the animation loop
+        self.transition_job = None
+        self.tick_budget = 0.0
+        self.last_frame = 0.0
         self.current_time = 0
         self.is_running = False
         self.paused = False
         self.step_mode = False
-        self.context_switches = 0
-        self.cpu_utilization = 0
+        self.metrics = RollingMetrics(METRICS_WINDOW)
         self.last_process_state = None
         self.gantt_history = []
         self.current_process = None
@@ -75,53 +88,12 @@ class SchedulerGUI:
         
         self.setup_gui()
         self.setup_enhanced_gui()
-        self.setup_metrics_labels()
         self.setup_cpu_meter()
 
-        # Clear any existing process table
-        if hasattr(self, 'process_table'):
-            self.process_table.destroy()
-            
-        # Add process table with scrollbar
-        self.table_frame = ttk.Frame(self.scrollable_frame)
-        self.table_frame.grid(row=6, column=0, sticky="nsew", padx=5, pady=5)
-        
-        self.process_table = ttk.Treeview(self.table_frame, columns=(
-            "PID", "Arrival", "Burst", "Priority", "State", "Remaining", "Wait", "Turnaround"
-        ), show="headings", height=10)
-        
-        # Configure table headers with fixed widths
-        headers = {
-            "PID": 60, "Arrival": 80, "Burst": 80, "Priority": 80,
-            "State": 100, "Remaining": 100, "Wait": 80, "Turnaround": 100
-        }
-        
-        for col, width in headers.items():
-            self.process_table.heading(col, text=col)
-            self.process_table.column(col, width=width, anchor="center")
-        
-        # Add scrollbars
-        y_scrollbar = ttk.Scrollbar(self.table_frame, orient="vertical", command=self.process_table.yview)
-        x_scrollbar = ttk.Scrollbar(self.table_frame, orient="horizontal", command=self.process_table.xview)
-        self.process_table.configure(yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set)
-        
-        # Grid layout for table and scrollbars
-        self.process_table.grid(row=0, column=0, sticky="nsew")
-        y_scrollbar.grid(row=0, column=1, sticky="ns")
-        x_scrollbar.grid(row=1, column=0, sticky="ew")
-        
-        # Configure frame weights
-        self.table_frame.grid_columnconfigure(0, weight=1)
-        self.table_frame.grid_rowconfigure(0, weight=1)
-
         # Add validation
         self.validate_command = self.root.register(self.validate_input)
-        
-        # Clear any existing process table
-        if hasattr(self, 'process_table'):
-            self.process_table.destroy()
             
-        # Setup table
+        # Setup table (built once; dialogs are created on demand)
         self.setup_process_table()
 
     def on_frame_configure(self, event=None):
@@ -161,6 +133,7 @@ class SchedulerGUI:
         algo_frame.grid(row=1, column=0, sticky="ew", padx=5, pady=5)
         
         algorithms = [
+            ("FCFS", "fcfs"),
             ("Round Robin", "rr"),
             ("SJF (Non-preemptive)", "sjf"),
             ("SJF (Preemptive)", "sjf_p"),
@@ -177,32 +150,54 @@ class SchedulerGUI:
         start_btn = ttk.Button(algo_frame, text="Start Simulation",
                              command=self.start_simulation,
                              style="success.TButton")
-        start_btn.grid(row=1, column=0, columnspan=5, pady=10)
+        start_btn.grid(row=1, column=0, columnspan=len(algorithms), pady=10)
 
-        # Process Visualization Area
-        vis_frame = ttk.Labelframe(self.scrollable_frame, text="Process Visualization", padding="10")
-        vis_frame.grid(row=2, column=0, sticky="nsew", padx=5, pady=5)
-        vis_frame.grid_columnconfigure(0, weight=1)
-        vis_frame.grid_rowconfigure(0, weight=1)
-        
-        # Canvas for visualization
-        self.canvas = ttk.Canvas(vis_frame)
-        self.canvas.grid(row=0, column=0, sticky="nsew")
+        # Run every algorithm side by side
+        compare_btn = ttk.Button(algo_frame, text="Compare All",
+                               command=self.show_comparison,
+                               style="info.TButton")
+        compare_btn.grid(row=2, column=0, columnspan=len(algorithms), pady=(0, 10))
+
+        # The visualization canvas (row 2), statistics (row 3) and Gantt
+        # canvas (row 5) stay empty until there is something to show, so
+        # they are built on first use by the properties below
+        self._canvas = None
+        self._stats_text = None
+        self._state_canvas = None
 
-        # Statistics Area
-        self.stats_frame = ttk.Labelframe(self.scrollable_frame, text="Statistics", padding="10")
-        self.stats_frame.grid(row=3, column=0, sticky="ew", padx=5, pady=5)
-        
-        self.stats_text = ttk.Text(self.stats_frame, height=5, width=70)
-        self.stats_text.grid(row=0, column=0, sticky="ew")
-        
         # Time label
         self.time_label = ttk.Label(self.scrollable_frame, text="Time: 0")
         self.time_label.grid(row=4, column=0, sticky="w", padx=5, pady=5)
 
-        # State canvas for visualization
-        self.state_canvas = ttk.Canvas(self.scrollable_frame, height=150)
-        self.state_canvas.grid(row=5, column=0, sticky="ew", padx=5, pady=5)
+    @property
+    def canvas(self):
+        """Process visualization canvas, built when the first process is drawn"""
+        if self._canvas is None:
+            vis_frame = ttk.Labelframe(self.scrollable_frame, text="Process Visualization", padding="10")
+            vis_frame.grid(row=2, column=0, sticky="nsew", padx=5, pady=5)
+            vis_frame.grid_columnconfigure(0, weight=1)
+            vis_frame.grid_rowconfigure(0, weight=1)
+            self._canvas = ttk.Canvas(vis_frame)
+            self._canvas.grid(row=0, column=0, sticky="nsew")
+        return self._canvas
+
+    @property
+    def stats_text(self):
+        """Statistics text area, built when statistics are first shown"""
+        if self._stats_text is None:
+            stats_frame = ttk.Labelframe(self.scrollable_frame, text="Statistics", padding="10")
+            stats_frame.grid(row=3, column=0, sticky="ew", padx=5, pady=5)
+            self._stats_text = ttk.Text(stats_frame, height=5, width=70)
+            self._stats_text.grid(row=0, column=0, sticky="ew")
+        return self._stats_text
+
+    @property
+    def state_canvas(self):
+        """Gantt chart canvas, built when the first schedule is drawn"""
+        if self._state_canvas is None:
+            self._state_canvas = ttk.Canvas(self.scrollable_frame, height=150)
+            self._state_canvas.grid(row=5, column=0, sticky="ew", padx=5, pady=5)
+        return self._state_canvas
 
     def show_theme_selector(self):
         """Show theme selection dialog"""
@@ -258,6 +253,12 @@ class SchedulerGUI:
         ttk.Button(control_panel, text="Help", command=self.show_help).grid(row=0, column=6, padx=5)
         ttk.Button(control_panel, text="Team", command=self.show_credits).grid(row=0, column=7, padx=5)
         ttk.Button(control_panel, text="Theme", command=self.show_theme_selector).grid(row=0, column=8, padx=5)
+        ttk.Label(control_panel, text="Speed:").grid(row=0, column=9, padx=(15, 5))
+        self.speed_var = ttk.StringVar(value=SPEEDS[0])
+        speed_box = ttk.Combobox(control_panel, textvariable=self.speed_var, values=SPEEDS,
+                                 width=7, state="readonly")
+        speed_box.grid(row=0, column=10, padx=5)
+        speed_box.bind("<<ComboboxSelected>>", lambda e: self.set_speed(self.speed_var.get()))
         
         # Metrics panel
         metrics_frame = ttk.LabelFrame(self.root, text="Performance Metrics")
@@ -267,12 +268,6 @@ class SchedulerGUI:
         ttk.Label(metrics_frame, textvariable=self.throughput_var).grid(row=0, column=1, padx=5)
         ttk.Label(metrics_frame, textvariable=self.context_switches_var).grid(row=0, column=2, padx=5)
 
-    def setup_metrics_labels(self):
-        """Setup labels for metrics display"""
-        self.cpu_util_label = ttk.Label(self.root, text="0%")
-        self.context_switch_label = ttk.Label(self.root, text="0")
-        self.throughput_label = ttk.Label(self.root, text="0/s")
-        
     def setup_cpu_meter(self):
         """Setup permanent CPU meter at bottom"""
         self.cpu_meter_canvas = ttk.Canvas(self.bottom_frame, height=40)
@@ -321,9 +316,10 @@ Statistics:
         self.is_running = False
         self.paused = False
         self.step_mode = False
+        self.stop_animation()
         self.current_time = 0
-        self.context_switches = 0
-        self.cpu_utilization = 0
+        self.metrics = RollingMetrics(METRICS_WINDOW)
+        self.current_process = None
         
         # Reset processes
         for p in self.scheduler.processes:
@@ -334,6 +330,7 @@ Statistics:
             p.response_time = -1
             
         # Update display
+        self.update_process_table()
         self.draw_enhanced_visualization()
         self.update_statistics()
         
@@ -362,16 +359,7 @@ Statistics:
             
             # Add to table
             try:
-                self.process_table.insert("", "end", values=(
-                    f"P{pid}",
-                    arrival,
-                    burst,
-                    priority,
-                    "Ready",
-                    burst,
-                    0,
-                    0
-                ))
+                self.insert_table_row(self.scheduler.get_process(pid))
                 
                 # Clear inputs
                 self.arrival_var.set("")
@@ -384,7 +372,7 @@ Statistics:
                 
             except Exception as e:
                 # Rollback process addition if table insert fails
-                self.scheduler.processes.pop()
+                self.scheduler.remove_process(pid)
                 raise Exception(f"Failed to add process to table: {str(e)}")
                 
         except ValueError as e:
@@ -452,7 +440,7 @@ Statistics:
         # Draw process executions
         colors = ["#FFB6C1", "#98FB98", "#87CEFA", "#DDA0DD", "#F0E68C"]
         for i, (pid, (start, end)) in enumerate(zip(gantt_chart, time_chart)):
-            process = next(p for p in self.scheduler.processes if p.pid == pid)
+            process = self.scheduler.get_process(pid)
             color = colors[process.pid % len(colors)]
             
             # Draw execution block
@@ -504,84 +492,109 @@ Statistics:
                               arrow=LAST,
                               smooth=True)
     
+    def table_values(self, p):
+        return (p.pid, p.arrival_time, p.burst_time, p.priority, p.state.title(),
+                p.remaining_time, p.waiting_time, p.turnaround_time)
+
+    def insert_table_row(self, p):
+        self.process_table.model.append(self.table_values(p))
+        self.process_table.render()
+
+    def refresh_table_row(self, pid):
+        """Update the one table row of `pid`; it is drawn on the next render()"""
+        self.process_table.model.update(pid, self.table_values(self.scheduler.get_process(pid)))
+
     def update_process_table(self):
-        """Update process table contents"""
-        # Clear existing items
-        for item in self.process_table.get_children():
-            self.process_table.delete(item)
-            
-        # Re-add all processes with current state
-        for p in self.scheduler.processes:
-            self.process_table.insert("", "end", values=(
-                f"P{p.pid}",
-                p.arrival_time,
-                p.burst_time,
-                p.priority,
-                p.state.title(),
-                p.remaining_time,
-                p.waiting_time,
-                p.turnaround_time
-            ))
+        """Reload the table data; per-tick changes go through refresh_table_row()"""
+        self.process_table.model.set_rows([self.table_values(p) for p in self.scheduler.processes])
+        self.process_table.render()
     
     def animate_execution(self, gantt_data):
-        """Animated execution with timing data using after() instead of Thread"""
+        """Play back the Gantt data with a frame-paced after() loop"""
+        self.stop_animation()
         self.is_running = True
         self.current_time = 0
         self.current_gantt_data = gantt_data
         self.gantt_chart, self.time_chart = gantt_data
         self.current_index = 0
         self.current_time_index = 0
-        self.last_pid = None
-        
-        def update_frame():
-            if not self.is_running or (self.paused and not self.step_mode):
-                self.root.after(100, update_frame)
-                return
-                
-            if self.current_index < len(self.gantt_chart):
-                pid = self.gantt_chart[self.current_index]
-                start, end = self.time_chart[self.current_index]
-                
-                # Count context switches
-                if self.last_pid is not None and self.last_pid != pid:
-                    self.context_switches += 1
-                self.last_pid = pid
-                
-                if self.current_time_index < end:
-                    self.current_time = self.current_time_index
-                    self.update_process_states(pid)
-                    self.update_performance_metrics()
-                    self.draw_enhanced_visualization()
-                    self.current_time_index += 1
-                    
-                    delay = int(self.animation_speed * 1000)  # Convert to milliseconds
-                    self.root.after(delay, update_frame)
-                else:
-                    self.current_index += 1
-                    self.root.after(1, update_frame)
-                    
-                if self.step_mode:
-                    self.step_mode = False
-                    self.paused = True
-            else:
-                self.finalize_simulation()
-        
-        update_frame()
+        self.metrics = RollingMetrics(METRICS_WINDOW)
+        self.current_process = None
+
+        # Replay from the arrival state; the run's metrics stay on the processes
+        for p in self.scheduler.processes:
+            p.remaining_time = p.burst_time
+            p.state = "ready"
+            p.state_history = []
+        self.update_process_table()
+        self.tick_budget = 0.0
+        self.last_frame = time.perf_counter()
+        self.render_frame()
+
+    def stop_animation(self):
+        if self.frame_job is not None:
+            self.root.after_cancel(self.frame_job)
+            self.frame_job = None
+
+    def render_frame(self):
+        """One animation frame: advance the ticks due since the last frame, then draw once"""
+        self.frame_job = None
+        if not self.is_running:
+            return
+        now = time.perf_counter()
+        elapsed = now - self.last_frame
+        self.last_frame = now
+
+        if self.step_mode:
+            ticks = 1
+            self.step_mode = False
+            self.paused = True
+        elif self.paused:
+            ticks = 0
+        else:
+            # Fractional ticks carry over, so slow speeds still advance on time
+            self.tick_budget += elapsed * self.animation_speed
+            ticks = int(self.tick_budget)
+            self.tick_budget -= ticks
+
+        if ticks and self.advance_ticks(ticks):
+            self.draw_enhanced_visualization()
+        if self.current_index >= len(self.gantt_chart):
+            self.finalize_simulation()
+            return
+        self.frame_job = self.root.after(FRAME_INTERVAL_MS, self.render_frame)
+
+    def advance_ticks(self, ticks):
+        """Replay up to `ticks` time units without drawing; returns the units run.
+
+        Idle gaps between executions are skipped without using up ticks, and
+        each Gantt entry advances in one chunk as far as the ticks allow.
+        """
+        advanced = 0
+        while advanced < ticks and self.current_index < len(self.gantt_chart):
+            pid = self.gantt_chart[self.current_index]
+            start, end = self.time_chart[self.current_index]
+            # Skip idle gaps between executions
+            self.current_time_index = max(self.current_time_index, start)
+            run = min(end - self.current_time_index, ticks - advanced)
+            if run > 0:
+                self.current_time = self.current_time_index
+                self.metrics.on_segment(pid, self.current_time, self.current_time + run)
+                self.update_process_states(pid, run)
+                self.current_time_index += run
+                advanced += run
+            if self.current_time_index >= end:
+                self.current_index += 1
+        return advanced
 
     def update_performance_metrics(self):
-        """Calculate and update performance metrics"""
-        # CPU Utilization
-        active_time = sum(1 for p in self.scheduler.processes if p.state == "running")
-        self.cpu_utilization = (active_time / self.current_time) * 100 if self.current_time > 0 else 0
-        
-        # Throughput
-        completed = sum(1 for p in self.scheduler.processes if p.state == "completed")
-        throughput = completed / self.current_time if self.current_time > 0 else 0
-        
-        # Update displays
-        self.cpu_util_var.set(f"CPU Utilization: {self.cpu_utilization:.1f}%")
-        self.throughput_var.set(f"Throughput: {throughput:.2f} processes/unit")
-        self.context_switches_var.set(f"Context Switches: {self.context_switches}")
+        """Update metric displays from the running accumulators (O(1))"""
+        metrics = self.metrics
+        self.cpu_util_var.set(f"CPU: {metrics.utilization():.1f}% "
+                              f"(last {metrics.window}: {metrics.window_utilization():.1f}%)")
+        self.throughput_var.set(f"Throughput: {metrics.throughput():.2f}/unit "
+                                f"(last {metrics.window}: {metrics.window_throughput():.2f})")
+        self.context_switches_var.set(f"Switches: {metrics.context_switches}")
 
     def draw_enhanced_visualization(self):
         """Enhanced visualization with fixed CPU meter"""
@@ -589,11 +602,10 @@ Statistics:
         self.draw_gantt_chart()
         self.draw_cpu_meter()  # Now draws in bottom frame
         self.draw_state_transitions()
-        self.update_process_table()
+        self.process_table.render()
         
         self.time_label.config(text=f"Time: {self.current_time}")
         self.calculate_metrics()
-        self.root.update()
 
     def toggle_pause(self):
         """Pause/Resume simulation"""
@@ -635,7 +647,7 @@ Statistics:
                 processes = json.load(f)
             
             # Reset current processes
-            self.scheduler.processes.clear()
+            self.scheduler.clear_processes()
             
             # Load saved processes
             for p in processes:
@@ -646,6 +658,7 @@ Statistics:
                     p['priority']
                 )
             
+            self.update_process_table()
             self.draw_process_list()
             messagebox.showinfo("Success", f"Loaded {len(processes)} processes")
         except Exception as e:
@@ -666,67 +679,45 @@ Statistics:
         canvas.create_rectangle(x, y, x + meter_width, y + meter_height,
                               fill="white", outline="black")
         
-        # Calculate CPU utilization
-        running_processes = sum(1 for p in self.scheduler.processes if p.state == "running")
-        total_time = self.current_time if self.current_time > 0 else 1
-        self.cpu_utilization = (running_processes / total_time) * 100
+        # Busy share of the recent window
+        utilization = self.metrics.window_utilization()
         
         # CPU usage bar
-        used_width = int((meter_width * self.cpu_utilization) / 100)
+        used_width = int((meter_width * utilization) / 100)
         canvas.create_rectangle(x, y, x + used_width, y + meter_height,
                               fill="green", outline="")
         
         # CPU percentage text
         canvas.create_text(x + meter_width/2, y + meter_height/2,
-                          text=f"CPU: {self.cpu_utilization:.1f}%")
+                          text=f"CPU: {utilization:.1f}%")
 
-    def update_process_states(self, pid):
-        """Enhanced process state management with transitions and table updates"""
+    def update_process_states(self, pid, run=1):
+        """Advance `pid` by `run` time units; only it and the process it replaced change"""
         try:
             current_time = self.current_time
-            last_state = None
-            
-            for p in self.scheduler.processes:
-                if p.pid == pid:
-                    # Transition to running
-                    if p.state != "running":
-                        self.animate_transition(p, "ready", "running")
-                        p.update_state("running", current_time)
-                        if self.last_process_state != pid:
-                            self.context_switches += 1
-                    
-                    p.remaining_time -= 1
-                    if p.remaining_time == 0:
-                        self.animate_transition(p, "running", "completed")
-                        p.update_state("completed", current_time)
-                    
-                    self.last_process_state = pid
-                    self.current_process = p
-                
-                elif p.state != "completed":
-                    if p.state == "running":
-                        self.animate_transition(p, "running", "ready")
-                    p.update_state("ready", current_time)
-
-            # Update table
-            for item in self.process_table.get_children():
-                process_pid = int(self.process_table.item(item)['values'][0][1:])  # Remove 'P' prefix
-                process = next((p for p in self.scheduler.processes if p.pid == process_pid), None)
-                
-                if process:
-                    self.process_table.item(item, values=(
-                        f"P{process.pid}",
-                        process.arrival_time,
-                        process.burst_time,
-                        process.priority,
-                        process.state.title(),
-                        process.remaining_time,
-                        process.waiting_time,
-                        process.turnaround_time
-                    ))
-
-            # Ensure table updates
-            self.root.after(10, self.update_process_table)  # Schedule table update
+            p = self.scheduler.get_process(pid)
+            previous = self.current_process
+
+            # The previously running process goes back to ready
+            if previous is not None and previous is not p and previous.state == "running":
+                self.animate_transition(previous, "running", "ready")
+                previous.update_state("ready", current_time)
+                self.refresh_table_row(previous.pid)
+
+            # Transition to running
+            if p.state != "running":
+                self.animate_transition(p, "ready", "running")
+                p.update_state("running", current_time)
+
+            p.remaining_time -= run
+            if p.remaining_time == 0:
+                self.animate_transition(p, "running", "completed")
+                p.update_state("completed", current_time + run)
+                self.metrics.on_complete(p, current_time + run)
+
+            self.last_process_state = pid
+            self.current_process = p
+            self.refresh_table_row(pid)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to update process states: {str(e)}")
@@ -752,30 +743,18 @@ Statistics:
                                   400, y + radius,
                                   fill="red", width=2, tags="transition")
         
-        self.root.after(500, lambda: self.canvas.delete("transition"))
+        # One pending clean-up for all the transitions drawn in a frame
+        if self.transition_job is not None:
+            self.root.after_cancel(self.transition_job)
+        self.transition_job = self.root.after(500, self.clear_transitions)
+
+    def clear_transitions(self):
+        self.transition_job = None
+        self.canvas.delete("transition")
 
     def calculate_metrics(self):
-        """Enhanced performance metrics calculation"""
-        if self.current_time == 0:
-            return
-            
-        # CPU Utilization (weighted by time spent)
-        total_run_time = sum(len([t for t, s in p.state_history if s == "running"]) 
-                            for p in self.scheduler.processes)
-        self.cpu_utilization = (total_run_time / self.current_time) * 100
-        
-        # Throughput (completed processes per unit time)
-        completed = sum(1 for p in self.scheduler.processes if p.state == "completed")
-        throughput = completed / self.current_time
-        
-        # Average Response Time
-        avg_response = sum(p.response_time for p in self.scheduler.processes 
-                         if p.response_time >= 0) / len(self.scheduler.processes)
-        
-        # Update displays
-        self.cpu_util_var.set(f"CPU: {self.cpu_utilization:.1f}%")
-        self.throughput_var.set(f"Throughput: {throughput:.2f}")
-        self.context_switches_var.set(f"Switches: {self.context_switches}")
+        """Refresh performance metrics; they are maintained incrementally"""
+        self.update_performance_metrics()
         
     def start_simulation(self):
         """Start scheduling simulation with process limit check"""
@@ -787,30 +766,89 @@ Statistics:
         if self.is_running:
             return
             
-        # Reset process states
-        for p in self.scheduler.processes:
-            p.state = "ready"
-            p.remaining_time = p.burst_time
-        
-        # Run selected algorithm
+        # Run selected algorithm (repeat runs are served from the result cache)
         algo = self.algo_var.get()
         try:
-            if (algo == "rr"):
-                gantt_data = self.scheduler.round_robin()
-            elif (algo == "sjf"):
-                gantt_data = self.scheduler.sjf_nonpreemptive()
-            elif (algo == "sjf_p"):
-                gantt_data = self.scheduler.sjf_preemptive()
-            elif (algo == "priority"):
-                gantt_data = self.scheduler.priority_scheduling(False)
-            else:
-                gantt_data = self.scheduler.priority_scheduling(True)
-                
+            gantt_data = self.result_cache.run(self.scheduler, algo)
             self.animate_execution(gantt_data)
             self.update_statistics()
         except Exception as e:
             messagebox.showerror("Error", f"Simulation error: {str(e)}")
     
+    def show_comparison(self):
+        """Run all algorithms on isolated copies and show them side by side"""
+        if len(self.scheduler.processes) < self.scheduler.min_processes:
+            messagebox.showwarning("Warning",
+                f"Need minimum {self.scheduler.min_processes} processes to compare algorithms")
+            return
+
+        # Comparison support is only imported once it is used
+        from comparison import compare_all
+        from workload import Workload
+
+        try:
+            workload = Workload.from_processes(self.scheduler.processes)
+            results = compare_all(workload, time_quantum=self.scheduler.time_quantum,
+                                  cache=self.result_cache)
+        except Exception as e:
+            messagebox.showerror("Error", f"Comparison error: {str(e)}")
+            return
+
+        window = ttk.Toplevel(self.root)
+        window.title("Algorithm Comparison")
+        window.geometry("900x600")
+
+        # Metrics matrix: one row per algorithm
+        columns = ("Algorithm", "Avg Wait", "Avg Turnaround", "Avg Response",
+                   "Makespan", "CPU %", "Switches")
+        matrix = ttk.Treeview(window, columns=columns, show="headings", height=len(results))
+        for col in columns:
+            matrix.heading(col, text=col)
+            matrix.column(col, width=180 if col == "Algorithm" else 100, anchor="center")
+        for algo, result in results.items():
+            summary = result["summary"]
+            matrix.insert("", "end", values=(
+                ALGORITHMS[algo][0],
+                f"{summary['avg_waiting']:.2f}",
+                f"{summary['avg_turnaround']:.2f}",
+                f"{summary['avg_response']:.2f}",
+                summary["makespan"],
+                f"{summary['cpu_utilization']:.1f}",
+                summary["context_switches"]
+            ))
+        matrix.pack(fill="x", padx=5, pady=5)
+
+        # Stacked Gantt charts sharing one time axis
+        canvas = ttk.Canvas(window)
+        canvas.pack(fill="both", expand=True, padx=5, pady=5)
+        self.draw_comparison_gantt(canvas, results)
+
+    def draw_comparison_gantt(self, canvas, results):
+        """Draw one Gantt strip per algorithm on a common time scale"""
+        label_width = 190
+        row_height = 30
+        row_gap = 12
+        y = 25
+        max_time = max(r["summary"]["makespan"] for r in results.values()) or 1
+        cell_width = max(4, min(40, 650 // max_time))
+        colors = ["#FFB6C1", "#98FB98", "#87CEFA", "#DDA0DD", "#F0E68C"]
+
+        for i in range(max_time + 1):
+            if max_time <= 50 or i % 10 == 0:
+                canvas.create_text(label_width + i * cell_width, y - 12, text=str(i))
+
+        for algo, result in results.items():
+            canvas.create_text(5, y + row_height / 2, text=ALGORITHMS[algo][0], anchor="w")
+            gantt_chart, time_chart = result["gantt"]
+            for pid, (start, end) in zip(gantt_chart, time_chart):
+                x1 = label_width + start * cell_width
+                x2 = label_width + end * cell_width
+                canvas.create_rectangle(x1, y, x2, y + row_height,
+                                        fill=colors[pid % len(colors)], outline="black")
+                if x2 - x1 >= 20:
+                    canvas.create_text((x1 + x2) / 2, y + row_height / 2, text=f"P{pid}")
+            y += row_height + row_gap
+
     def update_statistics(self):
         self.stats_text.delete(1.0, END)  # Changed from tk.END
         stats = "Statistics:\n"
@@ -825,16 +863,20 @@ Statistics:
         avg_wait = total_wait / len(self.scheduler.processes)
         avg_turnaround = total_turnaround / len(self.scheduler.processes)
         stats += f"\nAverage Wait Time: {avg_wait:.2f}\n"
-        stats += f"Average Turnaround Time: {avg_turnaround:.2f}"
+        stats += f"Average Turnaround Time: {avg_turnaround:.2f}\n"
+        from quantile_sketch import LatencySketches
+        stats += "\n".join(LatencySketches.from_processes(self.scheduler.processes).format_lines())
         
         self.stats_text.insert(1.0, stats)
 
     def set_speed(self, value):
-        """Set animation speed"""
+        """Set playback speed in time units per second, e.g. "100x" or 100"""
         try:
-            self.animation_speed = float(value)
+            self.animation_speed = float(str(value).rstrip("x"))
         except ValueError:
             self.animation_speed = 1.0
+        if self.animation_speed <= 0:
+            self.animation_speed = 1.0
             
     def finalize_simulation(self):
         """Clean up after simulation ends"""
@@ -847,21 +889,10 @@ Statistics:
         messagebox.showinfo("Complete", "Simulation finished!")
 
         # Update final values in table
-        for item in self.process_table.get_children():
-            process_pid = int(self.process_table.item(item)['values'][0][1:])
-            process = next((p for p in self.scheduler.processes if p.pid == process_pid), None)
-            
-            if process:
-                self.process_table.item(item, values=(
-                    f"P{process.pid}",
-                    process.arrival_time,
-                    process.burst_time,
-                    process.priority,
-                    "Completed",
-                    0,  # Remaining time
-                    process.waiting_time,
-                    process.turnaround_time
-                ))
+        for p in self.scheduler.processes:
+            p.remaining_time = 0
+            self.refresh_table_row(p.pid)
+        self.process_table.render()
 
     def show_credits(self):
         """Display team credits"""
@@ -887,16 +918,20 @@ Version: 1.0
             messagebox.showerror("Error", f"Failed to change theme: {str(e)}")
 
     def setup_process_table(self):
-        """Initialize process table with proper configuration"""
+        """Initialize the virtualized process table with a state filter"""
         self.table_frame = ttk.Frame(self.scrollable_frame)
         self.table_frame.grid(row=6, column=0, columnspan=2, sticky="nsew", padx=5, pady=5)
+
+        filter_frame = ttk.Frame(self.table_frame)
+        filter_frame.grid(row=0, column=0, sticky="w", pady=(0, 5))
+        ttk.Label(filter_frame, text="Show:").pack(side=LEFT, padx=(0, 5))
+        self.table_filter_var = ttk.StringVar(value="All")
+        state_filter = ttk.Combobox(filter_frame, textvariable=self.table_filter_var, width=12,
+                                    values=("All", "Ready", "Running", "Completed"), state="readonly")
+        state_filter.pack(side=LEFT)
+        state_filter.bind("<<ComboboxSelected>>", lambda e: self.filter_process_table())
         
-        # Create table with columns
-        self.process_table = ttk.Treeview(self.table_frame)
-        self.process_table['columns'] = ('PID', 'Arrival', 'Burst', 'Priority', 'State', 'Remaining', 'Wait', 'Turnaround')
-        self.process_table['show'] = 'headings'
-        
-        # Define column widths and headings
+        # Column name -> (width, anchor); only the visible rows exist as Treeview items
         column_config = {
             'PID': (60, 'center'),
             'Arrival': (80, 'center'),
@@ -907,23 +942,18 @@ Version: 1.0
             'Wait': (80, 'center'),
             'Turnaround': (100, 'center')
         }
-        
-        for col, (width, anchor) in column_config.items():
-            self.process_table.column(col, width=width, anchor=anchor)
-            self.process_table.heading(col, text=col)
-        
-        # Add scrollbars
-        y_scrollbar = ttk.Scrollbar(self.table_frame, orient="vertical", command=self.process_table.yview)
-        x_scrollbar = ttk.Scrollbar(self.table_frame, orient="horizontal", command=self.process_table.xview)
-        self.process_table.configure(yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set)
-        
-        # Grid layout
-        self.process_table.grid(row=0, column=0, sticky="nsew")
-        y_scrollbar.grid(row=0, column=1, sticky="ns")
-        x_scrollbar.grid(row=1, column=0, sticky="ew")
+        from virtual_table import VirtualTable
+
+        self.process_table = VirtualTable(self.table_frame, column_config,
+                                          formats={'PID': lambda pid: f"P{pid}"})
+        self.process_table.grid(row=1, column=0, sticky="nsew")
         
         self.table_frame.grid_columnconfigure(0, weight=1)
-        self.table_frame.grid_rowconfigure(0, weight=1)
+        self.table_frame.grid_rowconfigure(1, weight=1)
+
+    def filter_process_table(self):
+        state = self.table_filter_var.get()
+        self.process_table.filter_by("State", None if state == "All" else (state,))
 
     def validate_input(self):
         """Validate process input parameters"""
@@ -947,23 +977,7 @@ Version: 1.0
     def safe_update_table(self):
         """Safely update process table with error handling"""
         try:
-            # Clear existing items
-            for item in self.process_table.get_children():
-                self.process_table.delete(item)
-                
-            # Re-add all processes with current state
-            for p in self.scheduler.processes:
-                self.process_table.insert("", "end", values=(
-                    f"P{p.pid}",
-                    p.arrival_time,
-                    p.burst_time,
-                    p.priority,
-                    p.state.title(),
-                    p.remaining_time,
-                    p.waiting_time,
-                    p.turnaround_time
-                ))
-                
+            self.update_process_table()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to update process table: {str(e)}")
 
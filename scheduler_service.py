@@ -0,0 +1,371 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import multiprocessing
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+from cpu_scheduler import ALGORITHMS
+from online_scheduler import OnlineScheduler, SchedulerListener
+from result_cache import ResultCache
+from workload import workload_from_json
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_BODY_SIZE = 16 * 1024 * 1024
+# Segments are forwarded to the event loop in batches of this size
+SEGMENT_BATCH = 256
+# WebSocket close code for a message the server refuses (RFC 6455, 7.4.1)
+CLOSE_POLICY_VIOLATION = 1008
+
+
+class StreamingListener(SchedulerListener):
+    """Puts Gantt segments from a worker process on a multiprocessing queue in batches"""
+
+    def __init__(self, channel, algorithm):
+        self.channel = channel
+        self.algorithm = algorithm
+        self.batch = []
+
+    def on_segment(self, pid, start, end):
+        self.batch.append([pid, start, end])
+        if len(self.batch) >= SEGMENT_BATCH:
+            self.flush()
+
+    def flush(self):
+        if self.batch:
+            self.channel.put({"type": "segments", "algorithm": self.algorithm, "segments": self.batch})
+            self.batch = []
+
+
+def simulate(workload, algorithm, time_quantum, channel=None):
+    """Run one algorithm on fresh copies of `workload`; used in worker processes.
+
+    With a `channel` (a multiprocessing queue) segments are streamed on it
+    in batches while the run goes on.
+    """
+    online = OnlineScheduler.from_workload(workload, algorithm, time_quantum)
+    listener = StreamingListener(channel, algorithm) if channel is not None else None
+    if listener:
+        online.add_listener(listener)
+    online.drain()
+    if listener:
+        listener.flush()
+    return ResultCache.make_entry(online.processes, online.gantt_chart, online.time_chart)
+
+
+def forward_segments(channel, loop, queue):
+    """Move batches from a multiprocessing queue to an asyncio queue until a None arrives"""
+    while True:
+        message = channel.get()
+        if message is None:
+            return
+        loop.call_soon_threadsafe(queue.put_nowait, message)
+
+
+def parse_request(payload):
+    """Validate a simulation request and return (workload, algorithms, quantum)"""
+    if not isinstance(payload, dict):
+        raise ValueError("Request must be a JSON object")
+    workload = workload_from_json(payload.get("processes") or [])
+    algorithms = payload.get("algorithms") or list(ALGORITHMS)
+    if isinstance(algorithms, str):
+        algorithms = [algorithms]
+    if not isinstance(algorithms, list):
+        raise ValueError("algorithms must be a name or a list of names")
+    unknown = [a for a in algorithms if not isinstance(a, str) or a not in ALGORITHMS]
+    if unknown:
+        raise ValueError(f"Unknown algorithm(s): {', '.join(map(str, unknown))}")
+    try:
+        quantum = int(payload.get("quantum", 3))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("Time quantum must be an integer")
+    if quantum <= 0:
+        raise ValueError("Time quantum must be positive")
+    return workload, algorithms, quantum
+
+
+class SimulationService:
+    """Long-lived local simulation server speaking HTTP and WebSocket.
+
+    POST /simulate runs a workload and answers with the full results;
+    GET /ws upgrades to a WebSocket where each text message is a
+    simulation request and Gantt segments are streamed back as they are
+    produced. All clients share one ResultCache and one pool of worker
+    processes, so simulations run in parallel on several CPUs; identical
+    runs requested while one is in flight wait for it instead of running
+    again. Cache disk reads and writes happen off the event loop.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, workers=4, cache=None):
+        self.host = host
+        self.port = port
+        self.cache = cache if cache is not None else ResultCache()
+        # Spawned rather than forked: a fork of the threaded event-loop process can hang
+        self.context = multiprocessing.get_context("spawn")
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=self.context)
+        self.manager = None  # Started on the first streamed run, for segment queues
+        self.inflight = {}  # workload_key -> future of the run computing it
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        return self.server
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+        self.pool.shutdown(wait=False)
+        if self.manager is not None:
+            self.manager.shutdown()
+
+    async def run_algorithm(self, workload, algorithm, quantum, queue=None):
+        """Return a cache entry for one run, streaming segments to `queue` if given"""
+        template = workload.to_scheduler(quantum)
+        key = self.cache.key_for(template, algorithm)
+        entry = self.cache.get(key, load=False)
+        streamed = False
+        if entry is None:
+            run = self.inflight.get(key)
+            owner = run is None
+            if owner:
+                run = self.inflight[key] = asyncio.ensure_future(
+                    self.fetch(key, workload, algorithm, quantum, queue))
+                run.add_done_callback(lambda _: self.inflight.pop(key, None))
+            # Shielded so a client going away does not cancel a run others wait for
+            entry, computed = await asyncio.shield(run)
+            streamed = owner and computed
+        if streamed:
+            self.cache.misses += 1
+            return entry
+        self.cache.hits += 1
+        if queue is not None:
+            segments = [[pid, start, end] for pid, (start, end)
+                        in zip(entry["gantt_chart"], entry["time_chart"])]
+            for i in range(0, len(segments), SEGMENT_BATCH):
+                queue.put_nowait({"type": "segments", "algorithm": algorithm,
+                                  "segments": segments[i:i + SEGMENT_BATCH]})
+        return entry
+
+    async def fetch(self, key, workload, algorithm, quantum, queue=None):
+        """(entry, computed): the disk tier's entry, or a fresh run from the worker pool.
+
+        Fresh runs stream their segments to `queue` if given; disk reads and
+        writes go through the default executor to keep the event loop free.
+        """
+        loop = asyncio.get_running_loop()
+        if self.cache.cache_dir:
+            entry = await loop.run_in_executor(None, self.cache.load, key)
+            if entry is not None:
+                self.cache.put(key, entry, store=False)
+                return entry, False
+        if queue is None:
+            entry = await loop.run_in_executor(self.pool, simulate, workload, algorithm, quantum)
+        else:
+            if self.manager is None:
+                self.manager = self.context.Manager()
+            channel = self.manager.Queue()
+            forwarder = loop.run_in_executor(None, forward_segments, channel, loop, queue)
+            try:
+                entry = await loop.run_in_executor(self.pool, simulate, workload, algorithm, quantum,
+                                                   channel)
+            finally:
+                # The worker put all its batches before returning, so this comes last
+                channel.put(None)
+                await forwarder
+        self.cache.put(key, entry, store=False)
+        await loop.run_in_executor(None, self.cache.store, key, entry)
+        return entry, True
+
+    def summarize(self, workload, quantum, entry):
+        scheduler = workload.to_scheduler(quantum)
+        self.cache.apply_entry(scheduler.processes, entry)
+        gantt_data = (entry["gantt_chart"], [tuple(t) for t in entry["time_chart"]])
+        return scheduler.summary(gantt_data)
+
+    async def handle_client(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = await self.read_headers(reader)
+            if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                await self.handle_websocket(reader, writer, headers)
+            elif path == "/simulate" and method == "POST":
+                await self.handle_simulate(reader, writer, headers)
+            elif path == "/health" and method == "GET":
+                await self.send_json(writer, 200, {"status": "ok", "cache_hits": self.cache.hits,
+                                                   "cache_misses": self.cache.misses})
+            else:
+                await self.send_json(writer, 404, {"error": "Not found"})
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError) as e:
+            if not writer.is_closing():
+                try:
+                    await self.send_json(writer, 400, {"error": str(e)})
+                except ConnectionError:
+                    pass
+        finally:
+            writer.close()
+
+    async def read_headers(self, reader):
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    async def send_json(self, writer, status, payload):
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found"}.get(status, "Error")
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()
+
+    async def handle_simulate(self, reader, writer, headers):
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY_SIZE:
+            raise ValueError("Request body too large")
+        workload, algorithms, quantum = parse_request(json.loads(await reader.readexactly(length)))
+        entries = await asyncio.gather(*(self.run_algorithm(workload, algo, quantum)
+                                         for algo in algorithms))
+        results = {}
+        for algo, entry in zip(algorithms, entries):
+            results[algo] = {
+                "summary": self.summarize(workload, quantum, entry),
+                "segments": [[pid, start, end] for pid, (start, end)
+                             in zip(entry["gantt_chart"], entry["time_chart"])],
+            }
+        await self.send_json(writer, 200, results)
+
+    async def handle_websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key")
+        if not key:
+            raise ValueError("Missing Sec-WebSocket-Key")
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest())
+        writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                     b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+        await writer.drain()
+        try:
+            await self.websocket_session(reader, writer)
+        except ValueError as e:
+            # The connection is no longer HTTP, so refuse with a close frame
+            reason = str(e).encode("utf-8")[:123].decode("utf-8", "ignore").encode("utf-8")
+            try:
+                await self.send_frame(writer, 0x8, struct.pack("!H", CLOSE_POLICY_VIOLATION) + reason)
+            except ConnectionError:
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # Client went away without a close frame
+
+    async def websocket_session(self, reader, writer):
+        while True:
+            opcode, message = await self.read_frame(reader)
+            if opcode == 0x8:
+                await self.send_frame(writer, 0x8, b"")
+                return
+            if opcode == 0x9:
+                await self.send_frame(writer, 0xA, message)
+                continue
+            if opcode != 0x1:
+                continue
+            try:
+                workload, algorithms, quantum = parse_request(json.loads(message))
+            except ValueError as e:
+                await self.send_message(writer, {"type": "error", "error": str(e)})
+                continue
+            await self.stream_simulation(writer, workload, algorithms, quantum)
+
+    async def stream_simulation(self, writer, workload, algorithms, quantum):
+        queue = asyncio.Queue()
+        runs = asyncio.gather(*(self.run_algorithm(workload, algo, quantum, queue)
+                                for algo in algorithms))
+        # Forward segment batches while the runs progress, then drain the rest
+        while not runs.done() or not queue.empty():
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter, runs}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                await self.send_message(writer, getter.result())
+            else:
+                getter.cancel()
+        try:
+            entries = runs.result()
+        except Exception as e:
+            await self.send_message(writer, {"type": "error", "error": str(e)})
+            return
+        for algo, entry in zip(algorithms, entries):
+            await self.send_message(writer, {"type": "summary", "algorithm": algo,
+                                             "summary": self.summarize(workload, quantum, entry)})
+        await self.send_message(writer, {"type": "done"})
+
+    async def read_frame(self, reader):
+        """Read one client frame, reassembling fragments; returns (opcode, payload)"""
+        payload = b""
+        first_opcode = None
+        while True:
+            head = await reader.readexactly(2)
+            fin, opcode = head[0] & 0x80, head[0] & 0x0F
+            masked, length = head[1] & 0x80, head[1] & 0x7F
+            if length == 126:
+                length = struct.unpack("!H", await reader.readexactly(2))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", await reader.readexactly(8))[0]
+            if len(payload) + length > MAX_BODY_SIZE:
+                raise ValueError("WebSocket message too large")
+            mask = await reader.readexactly(4) if masked else None
+            data = await reader.readexactly(length)
+            if mask and length:
+                key = (mask * (length // 4 + 1))[:length]
+                data = (int.from_bytes(data, "big") ^ int.from_bytes(key, "big")).to_bytes(length, "big")
+            if opcode >= 0x8:
+                return opcode, data  # Control frames are never fragmented
+            if first_opcode is None:
+                first_opcode = opcode
+            payload += data
+            if fin:
+                return first_opcode, payload
+
+    async def send_frame(self, writer, opcode, data):
+        header = bytearray([0x80 | opcode])
+        if len(data) < 126:
+            header.append(len(data))
+        elif len(data) < 1 << 16:
+            header += bytes([126]) + struct.pack("!H", len(data))
+        else:
+            header += bytes([127]) + struct.pack("!Q", len(data))
+        writer.write(bytes(header) + data)
+        await writer.drain()
+
+    async def send_message(self, writer, message):
+        await self.send_frame(writer, 0x1, json.dumps(message, separators=(",", ":")).encode("utf-8"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local CPU scheduling simulation service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--cache-dir", default=None, help="directory for the on-disk result cache")
+    args = parser.parse_args(argv)
+    service = SimulationService(args.host, args.port, args.workers,
+                                ResultCache(max_entries=1024, cache_dir=args.cache_dir))
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+import mmap
+import struct
+import sys
+from array import array
+from multiprocessing import shared_memory
+
+from cpu_scheduler import ALGORITHMS, SUMMARY_FIELDS
+from fast_engine import run_fast, segment_capacity, summarize
+from workload import Workload
+
+# Blocks hold a header (magic, version, byte order, row count) followed by
+# int64 columns in native byte order; they are meant for one host, not for
+# moving between architectures.
+WORKLOAD_MAGIC = b"CPUW"
+RESULTS_MAGIC = b"CPUR"
+SHARED_VERSION = 1
+HEADER = struct.Struct("<4sHcxq")
+BYTE_ORDER = sys.byteorder[0].encode("ascii")
+WORKLOAD_COLUMNS = ("pids", "arrivals", "bursts", "priorities", "arrival_order")
+
+
+def _attach_memory(name):
+    try:
+        # Python 3.13+: attaching must not hand the block to the resource tracker
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _read_header(buffer, magic):
+    try:
+        found, version, order, n = HEADER.unpack_from(buffer)
+    except struct.error:
+        raise ValueError("Shared block is too small")
+    if found != magic:
+        raise ValueError("Not a shared scheduler block")
+    if version != SHARED_VERSION:
+        raise ValueError(f"Unsupported shared block version {version}")
+    if order != BYTE_ORDER:
+        raise ValueError("Shared block was written with a different byte order")
+    return n
+
+
+class SharedBlock:
+    """Memory a block's typed views live in, from shared memory or a mapped file.
+
+    Views handed out by the subclasses must be released before close(),
+    which close() does for the ones it created.
+    """
+
+    def __init__(self, handle, source, owner):
+        self.handle = handle
+        self.source = source  # ("shm", name) or ("file", path); enough to attach again
+        self.owner = owner
+        self.buffer = memoryview(handle.buf if source[0] == "shm" else handle)
+        self.views = []
+
+    def __reduce__(self):
+        # Workers receive only the name and attach to the same memory
+        return type(self).attach, (self.source,)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def view(self, fmt, offset, count, readonly):
+        view = self.buffer[offset:offset + count * struct.calcsize(fmt)].cast(fmt)
+        if readonly:
+            view = view.toreadonly()
+        self.views.append(view)
+        return view
+
+    def close(self):
+        for view in self.views:
+            view.release()
+        self.views = []
+        self.buffer.release()
+        self.handle.close()
+
+    def unlink(self):
+        if self.source[0] == "shm":
+            self.handle.unlink()
+
+
+class SharedWorkload(SharedBlock):
+    """Workload columns in shared memory (or a mapped file) that workers attach to.
+
+    It has the columns, arrival_order and len() of a Workload, so it can be
+    passed to run_fast() and summarize() as is. Pickling it only sends the
+    block name, and attached copies are read-only views of the same pages,
+    so a pool of workers never copies or serializes the trace.
+    """
+
+    def __init__(self, handle, source, owner=False):
+        super().__init__(handle, source, owner)
+        self.n = _read_header(self.buffer, WORKLOAD_MAGIC)
+        for k, column in enumerate(WORKLOAD_COLUMNS):
+            setattr(self, column, self.view("q", HEADER.size + 8 * k * self.n, self.n, not owner))
+
+    def __len__(self):
+        return self.n
+
+    @staticmethod
+    def block_size(n):
+        return HEADER.size + 8 * len(WORKLOAD_COLUMNS) * n
+
+    @classmethod
+    def create(cls, workload):
+        """Copy a Workload into a new shared memory block owned by the caller"""
+        n = len(workload)
+        handle = shared_memory.SharedMemory(create=True, size=cls.block_size(n))
+        HEADER.pack_into(handle.buf, 0, WORKLOAD_MAGIC, SHARED_VERSION, BYTE_ORDER, n)
+        shared = cls(handle, ("shm", handle.name), owner=True)
+        for column in WORKLOAD_COLUMNS:
+            getattr(shared, column)[:] = array("q", getattr(workload, column))
+        return shared
+
+    @classmethod
+    def attach(cls, source):
+        kind, where = source
+        if kind == "shm":
+            return cls(_attach_memory(where), source)
+        with open(where, "rb") as f:
+            handle = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(handle, source)
+
+    @classmethod
+    def open_file(cls, path):
+        """Map a file written by save() read-only; pages are shared through the OS cache"""
+        return cls.attach(("file", path))
+
+    @staticmethod
+    def save(workload, path):
+        """Write a Workload in the block layout so it can be mapped with open_file()"""
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(WORKLOAD_MAGIC, SHARED_VERSION, BYTE_ORDER, len(workload)))
+            for column in WORKLOAD_COLUMNS:
+                array("q", getattr(workload, column)).tofile(f)
+
+    def to_workload(self):
+        """A regular, private Workload with the same columns"""
+        return Workload(self.pids, self.arrivals, self.bursts, self.priorities)
+
+
+class SharedResults(SharedBlock):
+    """Preallocated block that workers write one algorithm's run into per slot.
+
+    Each slot holds the SUMMARY_FIELDS, per-process completion and first
+    start times and, when its segment capacity is non-zero, the Gantt
+    segments. The capacities are stored in the block, so a worker can
+    attach by name alone.
+    """
+
+    def __init__(self, handle, source, owner=False, algorithms=None):
+        super().__init__(handle, source, owner)
+        self.n = n = _read_header(self.buffer, RESULTS_MAGIC)
+        (count,) = struct.unpack_from("q", self.buffer, HEADER.size)
+        self.capacities = self.view("q", HEADER.size + 8, count, True)
+        self.algorithms = list(algorithms or [])
+        offset = HEADER.size + 8 * (count + 1)
+        self.summaries = self.view("d", offset, count * len(SUMMARY_FIELDS), False)
+        offset += 8 * count * len(SUMMARY_FIELDS)
+        self.slots = []
+        for capacity in self.capacities:
+            # Segment count, completion and first start per process, then segments
+            slot = {"segments": self.view("q", offset, 1, False)}
+            offset += 8
+            for name, size in (("completion", n), ("first_start", n), ("seg_pid", capacity),
+                               ("seg_start", capacity), ("seg_end", capacity)):
+                slot[name] = self.view("q", offset, size, False)
+                offset += 8 * size
+            self.slots.append(slot)
+
+    @staticmethod
+    def block_size(n, capacities):
+        count = len(capacities)
+        return (HEADER.size + 8 * (count + 1) + 8 * count * len(SUMMARY_FIELDS)
+                + sum(8 * (1 + 2 * n + 3 * capacity) for capacity in capacities))
+
+    @classmethod
+    def create(cls, algorithms, n, capacities):
+        handle = shared_memory.SharedMemory(create=True, size=cls.block_size(n, capacities))
+        HEADER.pack_into(handle.buf, 0, RESULTS_MAGIC, SHARED_VERSION, BYTE_ORDER, n)
+        struct.pack_into(f"{len(capacities) + 1}q", handle.buf, HEADER.size,
+                         len(capacities), *capacities)
+        return cls(handle, ("shm", handle.name), True, algorithms)
+
+    @classmethod
+    def attach(cls, source):
+        return cls(_attach_memory(source[1]), source)
+
+    def write(self, slot, gantt_data, metrics, summary):
+        """Store one run (run_fast() output and its summary) in `slot`"""
+        seg_pid, time_chart = gantt_data
+        data = self.slots[slot]
+        capacity = self.capacities[slot]
+        if capacity and len(seg_pid) > capacity:
+            raise ValueError(f"Run produced {len(seg_pid)} segments, slot holds {capacity}")
+        width = len(SUMMARY_FIELDS)
+        self.summaries[slot * width:(slot + 1) * width] = array(
+            "d", (summary[field] for field in SUMMARY_FIELDS))
+        data["completion"][:] = array("q", metrics["completion_time"])
+        data["first_start"][:] = array("q", metrics["start_time"])
+        data["segments"][0] = len(seg_pid)
+        if capacity:
+            count = len(seg_pid)
+            data["seg_pid"][:count] = array("q", seg_pid)
+            data["seg_start"][:count] = array("q", (start for start, _ in time_chart))
+            data["seg_end"][:count] = array("q", (end for _, end in time_chart))
+
+    def summary(self, algorithm):
+        slot = self.algorithms.index(algorithm)
+        width = len(SUMMARY_FIELDS)
+        return dict(zip(SUMMARY_FIELDS, self.summaries[slot * width:(slot + 1) * width]))
+
+    def metrics(self, algorithm, workload):
+        """Per-process metrics of `algorithm` in the format run_fast() returns"""
+        data = self.slots[self.algorithms.index(algorithm)]
+        completion = data["completion"].tolist()
+        first_start = data["first_start"].tolist()
+        turnaround = [c - a for c, a in zip(completion, workload.arrivals)]
+        return {
+            "completion_time": completion,
+            "turnaround_time": turnaround,
+            "waiting_time": [t - b for t, b in zip(turnaround, workload.bursts)],
+            "response_time": [s - a for s, a in zip(first_start, workload.arrivals)],
+            "start_time": first_start,
+        }
+
+    def gantt_data(self, algorithm):
+        slot = self.algorithms.index(algorithm)
+        data = self.slots[slot]
+        if not self.capacities[slot]:
+            raise ValueError(f"Gantt data of {algorithm} was not kept")
+        count = data["segments"][0]
+        return (data["seg_pid"][:count].tolist(),
+                list(zip(data["seg_start"][:count].tolist(), data["seg_end"][:count].tolist())))
+
+
+def _run_slot(task):
+    shared, results, slot, algorithm, time_quantum = task
+    try:
+        gantt_data, metrics = run_fast(shared, algorithm, time_quantum)
+        results.write(slot, gantt_data, metrics, summarize(shared, gantt_data, metrics))
+    finally:
+        results.close()
+        shared.close()
+
+
+def run_shared(workload, algorithms=None, time_quantum=3, keep_gantt=False, max_workers=None):
+    """Run each algorithm in a worker process over one shared copy of `workload`.
+
+    `workload` is a Workload (copied into shared memory for the duration of
+    the call) or a SharedWorkload. Workers attach to it and to a result
+    block preallocated here, so nothing but block names crosses process
+    boundaries. Gantt segments are only kept with `keep_gantt`, since for
+    long traces they dwarf everything else. Returns the SharedResults; use
+    it as a context manager so the block is freed.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    algorithms = list(algorithms or ALGORITHMS)
+    for algo in algorithms:
+        if algo not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algo}")
+    created = not isinstance(workload, SharedWorkload)
+    shared = SharedWorkload.create(workload) if created else workload
+    try:
+        capacities = [segment_capacity(algo, shared.bursts, time_quantum) if keep_gantt else 0
+                      for algo in algorithms]
+        results = SharedResults.create(algorithms, len(shared), capacities)
+        try:
+            tasks = [(shared, results, slot, algo, time_quantum)
+                     for slot, algo in enumerate(algorithms)]
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                for _ in pool.map(_run_slot, tasks):
+                    pass
+        except BaseException:
+            results.close()
+            results.unlink()
+            raise
+    finally:
+        if created:
+            shared.close()
+            shared.unlink()
+    return results
@@ -0,0 +1,263 @@
+import os
+from collections import deque
+
+from online_scheduler import OnlineScheduler, SchedulerListener
+
+TIMELINE_SERIES = ("ready", "pending", "busy")
+# Bucket widths are base_width * FACTOR ** level
+FACTOR = 16
+LEVELS = 5
+# Buckets kept per level; older ones are dropped and served by coarser levels
+CAPACITY = 2048
+PANEL_HEIGHT = 80
+MARGIN = 20
+SERIES_COLORS = {"ready": "#1f77b4", "pending": "#ff7f0e", "busy": "#2ca02c"}
+
+
+class Level:
+    """Fixed-width min/max/mean buckets of a step function.
+
+    Buckets are [start, end, min, max, area, covered]. Consecutive whole
+    buckets with the same constant value share one entry, so a long flat
+    stretch costs O(1) however many buckets it spans. Completed buckets are
+    handed to the next coarser level, so only the finest level sees every
+    event.
+    """
+
+    def __init__(self, width, capacity=CAPACITY, coarser=None):
+        self.width = width
+        self.buckets = deque(maxlen=capacity)
+        self.current = None  # The bucket being filled
+        self.coarser = coarser
+
+    def add(self, t0, t1, value):
+        """The series held `value` over [t0, t1)"""
+        width = self.width
+        while t0 < t1:
+            start = t0 - t0 % width
+            end = start + width
+            if t0 == start and t1 >= end:
+                run_end = t1 - t1 % width
+                span = run_end - start
+                self._close([start, run_end, value, value, value * span, span])
+                t0 = run_end
+                continue
+            stop = min(t1, end)
+            self.current = fold(self.current, start, end, value, value, value * (stop - t0), stop - t0)
+            if stop == end:
+                self._close(self.current)
+                self.current = None
+            t0 = stop
+
+    def merge(self, bucket):
+        """Take in a completed bucket of the next finer level"""
+        start, end, low, high, area, covered = bucket
+        if low == high and covered == end - start:
+            self.add(start, end, low)
+            return
+        # A single finer bucket always falls inside one bucket of this level
+        bucket_start = start - start % self.width
+        self.current = fold(self.current, bucket_start, bucket_start + self.width,
+                            low, high, area, covered)
+        if end == bucket_start + self.width:
+            self._close(self.current)
+            self.current = None
+
+    def _close(self, bucket):
+        if self.coarser is not None:
+            self.coarser.merge(list(bucket))
+        buckets = self.buckets
+        if buckets:
+            last = buckets[-1]
+            if (last[1] == bucket[0] and last[2] == last[3] == bucket[2] == bucket[3]
+                    and last[5] == last[1] - last[0] and bucket[5] == bucket[1] - bucket[0]):
+                last[1] = bucket[1]
+                last[4] += bucket[4]
+                last[5] += bucket[5]
+                return
+        buckets.append(bucket)
+
+    def oldest(self):
+        """Start of the oldest time still held, or None when empty"""
+        if self.buckets:
+            return self.buckets[0][0]
+        return self.current[0] if self.current else None
+
+
+def fold(bucket, start, end, low, high, area, covered):
+    """`bucket` (or a new one spanning [start, end) when None) with more samples folded in"""
+    if bucket is None:
+        return [start, end, low, high, area, covered]
+    bucket[2] = min(bucket[2], low)
+    bucket[3] = max(bucket[3], high)
+    bucket[4] += area
+    bucket[5] += covered
+    return bucket
+
+
+class Series:
+    """A step function sampled at events and downsampled at several resolutions"""
+
+    def __init__(self, base_width=1, factor=FACTOR, levels=LEVELS, capacity=CAPACITY):
+        if base_width <= 0 or factor < 2 or levels <= 0:
+            raise ValueError("Need base_width > 0, factor >= 2 and levels > 0")
+        self.levels = []
+        coarser = None
+        for k in range(levels - 1, -1, -1):
+            coarser = Level(base_width * factor ** k, capacity, coarser)
+            self.levels.insert(0, coarser)
+        self.time = None
+        self.value = None
+
+    def set(self, time, value):
+        """The series takes `value` from `time` on"""
+        if value == self.value:
+            return
+        self.advance(time)
+        self.time = time
+        self.value = value
+
+    def advance(self, time):
+        """Fold the current value in up to `time`"""
+        if self.time is not None and time > self.time:
+            self.levels[0].add(self.time, time, self.value)
+            self.time = time
+
+    def rows(self, index, start, end):
+        """(start, end, min, max, mean) of level `index` overlapping [start, end)"""
+        level = self.levels[index]
+        rows = [(b[0], b[1], b[2], b[3], b[4] / b[5])
+                for b in level.buckets if b[1] > start and b[0] < end]
+        # The open bucket also holds what the finer levels have not passed on yet
+        current = list(level.current) if level.current else None
+        for finer in reversed(self.levels[:index]):
+            if finer.current:
+                bucket_start = finer.current[0] - finer.current[0] % level.width
+                if current is not None and current[0] != bucket_start:
+                    rows.append(tuple(current[:4]) + (current[4] / current[5],))
+                    current = None
+                current = fold(current, bucket_start, bucket_start + level.width,
+                               *finer.current[2:])
+        if current and current[0] < end and current[5]:
+            rows.append(tuple(current[:4]) + (current[4] / current[5],))
+        return rows
+
+    def downsample(self, start, end, points):
+        """About `points` (start, end, min, max, mean) rows covering [start, end).
+
+        Uses the finest level that has at most `points` buckets in the range
+        and still holds its beginning, falling back to the coarsest level.
+        """
+        for index, level in enumerate(self.levels):
+            oldest = level.oldest()
+            if -(-(end - start) // level.width) <= points and (oldest is None or oldest <= start):
+                return self.rows(index, start, end)
+        return self.rows(len(self.levels) - 1, start, end)
+
+
+class TimelineRecorder(SchedulerListener):
+    """Records ready-queue length, not-yet-arrived jobs and CPU busy state over time.
+
+    Attach it to an OnlineScheduler; it only does O(levels) work per queue
+    event and keeps a bounded number of buckets, so million-unit runs stay
+    small. "pending" counts jobs submitted for a later arrival, which is
+    the closest thing to blocked jobs in this model.
+    """
+
+    def __init__(self, base_width=1, factor=FACTOR, levels=LEVELS, capacity=CAPACITY):
+        self.series = {name: Series(base_width, factor, levels, capacity) for name in TIMELINE_SERIES}
+        self.ready, self.pending, self.busy = (self.series[name] for name in TIMELINE_SERIES)
+        self.start = None
+        self.now = 0
+
+    def on_queue(self, time, ready, pending, busy):
+        if self.start is None:
+            self.start = time
+        if time > self.now:
+            self.now = time
+        self.ready.set(time, ready)
+        self.pending.set(time, pending)
+        self.busy.set(time, int(busy))
+
+    def on_advance(self, time):
+        self.now = max(self.now, time)
+
+    def downsample(self, points=1000, start=None, end=None):
+        """{series: [(start, end, min, max, mean)]} with about `points` rows each"""
+        start = self.start if start is None else start
+        end = self.now if end is None else end
+        if start is None or end <= start:
+            return {name: [] for name in TIMELINE_SERIES}
+        for series in self.series.values():
+            series.advance(self.now)
+        return {name: series.downsample(start, end, points) for name, series in self.series.items()}
+
+
+def record_timeline(workload, algorithm="rr", time_quantum=3, **kwargs):
+    """Run `workload` through OnlineScheduler and return its TimelineRecorder"""
+    scheduler = OnlineScheduler(algorithm, time_quantum, record_history=False)
+    recorder = TimelineRecorder(**kwargs)
+    scheduler.add_listener(recorder)
+    for process in workload.to_processes():
+        scheduler.submit(process)
+    scheduler.drain()
+    return recorder
+
+
+def render_timeline_svg(recorder, width=1200, title=None):
+    """One panel per series: a min-max band with the mean drawn over it"""
+    plot_width = width - 2 * MARGIN
+    data = recorder.downsample(plot_width)
+    start = recorder.start or 0
+    span = max(recorder.now - start, 1)
+    scale = plot_width / span
+    top = MARGIN + (24 if title else 0)
+    height = top + len(data) * (PANEL_HEIGHT + MARGIN) + MARGIN
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="11">\n',
+        f'<rect width="{width}" height="{height}" fill="#FFFFFF"/>\n',
+    ]
+    if title:
+        parts.append(f'<text x="{MARGIN}" y="{MARGIN + 12}" font-size="14">{title}</text>\n')
+    for name, rows in data.items():
+        peak = max((row[3] for row in rows), default=0) or 1
+        color = SERIES_COLORS[name]
+
+        def y(value):
+            return top + PANEL_HEIGHT - value / peak * PANEL_HEIGHT
+
+        parts.append(f'<rect x="{MARGIN}" y="{top}" width="{plot_width}" height="{PANEL_HEIGHT}" '
+                     f'fill="none" stroke="#999999"/>\n')
+        parts.append(f'<text x="{MARGIN + 4}" y="{top + 12}">{name} (max {peak:g})</text>\n')
+        mean_points = []
+        for row_start, row_end, low, high, mean in rows:
+            x0 = MARGIN + (max(row_start, start) - start) * scale
+            x1 = MARGIN + (min(row_end, recorder.now) - start) * scale
+            parts.append(f'<rect x="{x0:.2f}" y="{y(high):.2f}" width="{max(x1 - x0, 0.5):.2f}" '
+                         f'height="{y(low) - y(high):.2f}" fill="{color}" fill-opacity="0.3"/>\n')
+            mean_points.append(f"{x0:.2f},{y(mean):.2f} {x1:.2f},{y(mean):.2f}")
+        if mean_points:
+            parts.append(f'<polyline points="{" ".join(mean_points)}" fill="none" '
+                         f'stroke="{color}" stroke-width="1"/>\n')
+        top += PANEL_HEIGHT + MARGIN
+    parts.append("</svg>\n")
+    return "".join(parts)
+
+
+def export_timeline(path, recorder, points=1000, width=1200, title=None):
+    """Write the timeline as .svg (plotted) or .csv (series, start, end, min, max, mean rows)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".svg":
+        with open(path, "w") as f:
+            f.write(render_timeline_svg(recorder, width, title))
+    elif extension == ".csv":
+        import csv
+
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("series", "start", "end", "min", "max", "mean"))
+            for name, rows in recorder.downsample(points).items():
+                writer.writerows((name,) + row for row in rows)
+    else:
+        raise ValueError(f"Unsupported timeline format: {extension or path} (use .svg or .csv)")
@@ -0,0 +1,139 @@
+import json
+
+from cpu_scheduler import ALGORITHMS
+from online_scheduler import SchedulerListener
+
+# Trace timestamps are microseconds; one simulated time unit is shown as 1 ms
+TIME_SCALE = 1000
+# Thread ids inside each run: CPUs count down from 0, processes use pid + 1
+PROCESS_TID_OFFSET = 1
+
+
+def cpu_tid(cpu):
+    return -cpu
+
+
+def process_tid(pid):
+    return pid + PROCESS_TID_OFFSET
+
+
+class ChromeTraceWriter:
+    """Streams Chrome Trace Event JSON to a text file object.
+
+    Events are written as soon as they are added, so memory stays flat no
+    matter how long the schedule is. The output loads in chrome://tracing
+    and in the Perfetto UI. Each simulated run is a trace process with one
+    track per CPU and one per scheduled process.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+        stream.write('{"displayTimeUnit":"ms","traceEvents":[\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def event(self, event):
+        if self.count:
+            self.stream.write(",\n")
+        self.stream.write(json.dumps(event, separators=(",", ":")))
+        self.count += 1
+
+    def slice(self, run, tid, name, start, end, args=None):
+        """A complete ("X") event from `start` to `end` in simulated time"""
+        event = {"ph": "X", "pid": run, "tid": tid, "name": name,
+                 "ts": start * TIME_SCALE, "dur": (end - start) * TIME_SCALE}
+        if args:
+            event["args"] = args
+        self.event(event)
+
+    def name_run(self, run, name):
+        self.event({"ph": "M", "pid": run, "name": "process_name", "args": {"name": name}})
+        self.event({"ph": "M", "pid": run, "name": "process_sort_index", "args": {"sort_index": run}})
+
+    def name_track(self, run, tid, name):
+        self.event({"ph": "M", "pid": run, "tid": tid, "name": "thread_name", "args": {"name": name}})
+        self.event({"ph": "M", "pid": run, "tid": tid, "name": "thread_sort_index",
+                    "args": {"sort_index": tid}})
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.write("\n]}\n")
+            self.stream = None
+
+
+class ChromeTraceListener(SchedulerListener):
+    """OnlineScheduler listener that streams a run into a ChromeTraceWriter.
+
+    Segments go to the CPU track as they happen; a process track is written
+    from the process's state history when it completes, so only live
+    processes are held in memory.
+    """
+
+    def __init__(self, writer, run=0, name="Simulation", cpu=0):
+        self.writer = writer
+        self.run = run
+        self.cpu = cpu
+        writer.name_run(run, name)
+        writer.name_track(run, cpu_tid(cpu), f"CPU {cpu}")
+
+    def on_segment(self, pid, start, end):
+        self.writer.slice(self.run, cpu_tid(self.cpu), f"P{pid}", start, end, {"pid": pid})
+
+    def on_complete(self, process, time):
+        write_process_track(self.writer, self.run, process, process.state_history)
+
+
+def write_process_track(writer, run, process, transitions):
+    """Write a process's ready/running intervals from (time, state) transitions.
+
+    Zero-length states are dropped and back-to-back intervals in the same
+    state are merged, so a Round Robin slice followed straight by another
+    shows as one running interval.
+    """
+    tid = process_tid(process.pid)
+    writer.name_track(run, tid, f"P{process.pid}")
+    current = None  # [state, start, end] waiting to be written
+    state, since = "ready", process.arrival_time
+    for time, new_state in transitions:
+        if time > since:
+            if current and current[0] == state and current[2] == since:
+                current[2] = time
+            else:
+                if current:
+                    writer.slice(run, tid, *current)
+                current = [state, since, time]
+        state, since = new_state, time
+    if current:
+        writer.slice(run, tid, *current)
+
+
+def write_schedule(writer, run, name, gantt_data, processes, cpu=0):
+    """Write a finished run (Gantt data plus its processes) as one trace process"""
+    gantt_chart, time_chart = gantt_data
+    writer.name_run(run, name)
+    writer.name_track(run, cpu_tid(cpu), f"CPU {cpu}")
+    by_pid = {p.pid: p for p in processes}
+    # Transitions of processes that have not completed yet
+    live = {}
+    for pid, (start, end) in zip(gantt_chart, time_chart):
+        writer.slice(run, cpu_tid(cpu), f"P{pid}", start, end, {"pid": pid})
+        transitions = live.setdefault(pid, [])
+        transitions.append((start, "running"))
+        process = by_pid[pid]
+        if end == process.completion_time:
+            transitions.append((end, "completed"))
+            write_process_track(writer, run, process, live.pop(pid))
+        else:
+            transitions.append((end, "ready"))
+
+
+def export_chrome_trace(path, results):
+    """Write compare_all() results to `path`, one trace process per algorithm"""
+    with open(path, "w", encoding="utf-8") as f, ChromeTraceWriter(f) as writer:
+        for run, (algo, result) in enumerate(results.items()):
+            write_schedule(writer, run, ALGORITHMS[algo][0], result["gantt"], result["processes"])
@@ -0,0 +1,182 @@
+class TableModel:
+    """Columnar table data with a sorted, filtered view of row numbers.
+
+    Each column is a plain list and rows are found by the value of their
+    first column (the key), so updating a row is O(1) per cell. The view
+    is only rebuilt when sorting or filtering changes, or when an update
+    touches the sort or filter column.
+    """
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self.data = {column: [] for column in self.columns}
+        self.index = {}  # key -> row number
+        self.sort_column = None
+        self.descending = False
+        self.filter_column = None
+        self.filter_values = None
+        self.view = []  # Row numbers in display order
+        self.stale = False
+
+    def __len__(self):
+        self.refresh()
+        return len(self.view)
+
+    def set_rows(self, rows):
+        """Replace all data with `rows` (tuples in column order)"""
+        self.data = {column: [] for column in self.columns}
+        self.index = {}
+        for row in rows:
+            self.append(row)
+        self.stale = True
+
+    def append(self, row):
+        if len(row) != len(self.columns):
+            raise ValueError(f"Expected {len(self.columns)} values, got {len(row)}")
+        self.index[row[0]] = len(self.index)
+        for column, value in zip(self.columns, row):
+            self.data[column].append(value)
+        self.stale = True
+
+    def update(self, key, row):
+        """Overwrite the row with `key`; returns True if any cell changed"""
+        number = self.index[key]
+        changed = False
+        for column, value in zip(self.columns, row):
+            cells = self.data[column]
+            if cells[number] != value:
+                cells[number] = value
+                changed = True
+                if column == self.sort_column or column == self.filter_column:
+                    self.stale = True
+        return changed
+
+    def sort_by(self, column, descending=None):
+        """Sort the view by `column`; repeating the column flips the direction"""
+        if column not in self.data:
+            raise ValueError(f"Unknown column: {column}")
+        if descending is None:
+            descending = column == self.sort_column and not self.descending
+        self.sort_column = column
+        self.descending = descending
+        self.stale = True
+
+    def filter_by(self, column, values=None):
+        """Show only rows whose `column` is in `values`; None shows every row"""
+        if column is not None and column not in self.data:
+            raise ValueError(f"Unknown column: {column}")
+        self.filter_column = column if values is not None else None
+        self.filter_values = set(values) if values is not None else None
+        self.stale = True
+
+    def refresh(self):
+        if not self.stale:
+            return
+        rows = range(len(self.index))
+        if self.filter_column is not None:
+            cells, wanted = self.data[self.filter_column], self.filter_values
+            rows = [i for i in rows if cells[i] in wanted]
+        if self.sort_column is not None:
+            rows = sorted(rows, key=self.data[self.sort_column].__getitem__, reverse=self.descending)
+        self.view = list(rows)
+        self.stale = False
+
+    def row(self, position):
+        """Values of the row shown at `position` of the view"""
+        number = self.view[position]
+        return tuple(self.data[column][number] for column in self.columns)
+
+
+class VirtualTable:
+    """Treeview that materializes only the visible rows of a TableModel.
+
+    The tree holds a fixed set of `height` items that are re-pointed at
+    model rows as the view scrolls, and an item is only rewritten when its
+    values differ from what it shows, so the cost of render() depends on
+    the window height rather than the number of rows. Clicking a heading
+    sorts by that column. `formats` maps columns to display functions, so
+    the model keeps raw values that sort naturally.
+    """
+
+    def __init__(self, parent, column_config, height=15, formats=None):
+        import ttkbootstrap as ttk
+
+        self.model = TableModel(column_config)
+        self.formats = [(formats or {}).get(column, str) for column in self.model.columns]
+        self.height = height
+        self.first = 0
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=self.model.columns, show="headings",
+                                 height=height, selectmode="browse")
+        for column, (width, anchor) in column_config.items():
+            self.tree.column(column, width=width, anchor=anchor)
+            self.tree.heading(column, text=column, command=lambda c=column: self.sort_by(c))
+        self.slots = [self.tree.insert("", "end", values=()) for _ in range(height)]
+        self.shown = [None] * height  # Values each slot displays, None when detached
+        for slot in self.slots:
+            self.tree.detach(slot)
+
+        self.y_scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.yview)
+        x_scrollbar = ttk.Scrollbar(self.frame, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(xscrollcommand=x_scrollbar.set)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.y_scrollbar.grid(row=0, column=1, sticky="ns")
+        x_scrollbar.grid(row=1, column=0, sticky="ew")
+        self.frame.grid_columnconfigure(0, weight=1)
+        self.frame.grid_rowconfigure(0, weight=1)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1, "units"))
+
+    def grid(self, **kwargs):
+        self.frame.grid(**kwargs)
+
+    def yview(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, "units"/"pages")"""
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * len(self.model))
+        elif args[0] == "scroll":
+            self.scroll(int(args[1]), args[2])
+            return
+        self.render()
+
+    def scroll(self, count, what="units"):
+        self.first += count * (self.height if what == "pages" else 1)
+        self.render()
+        return "break"
+
+    def sort_by(self, column):
+        model = self.model
+        model.sort_by(column)
+        for name in model.columns:
+            arrow = (" ▼" if model.descending else " ▲") if name == column else ""
+            self.tree.heading(name, text=name + arrow)
+        self.render()
+
+    def filter_by(self, column, values=None):
+        self.model.filter_by(column, values)
+        self.first = 0
+        self.render()
+
+    def render(self):
+        """Show the rows under the scroll position, touching only changed items"""
+        total = len(self.model)
+        self.first = max(0, min(self.first, total - self.height))
+        for k, slot in enumerate(self.slots):
+            position = self.first + k
+            values = None
+            if position < total:
+                values = tuple(f(v) for f, v in zip(self.formats, self.model.row(position)))
+            if values == self.shown[k]:
+                continue
+            if values is None:
+                self.tree.detach(slot)
+            else:
+                if self.shown[k] is None:
+                    self.tree.move(slot, "", k)
+                self.tree.item(slot, values=values)
+            self.shown[k] = values
+        if total:
+            self.y_scrollbar.set(self.first / total, min(1.0, (self.first + self.height) / total))
+        else:
+            self.y_scrollbar.set(0.0, 1.0)
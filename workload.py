@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+
+from cpu_scheduler import CPUScheduler, Process
+
+
+class Workload:
+    """Immutable, columnar snapshot of a process set.
+
+    The columns keep submission order, which the list-scanning algorithms rely
+    on for tie breaking; `arrival_order` is computed once so consumers that
+    need processes by arrival don't re-sort. A Workload is shared read-only
+    between runs and every run gets its own fresh Process objects.
+    """
+
+    __slots__ = ("pids", "arrivals", "bursts", "priorities", "arrival_order", "_digest")
+
+    def __init__(self, pids, arrivals, bursts, priorities):
+        if not (len(pids) == len(arrivals) == len(bursts) == len(priorities)):
+            raise ValueError("Workload columns must have the same length")
+        self.pids = tuple(pids)
+        self.arrivals = tuple(arrivals)
+        self.bursts = tuple(bursts)
+        self.priorities = tuple(priorities)
+        self.arrival_order = tuple(sorted(range(len(self.pids)),
+                                          key=lambda i: (self.arrivals[i], i)))
+        self._digest = None
+
+    @classmethod
+    def from_processes(cls, processes):
+        """Snapshot the static fields of existing Process objects"""
+        return cls([p.pid for p in processes],
+                   [p.arrival_time for p in processes],
+                   [p.burst_time for p in processes],
+                   [p.priority for p in processes])
+
+    @classmethod
+    def from_records(cls, records):
+        """Build from (pid, arrival_time, burst_time, priority) tuples"""
+        records = list(records)
+        return cls([r[0] for r in records], [r[1] for r in records],
+                   [r[2] for r in records], [r[3] for r in records])
+
+    def __len__(self):
+        return len(self.pids)
+
+    def records(self):
+        """Iterate (pid, arrival_time, burst_time, priority) in submission order"""
+        return zip(self.pids, self.arrivals, self.bursts, self.priorities)
+
+    def to_processes(self):
+        """Fresh Process objects a single run may mutate freely"""
+        return [Process(pid, arrival, burst, priority)
+                for pid, arrival, burst, priority in self.records()]
+
+    def to_scheduler(self, time_quantum=3):
+        """A CPUScheduler loaded with fresh copies of this workload"""
+        scheduler = CPUScheduler()
+        scheduler.time_quantum = time_quantum
+        scheduler.processes = self.to_processes()
+        return scheduler
+
+    def digest(self):
+        """Stable content hash of the workload"""
+        if self._digest is None:
+            h = hashlib.sha256()
+            for record in self.records():
+                h.update(repr(record).encode("utf-8"))
+            self._digest = h.hexdigest()
+        return self._digest
+
+
+def _validate_record(record, where):
+    pid, arrival, burst, priority = record
+    if arrival < 0 or burst <= 0 or priority < 0:
+        raise ValueError(f"Invalid process parameters at {where}")
+    return record
+
+
+def _check_pid(pid, where, seen):
+    """Reject a pid already used in the trace; results are matched to rows by pid"""
+    if pid in seen:
+        raise ValueError(f"Duplicate pid {pid} at {where} (first used at {seen[pid]})")
+    seen[pid] = where
+
+
+def workload_from_json(items):
+    """Build a Workload from a list of process objects as saved by the GUI"""
+    if not isinstance(items, list):
+        raise ValueError("Processes must be a list")
+    records = []
+    seen = {}
+    try:
+        for i, p in enumerate(items, 1):
+            record = _validate_record(
+                (int(p.get("pid", i)), int(p["arrival_time"]),
+                 int(p["burst_time"]), int(p.get("priority", 0))), f"entry {i}")
+            _check_pid(record[0], f"entry {i}", seen)
+            records.append(record)
+    except (KeyError, TypeError, AttributeError, OverflowError) as e:
+        raise ValueError(f"Malformed process entry: {e}")
+    if not records:
+        raise ValueError("No processes given")
+    return Workload.from_records(records)
+
+
+def load_workload(path):
+    """Load a trace file into a Workload.
+
+    JSON traces use the GUI's saved configuration format (a list of objects
+    with pid, arrival_time, burst_time and priority). CSV traces hold one
+    process per row as pid, arrival_time, burst_time[, priority], or just
+    arrival_time, burst_time with pids numbered from 1; a header row is
+    optional and a missing priority defaults to 0.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    records = []
+    seen = {}
+    with open(path, "r", newline="") as f:
+        if ext == ".json":
+            return workload_from_json(json.load(f))
+        else:
+            import csv
+
+            rows = csv.reader(f)
+            for line_no, row in enumerate(rows, 1):
+                row = [cell.strip() for cell in row]
+                if not row or not row[0] or row[0].startswith("#"):
+                    continue
+                if line_no == 1 and not row[0].lstrip("-").isdigit():
+                    continue  # Header row
+                if len(row) == 2:
+                    row = [str(len(records) + 1)] + row
+                if len(row) == 3:
+                    row = row + ["0"]
+                try:
+                    record = tuple(int(cell) for cell in row[:4])
+                except ValueError:
+                    raise ValueError(f"Malformed trace row at line {line_no}")
+                _check_pid(record[0], f"line {line_no}", seen)
+                records.append(_validate_record(record, f"line {line_no}"))
+    if not records:
+        raise ValueError(f"No processes found in {path}")
+    return Workload.from_records(records)